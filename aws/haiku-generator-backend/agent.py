@@ -2,6 +2,7 @@ import langchain
 import os
 from database import store_chat_interaction, retrieve_chats, update_haiku_lines, retrieve_haiku
 from dotenv import load_dotenv
+from jobs import enqueue_media_generation
 from langchain_aws import ChatBedrock
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.tools import StructuredTool
@@ -9,7 +10,6 @@ from langchain_core.tools import tool
 from langchain.agents import create_tool_calling_agent, AgentExecutor
 from model import UpdateHaiku
 from typing import List
-from workflow import start_workflow
 
 
 langchain.debug = True
@@ -55,8 +55,8 @@ def generate_media_base(user_id: str, haiku_id: str) -> str:
     haiku = retrieve_haiku(user_id, haiku_id)
     if not haiku.haiku_line_en_1 or not haiku.haiku_line_en_2 or not haiku.haiku_line_en_3:
         return f"Haiku not available for media generation. Please save a haiku first."    
-    start_workflow(user_id, haiku_id)
-    return f"Media generated"
+    enqueue_media_generation(user_id, haiku_id)
+    return f"Media generation started"
 
 def configure_generate_media(user_id: str, haiku_id: str) -> tool:
     def generate_media():
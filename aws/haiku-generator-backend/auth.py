@@ -1,10 +1,14 @@
+import asyncio
+import hashlib
+import httpx
 import json
 import os
-import requests
+import time
+from collections import OrderedDict
 from dotenv import load_dotenv
 from fastapi import HTTPException, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import jwt, JWTError
+from jose import jwk, jwt, JWTError
 from pathlib import Path
 from typing import Dict, Any
 
@@ -16,11 +20,21 @@ COGNITO_USER_POOL_ID = os.getenv("COGNITO_USER_POOL_ID")
 COGNITO_CLIENT_ID = os.getenv("COGNITO_CLIENT_ID")
 JWT_ALGORITHM = "RS256"
 
+# Verified tokens kept in memory until they expire, 0 verifies every request
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+# Minimum seconds between two JWKS downloads, so tokens with made up kids cannot flood Cognito
+JWKS_REFRESH_INTERVAL = float(os.getenv("JWKS_REFRESH_INTERVAL", "60"))
+
 
 class CognitoJWTVerifier:
-    def __init__(self):
-        self._jwks = None
-        self._jwks_url = f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}/.well-known/jwks.json"
+    def __init__(self, jwks_url: str = None, transport: httpx.AsyncBaseTransport = None):
+        self._keys = {}
+        self._claims = OrderedDict()
+        self._refresh_lock = asyncio.Lock()
+        self._refreshed_at = None
+        self._jwks_url = jwks_url or f"https://cognito-idp.{COGNITO_REGION}.amazonaws.com/{COGNITO_USER_POOL_ID}/.well-known/jwks.json"
+        # A local transport lets tests serve the JWKS without Cognito
+        self._transport = transport
         self._jwks_cache_file = Path(".jwks_cache.json")
         self._load_cached_jwks()
 
@@ -29,7 +43,7 @@ class CognitoJWTVerifier:
         if self._jwks_cache_file.exists():
             try:
                 with open(self._jwks_cache_file, 'r') as f:
-                    self._jwks = json.load(f)
+                    self._set_jwks(json.load(f))
             except Exception as e:
                 print(f"Warning: Failed to load cached JWKS: {str(e)}")
 
@@ -41,23 +55,37 @@ class CognitoJWTVerifier:
         except Exception as e:
             print(f"Warning: Failed to save JWKS cache: {str(e)}")
 
+    def _set_jwks(self, jwks: Dict[str, Any]):
+        """Build the public keys once and index them by kid"""
+        self._keys = {
+            key["kid"]: jwk.construct(key, JWT_ALGORITHM)
+            for key in jwks["keys"]
+        }
+
     async def verify_token(self, token: str) -> dict:
         """
         Verify JWT token.
         """
+        # Tokens verified before are only checked for expiry
+        token_hash = hashlib.sha256(token.encode()).digest()
+        claims = self._claims.get(token_hash)
+        if claims is not None:
+            if claims["exp"] > time.time():
+                self._claims.move_to_end(token_hash)
+                return claims
+            del self._claims[token_hash]
+
         try:
             # Get the kid from the token header
             unverified_header = jwt.get_unverified_header(token)
             kid = unverified_header["kid"]
 
-            # Get JWKS if not cached
-            if not self._jwks:
-                self._jwks = await self._get_jwks()
-                self._save_jwks_to_cache(self._jwks)
-
-            # Find the matching key
-            key = next((k for k in self._jwks["keys"] if k["kid"] == kid), None)
-            if not key:
+            # Find the matching key, an unknown kid means the keys were rotated
+            key = self._keys.get(kid)
+            if key is None:
+                await self._refresh_jwks()
+                key = self._keys.get(kid)
+            if key is None:
                 raise HTTPException(status_code=401, detail="Invalid token")
 
             # Decode the token
@@ -68,17 +96,37 @@ class CognitoJWTVerifier:
                 audience=COGNITO_CLIENT_ID,
                 options={"verify_exp": True}
             )
-            return claims
 
         except JWTError as e:
             raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
 
+        if AUTH_TOKEN_CACHE_SIZE > 0 and "exp" in claims:
+            self._claims[token_hash] = claims
+            while len(self._claims) > AUTH_TOKEN_CACHE_SIZE:
+                self._claims.popitem(last=False)
+        return claims
+
+    async def _refresh_jwks(self):
+        """Download the JWKS again, concurrent callers share a single download"""
+        keys = self._keys
+        async with self._refresh_lock:
+            # Another request refreshed the keys while this one waited
+            if self._keys is not keys:
+                return
+            if self._refreshed_at is not None and time.monotonic() - self._refreshed_at < JWKS_REFRESH_INTERVAL:
+                return
+            jwks = await self._get_jwks()
+            self._refreshed_at = time.monotonic()
+            self._set_jwks(jwks)
+            self._save_jwks_to_cache(jwks)
+
     async def _get_jwks(self) -> dict:
         """Get JWKS from Cognito"""
         try:
-            response = requests.get(self._jwks_url)
-            response.raise_for_status()
-            return response.json()
+            async with httpx.AsyncClient(transport=self._transport, timeout=10) as client:
+                response = await client.get(self._jwks_url)
+                response.raise_for_status()
+                return response.json()
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to get JWKS: {str(e)}")
 
@@ -2,7 +2,7 @@ import os
 import psycopg
 import uuid
 from dotenv import load_dotenv
-from model import Empty, Haiku, Chat
+from model import Empty, Haiku, Chat, MediaJob
 from psycopg.rows import dict_row
 from typing import List
 
@@ -104,6 +104,29 @@ def create_tables():
             FOREIGN KEY (user_id, haiku_id) REFERENCES haiku (user_id, haiku_id)
         )
     ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS media_job (
+            job_id TEXT PRIMARY KEY,
+            user_id TEXT,
+            haiku_id TEXT,
+            status TEXT DEFAULT 'queued',
+            error_message TEXT,
+            attempts INTEGER DEFAULT 0,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP WITH TIME ZONE,
+            finished_at TIMESTAMP WITH TIME ZONE,
+            locked_until TIMESTAMP WITH TIME ZONE,
+            FOREIGN KEY (user_id, haiku_id) REFERENCES haiku (user_id, haiku_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_media_job_status_created_at ON media_job (status, created_at)
+    ''')
+    # At most one queued or running job per haiku
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_media_job_active_haiku ON media_job (user_id, haiku_id)
+        WHERE status IN ('queued', 'running')
+    ''')
     conn.commit()
     conn.close()
     print("Created tables")
@@ -228,12 +251,109 @@ def store_chat_interaction(user_id: str, haiku_id: str, message: str, role: str)
     conn.commit()
     conn.close()
 
+def enqueue_media_job(user_id: str, haiku_id: str) -> MediaJob:
+    """Queue media generation for a haiku, reusing the job already queued or running for it"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    while True:
+        cursor.execute('''
+            INSERT INTO media_job (job_id, user_id, haiku_id) VALUES (%s, %s, %s)
+            ON CONFLICT DO NOTHING
+            RETURNING *
+        ''', (str(uuid.uuid4()), user_id, haiku_id))
+        job = cursor.fetchone()
+        if job:
+            cursor.execute('''
+                UPDATE haiku SET status = %s, error_message = %s WHERE user_id = %s AND haiku_id = %s
+            ''', ("queued", "", user_id, haiku_id))
+            break
+        cursor.execute('''
+            SELECT * FROM media_job WHERE user_id = %s AND haiku_id = %s AND status IN ('queued', 'running')
+        ''', (user_id, haiku_id))
+        job = cursor.fetchone()
+        if job:
+            break
+        # The active job finished between the two statements, queue a new one
+    conn.commit()
+    conn.close()
+    return MediaJob(**dict(job))
+
+def claim_media_job(lease_seconds: int, max_attempts: int) -> MediaJob | None:
+    """
+    Take the oldest queued job, or a running job whose worker stopped renewing
+    its lease. SKIP LOCKED lets concurrent workers pass over the rows another
+    worker is claiming instead of waiting for it. A job whose lease expired
+    max_attempts times fails, with its haiku.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    error_message = f"Media generation stopped {max_attempts} times, giving up"
+    cursor.execute('''
+        WITH exhausted AS (
+            UPDATE media_job SET status = 'failed', error_message = %s, finished_at = now(), locked_until = NULL
+            WHERE status = 'running' AND locked_until < now() AND attempts >= %s
+            RETURNING user_id, haiku_id
+        )
+        UPDATE haiku SET status = 'failed', error_message = %s
+        FROM exhausted
+        WHERE haiku.user_id = exhausted.user_id AND haiku.haiku_id = exhausted.haiku_id
+    ''', (error_message, max_attempts, error_message))
+    cursor.execute('''
+        UPDATE media_job
+        SET status = 'running', attempts = attempts + 1, started_at = now(), locked_until = now() + make_interval(secs => %s)
+        WHERE job_id = (
+            SELECT job_id FROM media_job
+            WHERE status = 'queued' OR (status = 'running' AND locked_until < now())
+            ORDER BY created_at
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    ''', (lease_seconds,))
+    job = cursor.fetchone()
+    conn.commit()
+    conn.close()
+    return MediaJob(**dict(job)) if job else None
+
+def renew_media_job(job_id: str, lease_seconds: int):
+    """Extend the lease of a running job so that no other worker takes it"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        UPDATE media_job SET locked_until = now() + make_interval(secs => %s) WHERE job_id = %s AND status = 'running'
+    ''', (lease_seconds, job_id))
+    conn.commit()
+    conn.close()
+
+def finish_media_job(job_id: str, status: str, error_message: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        UPDATE media_job SET status = %s, error_message = %s, finished_at = now(), locked_until = NULL
+        WHERE job_id = %s
+    ''', (status, error_message, job_id))
+    conn.commit()
+    conn.close()
+
+def retrieve_last_media_job(user_id: str, haiku_id: str) -> MediaJob | None:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT * FROM media_job WHERE user_id = %s AND haiku_id = %s ORDER BY created_at DESC LIMIT 1
+    ''', (user_id, haiku_id))
+    job = cursor.fetchone()
+    conn.close()
+    return MediaJob(**dict(job)) if job else None
+
 def delete_haiku_db(user_id: str, haiku_id: str):
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute('''
         DELETE FROM chat WHERE user_id = %s AND haiku_id = %s
     ''', (user_id, haiku_id))
+    cursor.execute('''
+        DELETE FROM media_job WHERE user_id = %s AND haiku_id = %s
+    ''', (user_id, haiku_id))
     cursor.execute('''
         DELETE FROM haiku WHERE user_id = %s AND haiku_id = %s
     ''', (user_id, haiku_id))
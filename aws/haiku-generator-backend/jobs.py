@@ -0,0 +1,99 @@
+import os
+import threading
+from database import claim_media_job, enqueue_media_job, finish_media_job, renew_media_job, retrieve_haiku, set_status
+from dotenv import load_dotenv
+from model import MediaJob
+from workflow import start_workflow
+
+
+load_dotenv()
+# Media jobs rendered at the same time by the API process, 0 leaves them to `python jobs.py`
+MEDIA_WORKERS = int(os.getenv("MEDIA_WORKERS", "4"))
+# Seconds a running job stays claimed without a heartbeat, a job whose worker died is picked up again afterwards
+MEDIA_JOB_LEASE_SECONDS = int(os.getenv("MEDIA_JOB_LEASE_SECONDS", "300"))
+# Workers a job may take down before it fails instead of being picked up again
+MEDIA_JOB_MAX_ATTEMPTS = int(os.getenv("MEDIA_JOB_MAX_ATTEMPTS", "3"))
+# Seconds an idle worker sleeps before checking for jobs queued by other processes
+MEDIA_JOB_POLL_SECONDS = float(os.getenv("MEDIA_JOB_POLL_SECONDS", "2"))
+
+
+def renew_lease(job: MediaJob, done: threading.Event):
+    """Heartbeat keeping the job claimed while its workflow runs"""
+    while not done.wait(MEDIA_JOB_LEASE_SECONDS / 3):
+        try:
+            renew_media_job(job.job_id, MEDIA_JOB_LEASE_SECONDS)
+        except Exception as e:
+            print(f"Error renewing media job {job.job_id}: {e}")
+
+
+def run_media_job(job: MediaJob):
+    done = threading.Event()
+    threading.Thread(target=renew_lease, args=(job, done), name=f"media-lease-{job.job_id}", daemon=True).start()
+    try:
+        start_workflow(job.user_id, job.haiku_id)
+    except Exception as e:
+        print(f"Error generating media for haiku {job.haiku_id}: {e}")
+        set_status(job.user_id, job.haiku_id, "failed", str(e))
+    finally:
+        done.set()
+    haiku = retrieve_haiku(job.user_id, job.haiku_id)
+    if haiku.status == "completed":
+        finish_media_job(job.job_id, "completed", "")
+    else:
+        finish_media_job(job.job_id, "failed", haiku.error_message)
+
+
+class MediaWorkerPool:
+    """Threads taking media jobs from the database queue, one workflow at a time each"""
+    def __init__(self, workers: int = MEDIA_WORKERS):
+        self.workers = workers
+        self._threads = []
+        self._stopping = threading.Event()
+        self._job_queued = threading.Event()
+
+    def start(self):
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"media-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Stop taking jobs, a job still running is picked up again once its lease expires"""
+        self._stopping.set()
+        self._job_queued.set()
+        self._threads = []
+
+    def notify(self):
+        self._job_queued.set()
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                job = claim_media_job(MEDIA_JOB_LEASE_SECONDS, MEDIA_JOB_MAX_ATTEMPTS)
+            except Exception as e:
+                print(f"Error claiming media job: {e}")
+                job = None
+            if job is None:
+                self._job_queued.wait(MEDIA_JOB_POLL_SECONDS)
+                self._job_queued.clear()
+                continue
+            run_media_job(job)
+
+
+media_workers = MediaWorkerPool()
+
+
+def enqueue_media_generation(user_id: str, haiku_id: str) -> MediaJob:
+    """Queue media generation and wake up an idle worker of this process"""
+    job = enqueue_media_job(user_id, haiku_id)
+    media_workers.notify()
+    return job
+
+
+if __name__ == "__main__":
+    # Standalone worker, run next to an API started with MEDIA_WORKERS=0
+    pool = MediaWorkerPool(max(MEDIA_WORKERS, 1))
+    pool.start()
+    for thread in pool._threads:
+        thread.join()
@@ -1,14 +1,21 @@
 from agent import process_message
 from auth import get_user_id
-from database import retrieve_chats, retrieve_haikus, retrieve_haiku, delete_haiku_db, retrieve_last_chat, insert_haiku
+from contextlib import asynccontextmanager
+from database import retrieve_chats, retrieve_haikus, retrieve_haiku, delete_haiku_db, retrieve_last_chat, insert_haiku, retrieve_last_media_job
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from model import SendChatRequest, SendChatResponse, ListHaikusResponse, GetHaikuResponse, DeleteHaikuResponse, GenerateMediaResponse
+from jobs import enqueue_media_generation, media_workers
+from model import SendChatRequest, SendChatResponse, ListHaikusResponse, GetHaikuResponse, DeleteHaikuResponse, GenerateMediaResponse, GetMediaJobResponse
 from storage import get_signed_haiku_media
-from workflow import start_workflow
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    media_workers.start()
+    yield
+    media_workers.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -19,8 +26,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# The handlers call the blocking database and Bedrock code, FastAPI runs plain
+# functions in its threadpool so that they do not block the event loop
 @app.post('/api/chat/{haiku_id}')
-async def send_chat(haiku_id: str, chat_message: SendChatRequest, user_id: str = Depends(get_user_id)) -> SendChatResponse:
+def send_chat(haiku_id: str, chat_message: SendChatRequest, user_id: str = Depends(get_user_id)) -> SendChatResponse:
     if retrieve_haiku(user_id, haiku_id).error_message == "Haiku not found":
         insert_haiku(user_id, haiku_id)
     process_message(user_id, haiku_id, chat_message.message)
@@ -30,14 +39,14 @@ async def send_chat(haiku_id: str, chat_message: SendChatRequest, user_id: str =
     return SendChatResponse(chat=chat, haiku=haiku)
 
 @app.get('/api/haiku')
-async def list_haikus(user_id: str = Depends(get_user_id)) -> ListHaikusResponse:
+def list_haikus(user_id: str = Depends(get_user_id)) -> ListHaikusResponse:
     haikus = retrieve_haikus(user_id)
     for haiku in haikus:
         get_signed_haiku_media(haiku)
     return ListHaikusResponse(haikus=haikus)
 
 @app.get('/api/haiku/{haiku_id}')
-async def get_haiku(haiku_id: str, user_id: str = Depends(get_user_id)) -> GetHaikuResponse:
+def get_haiku(haiku_id: str, user_id: str = Depends(get_user_id)) -> GetHaikuResponse:
     haiku = retrieve_haiku(user_id, haiku_id)
     get_signed_haiku_media(haiku)
     if haiku.error_message == "Haiku not found":
@@ -46,18 +55,25 @@ async def get_haiku(haiku_id: str, user_id: str = Depends(get_user_id)) -> GetHa
     return GetHaikuResponse(haiku=haiku, chats=chats)
 
 @app.post('/api/haiku/{haiku_id}')
-async def generate_media(haiku_id: str, user_id: str = Depends(get_user_id)) -> GenerateMediaResponse:
+def generate_media(haiku_id: str, user_id: str = Depends(get_user_id)) -> GenerateMediaResponse:
     haiku = retrieve_haiku(user_id, haiku_id)
+    job = None
     if haiku.error_message == "Haiku not found" or haiku.status != "failed":
         haiku.error_message = ""
     else:
-        start_workflow(user_id, haiku_id)
+        # Return right away, GET /api/haiku/{haiku_id}/job reports the progress
+        job = enqueue_media_generation(user_id, haiku_id)
         haiku = retrieve_haiku(user_id, haiku_id)
     get_signed_haiku_media(haiku)
-    return GenerateMediaResponse(haiku=haiku)
+    return GenerateMediaResponse(haiku=haiku, job=job)
+
+@app.get('/api/haiku/{haiku_id}/job')
+def get_media_job(haiku_id: str, user_id: str = Depends(get_user_id)) -> GetMediaJobResponse:
+    job = retrieve_last_media_job(user_id, haiku_id)
+    return GetMediaJobResponse(job=job)
 
 @app.delete('/api/haiku/{haiku_id}')
-async def delete_haiku(haiku_id: str, user_id: str = Depends(get_user_id)) -> DeleteHaikuResponse:
+def delete_haiku(haiku_id: str, user_id: str = Depends(get_user_id)) -> DeleteHaikuResponse:
     delete_haiku_db(user_id, haiku_id)
     return DeleteHaikuResponse(message='Haiku and associated data deleted successfully')
 
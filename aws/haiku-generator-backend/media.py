@@ -3,9 +3,12 @@ import boto3
 import io
 import json
 import os
+import threading
 from database import update_translation, update_image_description, update_haiku_link
 from dotenv import load_dotenv
 from langchain_aws import BedrockLLM
+from model import ImageDescriptions, Translations
+from pydantic import BaseModel, ValidationError
 from storage import upload_file
 
 
@@ -18,6 +21,12 @@ AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
 LLM_MODEL_PROVIDER = os.getenv('LLM_MODEL_PROVIDER', 'amazon')
 LLM_MODEL_ID = os.getenv('LLM_MODEL_ID')
 IMAGE_MODEL_ID = os.getenv('IMAGE_MODEL_ID')
+# Calls made at the same time by the process per service, keep them under the Bedrock and Polly quotas
+MEDIA_LLM_CONCURRENCY = int(os.getenv('MEDIA_LLM_CONCURRENCY', '8'))
+MEDIA_IMAGE_CONCURRENCY = int(os.getenv('MEDIA_IMAGE_CONCURRENCY', '4'))
+MEDIA_AUDIO_CONCURRENCY = int(os.getenv('MEDIA_AUDIO_CONCURRENCY', '8'))
+# Prompt for the three lines of a haiku at once, with one prompt per line as the fallback
+MEDIA_LLM_BATCH = os.getenv('MEDIA_LLM_BATCH', 'true').lower() in ('1', 'true', 'yes')
 
 
 model = BedrockLLM(
@@ -30,6 +39,9 @@ model = BedrockLLM(
 
 bedrock = boto3.client(service_name='bedrock-runtime')
 polly = boto3.client('polly')
+llm_slots = threading.BoundedSemaphore(MEDIA_LLM_CONCURRENCY)
+image_slots = threading.BoundedSemaphore(MEDIA_IMAGE_CONCURRENCY)
+audio_slots = threading.BoundedSemaphore(MEDIA_AUDIO_CONCURRENCY)
 
 def generate_image(user_id: str, haiku_id: str, description: str, image_number: int):
     file_path = f"{user_id}/{haiku_id}/image-{image_number}.png"
@@ -50,12 +62,13 @@ def generate_image(user_id: str, haiku_id: str, description: str, image_number:
         })
         
         # Invoke the Bedrock model
-        response = bedrock.invoke_model(
-            body=body,
-            modelId=IMAGE_MODEL_ID,
-            accept="application/json",
-            contentType="application/json"
-        )
+        with image_slots:
+            response = bedrock.invoke_model(
+                body=body,
+                modelId=IMAGE_MODEL_ID,
+                accept="application/json",
+                contentType="application/json"
+            )
         
         # Process the response
         response_body = json.loads(response.get("body").read())
@@ -83,12 +96,13 @@ def generate_audio(user_id: str, haiku_id: str, text: str, audio_number: int):
     storage_file_path = f"{user_id}/{haiku_id}/audio-{audio_number}.mp3"
     try:
         # Get the audio stream from Polly
-        response = polly.synthesize_speech(
-            Text=text,
-            OutputFormat='mp3',
-            VoiceId='Mizuki',
-            LanguageCode='ja-JP'
-        )
+        with audio_slots:
+            response = polly.synthesize_speech(
+                Text=text,
+                OutputFormat='mp3',
+                VoiceId='Mizuki',
+                LanguageCode='ja-JP'
+            )
         
         # Read the audio stream directly
         audio_content = io.BytesIO()
@@ -122,7 +136,8 @@ def generate_image_description(user_id: str, haiku_id: str, topic: str, haiku_li
     Topic: {topic}
     """
 
-    description = model.invoke(prompt)
+    with llm_slots:
+        description = model.invoke(prompt)
 
     if len(description) > 512:
         description = description[:512]
@@ -152,7 +167,8 @@ def generate_translation(user_id: str, haiku_id: str, topic: str, haiku_line: st
     Japanese translation:
     """
     
-    translation = model.invoke(prompt)
+    with llm_slots:
+        translation = model.invoke(prompt)
     # Clean up the translation
     translation = translation.strip()
     
@@ -165,3 +181,83 @@ def generate_translation(user_id: str, haiku_id: str, topic: str, haiku_line: st
     
     update_translation(user_id, haiku_id, translation, line_number)
     return translation
+
+def invoke_json(prompt: str, schema: type[BaseModel]) -> BaseModel | None:
+    """Prompt for a JSON answer following the schema, None when the answer does not"""
+    prompt = f"""{prompt}
+    Respond ONLY with a JSON object following this JSON schema: {json.dumps(schema.model_json_schema())}
+    """
+    with llm_slots:
+        response = model.invoke(prompt)
+    try:
+        # Skip any text the model writes around the object
+        return schema.model_validate_json(response[response.index("{"):response.rindex("}") + 1])
+    except (ValueError, ValidationError) as e:
+        print(f"Error parsing {schema.__name__}: {e}")
+        return None
+
+def generate_image_descriptions(user_id: str, haiku_id: str, topic: str, haiku_lines: dict[int, str]):
+    """Descriptions of the given lines by line number, in one prompt"""
+    original_lines = "\n    ".join(f"Original haiku line {line_number}: {haiku_line}" for line_number, haiku_line in haiku_lines.items())
+    prompt = f"""
+    Generate a clear, concise image description for each line of a haiku, each will be used to create an image.
+    
+    Each description should:
+    1. Be specific and concrete
+    2. Describe the main elements and their relationships
+    3. Include colors and lighting conditions
+    4. Be suitable for image generation
+    5. Not include any text or words in the description
+    6. Focus on the key visual elements that capture the line's essence
+    7. Be no longer than 512 characters
+    8. Be a single paragraph of clear, descriptive text
+    
+    Provide one description per line, in the order of the lines.
+    
+    {original_lines}
+    Topic: {topic}
+    """
+    result = invoke_json(prompt, ImageDescriptions)
+    if result is None or len(result.descriptions) != len(haiku_lines):
+        return {
+            line_number: generate_image_description(user_id, haiku_id, topic, haiku_line, line_number)
+            for line_number, haiku_line in haiku_lines.items()
+        }
+
+    descriptions = dict(zip(haiku_lines, (description[:512] for description in result.descriptions)))
+    for line_number, description in descriptions.items():
+        update_image_description(user_id, haiku_id, description, line_number)
+    return descriptions
+
+def generate_translations(user_id: str, haiku_id: str, topic: str, haiku_lines: dict[int, str]):
+    """Japanese translations of the given lines by line number, in one prompt"""
+    original_lines = "\n    ".join(f"Original line {line_number}: {haiku_line}" for line_number, haiku_line in haiku_lines.items())
+    prompt = f"""
+    Translate each of the following English haiku lines into Japanese, maintaining the haiku structure and poetic essence:
+    
+    {original_lines}
+    
+    Instructions:
+    1. Provide ONLY the Japanese translations, one per line and in the same order
+    2. Each translation is a single line of Japanese text ONLY
+    3. Do NOT include:
+       - Any English text
+       - Explanations
+       - Newlines or extra whitespace
+    4. Maintain the haiku's poetic quality and meaning
+    5. Keep the translations concise and focused on the imagery
+    6. Use natural Japanese phrasing that captures the essence of the original
+    
+    Topic: {topic}
+    """
+    result = invoke_json(prompt, Translations)
+    if result is None or len(result.translations) != len(haiku_lines):
+        return {
+            line_number: generate_translation(user_id, haiku_id, topic, haiku_line, line_number)
+            for line_number, haiku_line in haiku_lines.items()
+        }
+
+    translations = dict(zip(haiku_lines, (translation.replace("\n", "").strip() for translation in result.translations)))
+    for line_number, translation in translations.items():
+        update_translation(user_id, haiku_id, translation, line_number)
+    return translations
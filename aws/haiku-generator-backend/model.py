@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List
 
@@ -45,12 +46,33 @@ class GetHaikuResponse(BaseModel):
     haiku: Haiku
     chats: List[Chat]
 
+class MediaJob(BaseModel):
+    job_id: str
+    user_id: str
+    haiku_id: str
+    status: str
+    error_message: Optional[str] = None
+    attempts: int = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
 class GenerateMediaResponse(BaseModel):
     haiku: Haiku
+    job: Optional[MediaJob] = None
+
+class GetMediaJobResponse(BaseModel):
+    job: Optional[MediaJob] = None
 
 class DeleteHaikuResponse(BaseModel):
     message: str
 
+class ImageDescriptions(BaseModel):
+    descriptions: List[str] = Field(description="One image description per haiku line, in order", min_length=1, max_length=3)
+
+class Translations(BaseModel):
+    translations: List[str] = Field(description="One Japanese translation per haiku line, in order", min_length=1, max_length=3)
+
 class UpdateHaiku(BaseModel):
     haiku: List[str] = Field(description="Haiku lines as list of 3 strings")
     topic: str = Field(description="Haiku topic as string")
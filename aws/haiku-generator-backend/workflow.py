@@ -1,9 +1,15 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from database import set_status, retrieve_haiku
 from langgraph.graph import StateGraph
-from media import generate_image_description, generate_image, generate_translation, generate_audio
+from media import generate_image_description, generate_image, generate_translation, generate_audio, generate_image_descriptions, generate_translations, MEDIA_LLM_BATCH
 from typing import TypedDict
 
 
+# Threads for the blocking media calls, the limits per model are applied in media.py
+media_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="media")
+
+
 class State(TypedDict):
     user_id: str
     haiku_id: str
@@ -25,6 +31,10 @@ class State(TypedDict):
     audio_link_3: str
 
 
+async def run_blocking(func, *args):
+    """Run a blocking media call without holding up the other nodes of the superstep"""
+    return await asyncio.get_running_loop().run_in_executor(media_executor, func, *args)
+
 def initialize_haiku(state: State):
     haiku = retrieve_haiku(state["user_id"], state["haiku_id"])
     set_status(state["user_id"], state["haiku_id"], "in progress", "")
@@ -63,110 +73,142 @@ def initialize_haiku(state: State):
         new_state["audio_link_3"] = haiku.audio_link_3
     return new_state
 
-def generate_image_description_1(state: State):
+async def generate_image_description_1(state: State):
     if state.get("image_description_1"):
         return {}
 
-    description = generate_image_description(state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_1"], 1)
+    description = await run_blocking(generate_image_description, state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_1"], 1)
     return {
         "image_description_1": description
     }
 
-def generate_image_description_2(state: State):
+async def generate_image_description_2(state: State):
     if state.get("image_description_2"):
         return {}
     
-    description = generate_image_description(state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_2"], 2)
+    description = await run_blocking(generate_image_description, state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_2"], 2)
     return {
         "image_description_2": description
     }
 
-def generate_image_description_3(state: State):
+async def generate_image_description_3(state: State):
     if state.get("image_description_3"):
         return {}
     
-    description = generate_image_description(state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_3"], 3)
+    description = await run_blocking(generate_image_description, state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_3"], 3)
     return {
         "image_description_3": description
     }
 
-def generate_image_1(state: State):
+async def generate_all_image_descriptions(state: State):
+    # Only the missing lines, an existing description may already have its image
+    haiku_lines = {
+        line_number: state[f"haiku_line_en_{line_number}"]
+        for line_number in (1, 2, 3)
+        if not state.get(f"image_description_{line_number}")
+    }
+    if not haiku_lines:
+        return {}
+
+    descriptions = await run_blocking(generate_image_descriptions, state["user_id"], state["haiku_id"], state["topic"], haiku_lines)
+    return {
+        f"image_description_{line_number}": description
+        for line_number, description in descriptions.items()
+    }
+
+async def generate_image_1(state: State):
     if state.get("image_link_1"):
         return {}
     
-    link = generate_image(state["user_id"], state["haiku_id"], state["image_description_1"], 1)
+    link = await run_blocking(generate_image, state["user_id"], state["haiku_id"], state["image_description_1"], 1)
     return {
         "image_link_1": link
     }
 
-def generate_image_2(state: State):
+async def generate_image_2(state: State):
     if state.get("image_link_2"):
         return {}
     
-    link = generate_image(state["user_id"], state["haiku_id"], state["image_description_2"], 2)
+    link = await run_blocking(generate_image, state["user_id"], state["haiku_id"], state["image_description_2"], 2)
     return {
         "image_link_2": link
     }
 
-def generate_image_3(state: State):
+async def generate_image_3(state: State):
     if state.get("image_link_3"):
         return {}
     
-    link = generate_image(state["user_id"], state["haiku_id"], state["image_description_3"], 3)
+    link = await run_blocking(generate_image, state["user_id"], state["haiku_id"], state["image_description_3"], 3)
     return {
         "image_link_3": link
     }
 
-def generate_translation_1(state: State):
+async def generate_translation_1(state: State):
     if state.get("haiku_line_ja_1"):
         return {}
     
-    translation = generate_translation(state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_1"], 1)
+    translation = await run_blocking(generate_translation, state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_1"], 1)
     return {
         "haiku_line_ja_1": translation
     }
 
-def generate_translation_2(state: State):
+async def generate_translation_2(state: State):
     if state.get("haiku_line_ja_2"):
         return {}
     
-    translation = generate_translation(state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_2"], 2)
+    translation = await run_blocking(generate_translation, state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_2"], 2)
     return {
         "haiku_line_ja_2": translation
     }
 
-def generate_translation_3(state: State):
+async def generate_translation_3(state: State):
     if state.get("haiku_line_ja_3"):
         return {}
     
-    translation = generate_translation(state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_3"], 3)
+    translation = await run_blocking(generate_translation, state["user_id"], state["haiku_id"], state["topic"], state["haiku_line_en_3"], 3)
     return {
         "haiku_line_ja_3": translation
     }
 
-def generate_audio_1(state: State):
+async def generate_all_translations(state: State):
+    # Only the missing lines, an existing translation may already have its audio
+    haiku_lines = {
+        line_number: state[f"haiku_line_en_{line_number}"]
+        for line_number in (1, 2, 3)
+        if not state.get(f"haiku_line_ja_{line_number}")
+    }
+    if not haiku_lines:
+        return {}
+
+    translations = await run_blocking(generate_translations, state["user_id"], state["haiku_id"], state["topic"], haiku_lines)
+    return {
+        f"haiku_line_ja_{line_number}": translation
+        for line_number, translation in translations.items()
+    }
+
+async def generate_audio_1(state: State):
     if state.get("audio_link_1"):
         return {}
     
-    link = generate_audio(state["user_id"], state["haiku_id"], state["haiku_line_ja_1"], 1)
+    link = await run_blocking(generate_audio, state["user_id"], state["haiku_id"], state["haiku_line_ja_1"], 1)
     return {
         "audio_link_1": link
     }
 
-def generate_audio_2(state: State):
+async def generate_audio_2(state: State):
     if state.get("audio_link_2"):
         return {}
     
-    link = generate_audio(state["user_id"], state["haiku_id"], state["haiku_line_ja_2"], 2)
+    link = await run_blocking(generate_audio, state["user_id"], state["haiku_id"], state["haiku_line_ja_2"], 2)
     return {
         "audio_link_2": link
     }
 
-def generate_audio_3(state: State):
+async def generate_audio_3(state: State):
     if state.get("audio_link_3"):
         return {}
     
-    link = generate_audio(state["user_id"], state["haiku_id"], state["haiku_line_ja_3"], 3)
+    link = await run_blocking(generate_audio, state["user_id"], state["haiku_id"], state["haiku_line_ja_3"], 3)
     return {
         "audio_link_3": link
     }
@@ -213,42 +255,59 @@ def check_status(state: State):
     return state
 
 
-def create_workflow():
+def create_workflow(batch: bool = MEDIA_LLM_BATCH):
     graph = StateGraph(State)
 
     graph.add_node("initialize_haiku", initialize_haiku)
-    graph.add_node("generate_image_description_1", generate_image_description_1)
-    graph.add_node("generate_image_description_2", generate_image_description_2)
-    graph.add_node("generate_image_description_3", generate_image_description_3)
     graph.add_node("generate_image_1", generate_image_1)
     graph.add_node("generate_image_2", generate_image_2)
     graph.add_node("generate_image_3", generate_image_3)
-    graph.add_node("generate_translation_1", generate_translation_1)
-    graph.add_node("generate_translation_2", generate_translation_2)
-    graph.add_node("generate_translation_3", generate_translation_3)
     graph.add_node("generate_audio_1", generate_audio_1)
     graph.add_node("generate_audio_2", generate_audio_2)
     graph.add_node("generate_audio_3", generate_audio_3)
     graph.add_node("check_status", check_status)
     
-    graph.add_edge("initialize_haiku", "generate_image_description_1")
-    graph.add_edge("generate_image_description_1", "generate_image_description_2")
-    graph.add_edge("generate_image_description_2", "generate_image_description_3")
-    graph.add_edge("generate_image_description_1", "generate_image_1")
-    graph.add_edge("generate_image_description_2", "generate_image_2")
-    graph.add_edge("generate_image_description_3", "generate_image_3")
-    graph.add_edge("initialize_haiku", "generate_translation_1")
-    graph.add_edge("initialize_haiku", "generate_translation_2")
-    graph.add_edge("initialize_haiku", "generate_translation_3")
-    graph.add_edge("generate_translation_1", "generate_audio_1")
-    graph.add_edge("generate_translation_2", "generate_audio_2")
-    graph.add_edge("generate_translation_3", "generate_audio_3")
-    graph.add_edge("generate_image_1", "check_status")
-    graph.add_edge("generate_image_2", "check_status")
-    graph.add_edge("generate_image_3", "check_status")
-    graph.add_edge("generate_audio_1", "check_status")
-    graph.add_edge("generate_audio_2", "check_status")
-    graph.add_edge("generate_audio_3", "check_status")
+    if batch:
+        # One prompt describes the three lines and another one translates them
+        graph.add_node("generate_all_image_descriptions", generate_all_image_descriptions)
+        graph.add_node("generate_all_translations", generate_all_translations)
+        graph.add_edge("initialize_haiku", "generate_all_image_descriptions")
+        graph.add_edge("generate_all_image_descriptions", "generate_image_1")
+        graph.add_edge("generate_all_image_descriptions", "generate_image_2")
+        graph.add_edge("generate_all_image_descriptions", "generate_image_3")
+        graph.add_edge("initialize_haiku", "generate_all_translations")
+        graph.add_edge("generate_all_translations", "generate_audio_1")
+        graph.add_edge("generate_all_translations", "generate_audio_2")
+        graph.add_edge("generate_all_translations", "generate_audio_3")
+    else:
+        # Every line is described, drawn, translated and voiced independently of the others
+        graph.add_node("generate_image_description_1", generate_image_description_1)
+        graph.add_node("generate_image_description_2", generate_image_description_2)
+        graph.add_node("generate_image_description_3", generate_image_description_3)
+        graph.add_node("generate_translation_1", generate_translation_1)
+        graph.add_node("generate_translation_2", generate_translation_2)
+        graph.add_node("generate_translation_3", generate_translation_3)
+        graph.add_edge("initialize_haiku", "generate_image_description_1")
+        graph.add_edge("initialize_haiku", "generate_image_description_2")
+        graph.add_edge("initialize_haiku", "generate_image_description_3")
+        graph.add_edge("generate_image_description_1", "generate_image_1")
+        graph.add_edge("generate_image_description_2", "generate_image_2")
+        graph.add_edge("generate_image_description_3", "generate_image_3")
+        graph.add_edge("initialize_haiku", "generate_translation_1")
+        graph.add_edge("initialize_haiku", "generate_translation_2")
+        graph.add_edge("initialize_haiku", "generate_translation_3")
+        graph.add_edge("generate_translation_1", "generate_audio_1")
+        graph.add_edge("generate_translation_2", "generate_audio_2")
+        graph.add_edge("generate_translation_3", "generate_audio_3")
+    # Check the status once, after all the branches finished
+    graph.add_edge([
+        "generate_image_1",
+        "generate_image_2",
+        "generate_image_3",
+        "generate_audio_1",
+        "generate_audio_2",
+        "generate_audio_3"
+    ], "check_status")
 
     graph.set_entry_point("initialize_haiku")
     graph.set_finish_point("check_status")
@@ -262,7 +321,8 @@ workflow = create_workflow()
 
 
 def start_workflow(user_id: str, haiku_id: str):
-    workflow.invoke({"user_id": user_id, "haiku_id": haiku_id})
+    """Run the workflow of a haiku, blocking until its media is generated"""
+    asyncio.run(workflow.ainvoke({"user_id": user_id, "haiku_id": haiku_id}))
 
 if __name__ == "__main__":
     with open("media.mermaid", "w") as f:
@@ -23,8 +23,25 @@ export interface Haiku {
   audio_link_3: string;
 }
 
+export interface MediaJob {
+  job_id: string;
+  user_id: string;
+  haiku_id: string;
+  status: string;
+  error_message: string | null;
+  attempts: number;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 export interface GenerateMediaResponse {
   haiku: Haiku;
+  job: MediaJob | null;
+}
+
+export interface FetchMediaJobResponse {
+  job: MediaJob | null;
 }
 
 export interface FetchHaikusResponse {
@@ -85,6 +102,15 @@ export const generateMedia = async (token: string, haiku_id: string): Promise<Ge
   return response.data;
 };
 
+export const fetchMediaJob = async (token: string, haiku_id: string): Promise<FetchMediaJobResponse> => {
+  const response = await axios.get(`${API_URL}/haiku/${haiku_id}/job`, {
+    headers: {
+      'Authorization': `Bearer ${token}`
+    }
+  });
+  return response.data;
+};
+
 export const deleteHaiku = async (token: string, haiku_id: string): Promise<DeleteHaikuResponse> => {
   const response = await axios.delete(`${API_URL}/haiku/${haiku_id}`, {
     headers: {
@@ -1,10 +1,11 @@
 import React, { useEffect, useState } from 'react';
 import { useParams } from 'react-router';
-import { fetchHaiku, sendMessage, generateMedia } from '../api/haikuApi';
+import { fetchHaiku, fetchMediaJob, sendMessage, generateMedia } from '../api/haikuApi';
 import SummaryDisplay from './SummaryDisplay';
 import LoadingIndicator from './LoadingIndicator';
 import ErrorMessage from './ErrorMessage';
 import { generateUUID } from '../utils/uuid';
+import { isMediaPending, MEDIA_POLL_INTERVAL } from '../utils/status';
 import { Container, Paper, Button, Box, Typography, Breadcrumbs, Link, TextField, List, ListItem, ListItemText, ListItemIcon, Divider } from '@mui/material';
 import { useAuth } from 'react-oidc-context';
 
@@ -38,6 +39,28 @@ const HaikuGenerator = () => {
     }
   }, [haiku_id, auth.isAuthenticated, auth.user?.access_token]);
 
+  // Media is generated in the background, poll its job until it finishes
+  useEffect(() => {
+    if (!isMediaPending(haiku.status)) {
+      return;
+    }
+
+    const interval = setInterval(async () => {
+      try {
+        const token = auth.user?.access_token || '';
+        const fetchedJob = await fetchMediaJob(token, haiku_id);
+        if (!fetchedJob.job || fetchedJob.job.status === 'completed' || fetchedJob.job.status === 'failed') {
+          const fetchedHaiku = await fetchHaiku(token, haiku_id);
+          setHaiku(fetchedHaiku.haiku);
+        }
+      } catch (error) {
+        console.error('Error fetching media job:', error);
+      }
+    }, MEDIA_POLL_INTERVAL);
+
+    return () => clearInterval(interval);
+  }, [haiku_id, haiku.status, auth.user?.access_token]);
+
   useEffect(() => {
     if (!auth.isAuthenticated && !auth.isLoading) {
       auth.signinRedirect();
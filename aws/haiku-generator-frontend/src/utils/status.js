@@ -0,0 +1,16 @@
+// Statuses of a haiku whose media is still being generated
+const PENDING_STATUSES = ['queued', 'in progress'];
+
+// Milliseconds between two checks of a haiku whose media is pending
+export const MEDIA_POLL_INTERVAL = 2000;
+
+export const isMediaPending = (status) => {
+  return PENDING_STATUSES.includes(status);
+};
+
+export const statusColor = (status) => {
+  if (status === 'new') return 'primary';
+  if (status === 'failed') return 'error';
+  if (isMediaPending(status)) return 'warning';
+  return 'success';
+};
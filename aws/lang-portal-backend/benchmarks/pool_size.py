@@ -0,0 +1,112 @@
+"""
+Connection pool benchmark for the asyncpg engine settings in db.py.
+
+Runs the word list query of GET /api/words from concurrent clients against the
+database configured through the DB_* environment variables, once per pool size,
+and prints throughput, latency and the time spent waiting for a connection as
+JSON. The words are seeded for a dedicated benchmark user on the first run.
+
+    python -m benchmarks.pool_size --pool-sizes 2 5 10 20 --clients 50 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from sqlalchemy import and_, func, select
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import summarize_latencies
+from db import make_engine
+from models import Word, WordReviewItem
+from vocabulary import import_vocabulary
+
+BENCHMARK_USER = "benchmark-pool-size"
+
+async def _seed(session_factory, words: int):
+    async with session_factory() as db:
+        existing = await db.scalar(select(func.count()).select_from(Word).where(Word.user_id == BENCHMARK_USER))
+        if existing >= words:
+            return
+        await import_vocabulary(db, BENCHMARK_USER, (
+            ("Benchmark", {"japanese": f"語{i}", "romaji": f"go{i}", "english": f"word {i}"})
+            for i in range(existing, words)
+        ))
+        await db.commit()
+
+async def _client(session_factory, words: int, deadline: float, latencies: list, waits: list, errors: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            async with session_factory() as db:
+                # Check out the connection first to measure the wait separately
+                await db.connection()
+                waits.append(time.perf_counter() - start)
+                query = select(
+                    Word,
+                    func.count(WordReviewItem.id).filter(WordReviewItem.correct == True),
+                    func.count(WordReviewItem.id).filter(WordReviewItem.correct == False)
+                ).outerjoin(WordReviewItem, and_(
+                    WordReviewItem.word_id == Word.id,
+                    WordReviewItem.user_id == BENCHMARK_USER
+                )) \
+                 .where(Word.user_id == BENCHMARK_USER) \
+                 .group_by(Word.id) \
+                 .order_by(Word.id) \
+                 .offset(random.randrange(max(words - 100, 1))) \
+                 .limit(100)
+                (await db.execute(query)).all()
+        except TimeoutError:
+            # No connection became free within DB_POOL_TIMEOUT
+            errors.append(1)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+async def run_pool_size(pool_size: int, clients: int, duration: float, words: int, pgbouncer: bool) -> dict:
+    """Benchmark a single pool size, without overflow connections"""
+    engine = make_engine(echo=False, pool_size=pool_size, max_overflow=0, pgbouncer=pgbouncer)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await _seed(session_factory, words)
+    
+    latencies, waits, errors = [], [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*[
+        _client(session_factory, words, deadline, latencies, waits, errors)
+        for _ in range(clients)
+    ])
+    await engine.dispose()
+    
+    return {
+        "pool_size": pool_size,
+        "clients": clients,
+        "requests": summarize_latencies(latencies, duration, len(errors)),
+        "connection_wait": summarize_latencies(waits, duration)
+    }
+
+async def run(pool_sizes, clients: int, duration: float, words: int, pgbouncer: bool) -> list:
+    return [
+        await run_pool_size(pool_size, clients, duration, words, pgbouncer)
+        for pool_size in pool_sizes
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[2, 5, 10, 20, 40])
+    parser.add_argument("--clients", type=int, default=50, help="concurrent requests")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per pool size")
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--pgbouncer", action="store_true", help="disable the prepared statement caches")
+    args = parser.parse_args()
+    
+    random.seed(0)
+    results = asyncio.run(run(args.pool_sizes, args.clients, args.duration, args.words, args.pgbouncer))
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
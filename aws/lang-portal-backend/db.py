@@ -1,5 +1,6 @@
 import dotenv
 import os
+from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
@@ -13,15 +14,80 @@ DB_NAME = os.getenv('DB_NAME', 'dbname')
 
 DATABASE_URL = f'postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
 
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,
-    pool_size=5,
-    max_overflow=10
-)
+# Reader endpoint of the Aurora cluster for read-only requests, every query goes to the writer when unset
+DB_READER_HOST = os.getenv('DB_READER_HOST')
+DB_READER_PORT = os.getenv('DB_READER_PORT', DB_PORT)
+
+READER_DATABASE_URL = f'postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_READER_HOST}:{DB_READER_PORT}/{DB_NAME}' if DB_READER_HOST else None
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+DB_ECHO = _env_flag('DB_ECHO', 'false')
+# Connections kept open per server process, every ECS task opens up to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections against the database
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+# Seconds a request waits for a free connection before failing
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+# Seconds after which a connection is replaced, below the idle timeouts of proxies and load balancers
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+# Test connections on checkout, so a failover or restart does not fail the next requests
+DB_POOL_PRE_PING = _env_flag('DB_POOL_PRE_PING', 'true')
+# Prepared statements cached per connection by asyncpg and by SQLAlchemy
+DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '100'))
+# Connect through PgBouncer in transaction pooling mode, where a connection
+# does not keep its prepared statements from one transaction to the next
+DB_PGBOUNCER = _env_flag('DB_PGBOUNCER', 'false')
+# Seconds the reads of a user stay on the writer after their last write, longer than the replica lag
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', '10'))
+
+def engine_options(
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: float = DB_POOL_TIMEOUT,
+    pool_recycle: int = DB_POOL_RECYCLE,
+    pool_pre_ping: bool = DB_POOL_PRE_PING,
+    statement_cache_size: int = DB_STATEMENT_CACHE_SIZE,
+    pgbouncer: bool = DB_PGBOUNCER
+) -> dict:
+    """Keyword arguments of create_async_engine for the pool and asyncpg settings"""
+    if pgbouncer:
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            # Unnamed statements can clash between clients sharing a server connection
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__"
+        }
+    else:
+        connect_args = {
+            "statement_cache_size": statement_cache_size,
+            "prepared_statement_cache_size": statement_cache_size
+        }
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": pool_pre_ping,
+        "connect_args": connect_args
+    }
+
+def make_engine(url: str = DATABASE_URL, echo: bool = DB_ECHO, **options):
+    """Create the async engine, options override the DB_* environment settings"""
+    return create_async_engine(url, echo=echo, **engine_options(**options))
+
+engine = make_engine()
+reader_engine = make_engine(READER_DATABASE_URL) if READER_DATABASE_URL else engine
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+ReaderSessionLocal = sessionmaker(reader_engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
 async def get_db():
     async with AsyncSessionLocal() as session:
-        yield session 
\ No newline at end of file
+        yield session
+
+async def get_reader_db():
+    """Session on the reader endpoint, for data no user request writes"""
+    async with ReaderSessionLocal() as session:
+        yield session
@@ -0,0 +1,4 @@
+-- Folds romaji spelling variants, mirrors ROMAJI_SPELLINGS in search.py
+CREATE OR REPLACE FUNCTION romaji_key(text) RETURNS text AS $$
+    SELECT replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(lower($1), ' ', ''), '-', ''), '''', ''), '.', ''), 'ā', 'a'), 'ī', 'i'), 'ū', 'u'), 'ē', 'e'), 'ō', 'o'), 'ô', 'o'), 'aa', 'a'), 'ii', 'i'), 'uu', 'u'), 'ou', 'o'), 'oo', 'o'), 'shi', 'si'), 'sh', 'sy'), 'chi', 'ti'), 'ch', 'ty'), 'tsu', 'tu'), 'fu', 'hu'), 'ji', 'zi'), 'j', 'zy'), 'mb', 'nb'), 'mp', 'np')
+$$ LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS idx_words_search_vector ON words USING GIN (to_tsvector('simple', coalesce(romaji, '') || ' ' || coalesce(english, '')));
@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS idx_words_japanese_trgm ON words USING GIN (japanese gin_trgm_ops);
@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS idx_words_romaji_key_trgm ON words USING GIN (romaji_key(romaji) gin_trgm_ops);
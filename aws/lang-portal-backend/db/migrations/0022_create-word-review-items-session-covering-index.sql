@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS idx_word_review_items_session_id_word_id ON word_review_items(study_session_id, word_id, correct);
\ No newline at end of file
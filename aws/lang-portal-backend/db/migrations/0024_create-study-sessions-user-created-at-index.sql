@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS idx_study_sessions_user_id_created_at ON study_sessions(user_id, created_at, id);
\ No newline at end of file
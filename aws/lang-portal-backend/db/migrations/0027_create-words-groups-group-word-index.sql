@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS idx_words_groups_group_id_word_id ON words_groups(group_id, word_id);
\ No newline at end of file
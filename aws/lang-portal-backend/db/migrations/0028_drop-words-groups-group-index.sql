@@ -0,0 +1 @@
+DROP INDEX IF EXISTS idx_words_groups_group_id;
\ No newline at end of file
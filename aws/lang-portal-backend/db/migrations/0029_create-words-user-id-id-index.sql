@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS idx_words_user_id_id ON words(user_id, id);
\ No newline at end of file
@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS idx_groups_user_id_id ON groups(user_id, id);
\ No newline at end of file
@@ -0,0 +1 @@
+DROP INDEX IF EXISTS idx_groups_user_id;
\ No newline at end of file
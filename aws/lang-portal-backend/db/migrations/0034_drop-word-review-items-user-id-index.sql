@@ -0,0 +1 @@
+DROP INDEX IF EXISTS idx_word_review_items_user_id;
\ No newline at end of file
@@ -0,0 +1 @@
+DROP INDEX IF EXISTS idx_study_sessions_user_id;
\ No newline at end of file
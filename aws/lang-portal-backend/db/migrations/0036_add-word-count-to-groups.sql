@@ -0,0 +1 @@
+ALTER TABLE groups ADD COLUMN IF NOT EXISTS word_count INTEGER NOT NULL DEFAULT 0;
\ No newline at end of file
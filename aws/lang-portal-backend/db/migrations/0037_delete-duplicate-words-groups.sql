@@ -0,0 +1,5 @@
+DELETE FROM words_groups duplicate
+USING words_groups original
+WHERE duplicate.group_id = original.group_id
+    AND duplicate.word_id = original.word_id
+    AND duplicate.id > original.id;
\ No newline at end of file
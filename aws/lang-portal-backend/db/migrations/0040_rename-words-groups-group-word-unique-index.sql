@@ -0,0 +1 @@
+ALTER INDEX IF EXISTS idx_words_groups_group_id_word_id_unique RENAME TO idx_words_groups_group_id_word_id;
\ No newline at end of file
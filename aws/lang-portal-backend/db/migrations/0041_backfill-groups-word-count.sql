@@ -0,0 +1,6 @@
+UPDATE groups
+SET word_count = (
+    SELECT COUNT(*)
+    FROM words_groups
+    WHERE words_groups.group_id = groups.id
+);
\ No newline at end of file
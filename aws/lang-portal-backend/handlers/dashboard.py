@@ -1,27 +1,30 @@
 from auth import get_current_user
 from datetime import datetime
-from db import get_db
 from fastapi import APIRouter, Depends
 from models import StudySession, Group, WordReviewItem, Word, StudyActivity
+from replicas import get_read_db
 from sqlalchemy import func, select, Integer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
 @router.get("/last_study_session")
-async def get_last_study_session(db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_user)):
+async def get_last_study_session(db: AsyncSession = Depends(get_read_db), current_user: str = Depends(get_current_user)):
+    # Count the reviews of the latest session only, instead of grouping all sessions first
+    review_items_count = select(func.count(WordReviewItem.id)) \
+        .where(WordReviewItem.study_session_id == StudySession.id) \
+        .where(WordReviewItem.user_id == current_user) \
+        .scalar_subquery()
     query = (
         select(
             StudySession,
             Group.name.label("group_name"),
             StudyActivity.name.label("activity_name"),
-            func.count(WordReviewItem.id).label("review_items_count")
+            review_items_count.label("review_items_count")
         )
         .join(Group)
         .join(StudyActivity)
-        .outerjoin(WordReviewItem)
         .where(StudySession.user_id == current_user)
-        .group_by(StudySession.id, Group.name, StudyActivity.name)
         .order_by(StudySession.created_at.desc())
         .limit(1)
     )
@@ -42,9 +45,9 @@ async def get_last_study_session(db: AsyncSession = Depends(get_db), current_use
     }
 
 @router.get("/study_progress")
-async def get_study_progress(db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_user)):
+async def get_study_progress(db: AsyncSession = Depends(get_read_db), current_user: str = Depends(get_current_user)):
     # Get total available words
-    total_words_query = select(func.count()).select_from(Word)
+    total_words_query = select(func.count()).select_from(Word).where(Word.user_id == current_user)
     total_words_result = await db.execute(total_words_query)
     total_available_words = total_words_result.scalar()
     
@@ -61,7 +64,7 @@ async def get_study_progress(db: AsyncSession = Depends(get_db), current_user: s
     }
 
 @router.get("/quick-stats")
-async def get_quick_stats(db: AsyncSession = Depends(get_db), current_user: str = Depends(get_current_user)):
+async def get_quick_stats(db: AsyncSession = Depends(get_read_db), current_user: str = Depends(get_current_user)):
     # Calculate success rate
     review_stats_query = select(
         func.count().label("total"),
@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+from auth import get_current_user
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from models import Word, Group, WordGroup, StudySession, StudyActivity, WordReviewItem
+from replicas import LAST_WRITE_HEADER, read_sessionmaker
+from sqlalchemy import select
+
+router = APIRouter()
+
+# Rows fetched from the database cursor per chunk written to the response
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_DATASETS = {
+    "words": Word,
+    "groups": Group,
+    "words_groups": WordGroup,
+    "study_activities": StudyActivity,
+    "study_sessions": StudySession,
+    "word_review_items": WordReviewItem
+}
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+def _export_value(value, nested_as_json: bool):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if nested_as_json and isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+async def _stream_rows(model, format: str, user_id: str, last_write: str | None):
+    """Yield the rows of a table chunk by chunk from a server-side cursor"""
+    columns = list(model.__table__.columns)
+    query = select(*columns) \
+        .order_by(*model.__table__.primary_key.columns) \
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    
+    # Study activities are shared, everything else belongs to a user
+    if hasattr(model, "user_id"):
+        query = query.where(model.user_id == user_id)
+    
+    # The request scoped session is closed before the body is streamed, so use our own
+    async with read_sessionmaker(last_write)() as db:
+        result = await db.stream(query)
+    
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow([column.name for column in columns])
+            yield buffer.getvalue()
+    
+        async for rows in result.partitions():
+            buffer = io.StringIO()
+            if format == "csv":
+                writer = csv.writer(buffer)
+                writer.writerows([_export_value(value, True) for value in row] for row in rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(
+                        {column.name: _export_value(value, False) for column, value in zip(columns, row)},
+                        ensure_ascii=False
+                    ))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: str,
+    request: Request,
+    format: str = "ndjson",
+    current_user: str = Depends(get_current_user)
+):
+    """Stream every row of a dataset as NDJSON or CSV"""
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset, expected one of {list(EXPORT_DATASETS)}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format, expected one of {list(EXPORT_FORMATS)}")
+    
+    return StreamingResponse(
+        _stream_rows(EXPORT_DATASETS[dataset], format, current_user, request.headers.get(LAST_WRITE_HEADER)),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{format}"'}
+    )
@@ -1,11 +1,14 @@
 from auth import get_current_user
+from cache import response_cache
 from datetime import timedelta
-from db import get_db
 from fastapi import APIRouter, Depends
-from models import Group, Word, StudySession, StudyActivity, WordReviewItem
-from sqlalchemy import func, select, and_
+from models import Group, Word, WordGroup, StudySession, StudyActivity, WordReviewItem
+from pagination import paginate_query, split_page, build_pagination
+from replicas import get_read_db
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
+from typing import Optional
 
 router = APIRouter()
 
@@ -13,115 +16,118 @@ router = APIRouter()
 async def get_groups(
     page: int = 1,
     per_page: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
     current_user: str = Depends(get_current_user)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
+    cache_key = response_cache.key(
+        "groups", current_user, page=page, per_page=per_page, cursor=cursor, include_total=include_total
+    )
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     # Get total count
-    count_query = select(func.count()) \
-        .select_from(Group) \
-        .where(Group.user_id == current_user)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
-    
-    # Get groups with word count
-    query = select(
-        Group,
-        func.count(Word.id).label("word_count")
-    ).outerjoin(Group.words) \
-     .where(Group.user_id == current_user) \
-     .group_by(Group.id) \
-     .offset(offset) \
-     .limit(per_page)
+    total_count = None
+    if include_total:
+        count_query = select(func.count()) \
+            .select_from(Group) \
+            .where(Group.user_id == current_user)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
+    
+    # Get groups with their materialized word count, read from the user_id, id index
+    query = select(Group).where(Group.user_id == current_user)
+    query = paginate_query(query, [Group.id], page, per_page, cursor)
     
     result = await db.execute(query)
-    groups = result.all()
+    groups, next_cursor = split_page(result.scalars().all(), per_page, lambda group: [group.id])
     
-    return {
+    response = {
         "items": [
             {
                 "id": group.id,
                 "name": group.name,
-                "word_count": word_count
+                "word_count": group.word_count
             }
-            for group, word_count in groups
+            for group in groups
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     }
+    await response_cache.set(cache_key, response)
+    return response
 
 @router.get("/{group_id}")
 async def get_group(
     group_id: int, 
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: str = Depends(get_current_user)
 ):
-    # Get group with word count
-    query = select(
-        Group,
-        func.count(Word.id).label("word_count")
-    ).outerjoin(Group.words) \
-     .where(Group.id == group_id) \
-     .where(Group.user_id == current_user) \
-     .group_by(Group.id)
+    cache_key = response_cache.key("group", current_user, group_id=group_id)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Get group with its materialized word count
+    query = select(Group) \
+        .where(Group.id == group_id) \
+        .where(Group.user_id == current_user)
     
     result = await db.execute(query)
-    group_data = result.first()
+    group = result.scalar_one_or_none()
     
-    if not group_data:
+    if not group:
         return None
     
-    group, word_count = group_data
-    
-    return {
+    response = {
         "id": group.id,
         "name": group.name,
         "stats": {
-            "total_word_count": word_count
+            "total_word_count": group.word_count
         }
     }
+    await response_cache.set(cache_key, response)
+    return response
 
 @router.get("/{group_id}/words")
 async def get_group_words(
     group_id: int,
     page: int = 1,
     per_page: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
     current_user: str = Depends(get_current_user)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count of words in group
-    count_query = select(func.count()) \
-        .select_from(Word) \
-        .join(Word.groups) \
-        .where(Group.id == group_id) \
-        .where(Group.user_id == current_user)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
-    
-    # Get words with their review stats
+    total_count = None
+    if include_total:
+        count_query = select(Group.word_count) \
+            .where(Group.id == group_id) \
+            .where(Group.user_id == current_user)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar() or 0
+    
+    # Get words with their review stats, counted per returned word so that the
+    # page is read from the group_id, word_id index without grouping the join
+    def review_count(correct: bool):
+        return select(func.count(WordReviewItem.id)) \
+            .where(WordReviewItem.user_id == current_user) \
+            .where(WordReviewItem.word_id == Word.id) \
+            .where(WordReviewItem.correct == correct) \
+            .scalar_subquery()
     query = select(
         Word,
-        func.count(WordReviewItem.id).filter(WordReviewItem.correct == True).label("correct_count"),
-        func.count(WordReviewItem.id).filter(WordReviewItem.correct == False).label("wrong_count")
-    ).join(Word.groups) \
-     .outerjoin(WordReviewItem) \
-     .where(Group.id == group_id) \
-     .where(Group.user_id == current_user) \
-     .group_by(Word.id) \
-     .offset(offset) \
-     .limit(per_page)
+        review_count(True).label("correct_count"),
+        review_count(False).label("wrong_count")
+    ).join(WordGroup, WordGroup.word_id == Word.id) \
+     .where(WordGroup.group_id == group_id) \
+     .where(WordGroup.user_id == current_user)
+    query = paginate_query(query, [Word.id], page, per_page, cursor)
     
     result = await db.execute(query)
-    words = result.all()
+    words, next_cursor = split_page(result.all(), per_page, lambda row: [row.Word.id])
     
     return {
         "items": [
@@ -134,12 +140,7 @@ async def get_group_words(
             }
             for word, correct_count, wrong_count in words
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     }
 
 @router.get("/{group_id}/study_sessions")
@@ -147,23 +148,29 @@ async def get_group_study_sessions(
     group_id: int,
     page: int = 1,
     per_page: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
     current_user: str = Depends(get_current_user)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count
-    count_query = (
-        select(func.count())
-        .select_from(StudySession)
-        .where(StudySession.group_id == group_id) \
-        .where(StudySession.user_id == current_user)
-    )
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
-    
-    # Get study sessions with review items count
+    total_count = None
+    if include_total:
+        count_query = (
+            select(func.count())
+            .select_from(StudySession)
+            .where(StudySession.group_id == group_id) \
+            .where(StudySession.user_id == current_user)
+        )
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
+    
+    # Get study sessions with review items count, counted per returned session
+    # so that the page is read straight from the group_id, created_at index
+    review_items_count = select(func.count(WordReviewItem.id)) \
+        .where(WordReviewItem.study_session_id == StudySession.id) \
+        .where(WordReviewItem.user_id == current_user) \
+        .scalar_subquery()
     query = (
         select(
             StudySession.id,
@@ -172,28 +179,19 @@ async def get_group_study_sessions(
             StudySession.study_activity_id,
             StudyActivity.name.label("activity_name"),
             Group.name.label("group_name"),
-            func.count(WordReviewItem.id).label("review_items_count")
+            review_items_count.label("review_items_count")
         )
         .join(StudyActivity, StudySession.study_activity_id == StudyActivity.id)
         .join(Group, StudySession.group_id == Group.id)
-        .outerjoin(StudySession.review_items)
         .where(StudySession.group_id == group_id) \
-        .where(Group.user_id == current_user) \
-        .group_by(
-            StudySession.id,
-            StudySession.created_at,
-            StudySession.group_id,
-            StudySession.study_activity_id,
-            StudyActivity.name,
-            Group.name
-        )
-        .order_by(StudySession.created_at.desc())
-        .offset(offset)
-        .limit(per_page)
+        .where(Group.user_id == current_user)
+    )
+    query = paginate_query(
+        query, [StudySession.created_at, StudySession.id], page, per_page, cursor, descending=True
     )
     
     result = await db.execute(query)
-    sessions = result.all()
+    sessions, next_cursor = split_page(result.all(), per_page, lambda row: [row.created_at, row.id])
     
     return {
         "items": [
@@ -207,10 +205,5 @@ async def get_group_study_sessions(
             }
             for session in sessions
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     } 
\ No newline at end of file
@@ -1,11 +1,15 @@
 from auth import get_current_user
+from cache import response_cache
 from datetime import datetime, timedelta, UTC
-from db import get_db
+from db import get_reader_db
 from fastapi import APIRouter, Depends, HTTPException, Body
 from models import StudyActivity, StudySession, WordReviewItem, Group
+from pagination import paginate_query, split_page, build_pagination
 from pydantic import BaseModel
+from replicas import get_read_db, get_write_db
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
 router = APIRouter()
 
@@ -15,13 +19,19 @@ class CreateStudySessionRequest(BaseModel):
 
 @router.get("")
 async def get_study_activities(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_reader_db)
 ):
+    # Study activities are shared by all users, so they are cached once
+    cache_key = response_cache.key("study_activities")
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     query = select(StudyActivity)
     result = await db.execute(query)
     activities = result.scalars().all()
     
-    return [
+    response = [
         {
             "id": activity.id,
             "name": activity.name,
@@ -31,11 +41,13 @@ async def get_study_activities(
         }
         for activity in activities
     ]
+    await response_cache.set(cache_key, response)
+    return response
 
 @router.get("/{activity_id}")
 async def get_study_activity(
     activity_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_reader_db)
 ):
     query = select(StudyActivity) \
         .where(StudyActivity.id == activity_id)
@@ -58,58 +70,66 @@ async def get_activity_study_sessions(
     activity_id: int,
     page: int = 1,
     per_page: int = 100,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: str = Depends(get_current_user)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count
-    count_query = select(func.count()) \
-        .select_from(StudySession) \
-        .where(StudySession.study_activity_id == activity_id) \
-        .where(StudySession.user_id == current_user)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
+    total_count = None
+    if include_total:
+        count_query = select(func.count()) \
+            .select_from(StudySession) \
+            .where(StudySession.study_activity_id == activity_id) \
+            .where(StudySession.user_id == current_user)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
     
-    # Get study sessions with review items count
-    query = select(
-        StudySession,
-        func.count(WordReviewItem.id).label("review_items_count")
-    ).outerjoin(StudySession.review_items) \
-     .where(StudySession.study_activity_id == activity_id) \
-     .where(StudySession.user_id == current_user) \
-     .group_by(StudySession.id) \
-     .order_by(StudySession.created_at.desc()) \
-     .offset(offset) \
-     .limit(per_page)
+    # Get study sessions with their activity and group names and review items count,
+    # counted per returned session so that the page is read from the user_id, created_at index
+    review_items_count = select(func.count(WordReviewItem.id)) \
+        .where(WordReviewItem.study_session_id == StudySession.id) \
+        .where(WordReviewItem.user_id == current_user) \
+        .scalar_subquery()
+    query = (
+        select(
+            StudySession.id,
+            StudySession.created_at,
+            StudyActivity.name.label("activity_name"),
+            Group.name.label("group_name"),
+            review_items_count.label("review_items_count")
+        )
+        .join(StudyActivity, StudySession.study_activity_id == StudyActivity.id)
+        .join(Group, StudySession.group_id == Group.id)
+        .where(StudySession.study_activity_id == activity_id)
+        .where(StudySession.user_id == current_user)
+    )
+    query = paginate_query(
+        query, [StudySession.created_at, StudySession.id], page, per_page, cursor, descending=True
+    )
     
     result = await db.execute(query)
-    sessions = result.all()
+    sessions, next_cursor = split_page(result.all(), per_page, lambda row: [row.created_at, row.id])
     
     return {
         "items": [
             {
                 "id": session.id,
-                "activity_name": session.activity.name,
-                "group_name": session.group.name,
+                "activity_name": session.activity_name,
+                "group_name": session.group_name,
                 "start_time": session.created_at.isoformat(),
                 "end_time": (session.created_at + timedelta(minutes=10)).isoformat(),  # Estimated
-                "review_items_count": review_count
+                "review_items_count": session.review_items_count
             }
-            for session, review_count in sessions
+            for session in sessions
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     }
 
 @router.post("")
 async def create_study_session(
     request: CreateStudySessionRequest = Body(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: str = Depends(get_current_user)
 ):
     group_id = request.group_id
@@ -141,6 +161,7 @@ async def create_study_session(
     
     db.add(session)
     await db.commit()
+    await response_cache.invalidate(current_user)
     await db.refresh(session)
     
     return {
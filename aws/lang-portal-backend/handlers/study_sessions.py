@@ -1,35 +1,52 @@
 from auth import get_current_user
+from cache import response_cache
 from datetime import datetime, timedelta, UTC
-from db import get_db
 from fastapi import APIRouter, Depends, HTTPException, Body
 from models import StudySession, Word, WordReviewItem, StudyActivity, Group
-from pydantic import BaseModel
-from sqlalchemy import func, select, and_
+from pagination import paginate_query, split_page, build_pagination
+from pydantic import BaseModel, Field
+from replicas import get_read_db, get_write_db
+from sqlalchemy import func, select, and_, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
 router = APIRouter()
 
 class CreateWordReviewRequest(BaseModel):
     correct: bool
 
+class WordReviewBatchItem(BaseModel):
+    word_id: int
+    correct: bool
+    answered_at: Optional[datetime] = None
+
+class CreateWordReviewBatchRequest(BaseModel):
+    items: List[WordReviewBatchItem] = Field(..., min_length=1, max_length=10000)
+
 @router.get("")
 async def get_study_sessions(
     page: int = 1,
     per_page: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
     current_user: str = Depends(get_current_user)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count
-    count_query = select(func.count()) \
-        .select_from(StudySession) \
-        .where(StudySession.user_id == current_user)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
+    total_count = None
+    if include_total:
+        count_query = select(func.count()) \
+            .select_from(StudySession) \
+            .where(StudySession.user_id == current_user)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
     
-    # Get study sessions with review items count
+    # Get study sessions with review items count, counted per returned session
+    # so that the page is read straight from the user_id, created_at index
+    review_items_count = select(func.count(WordReviewItem.id)) \
+        .where(WordReviewItem.study_session_id == StudySession.id) \
+        .where(WordReviewItem.user_id == current_user) \
+        .scalar_subquery()
     query = (
         select(
             StudySession.id,
@@ -38,27 +55,18 @@ async def get_study_sessions(
             StudySession.study_activity_id,
             StudyActivity.name.label("activity_name"),
             Group.name.label("group_name"),
-            func.count(WordReviewItem.id).label("review_items_count")
+            review_items_count.label("review_items_count")
         )
         .join(StudyActivity, StudySession.study_activity_id == StudyActivity.id)
         .join(Group, StudySession.group_id == Group.id)
-        .outerjoin(StudySession.review_items)
-        .group_by(
-            StudySession.id,
-            StudySession.created_at,
-            StudySession.group_id,
-            StudySession.study_activity_id,
-            StudyActivity.name,
-            Group.name
-        )
         .where(StudySession.user_id == current_user)
-        .order_by(StudySession.created_at.desc())
-        .offset(offset)
-        .limit(per_page)
+    )
+    query = paginate_query(
+        query, [StudySession.created_at, StudySession.id], page, per_page, cursor, descending=True
     )
     
     result = await db.execute(query)
-    sessions = result.all()
+    sessions, next_cursor = split_page(result.all(), per_page, lambda row: [row.created_at, row.id])
     
     return {
         "items": [
@@ -72,18 +80,13 @@ async def get_study_sessions(
             }
             for session in sessions
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     }
 
 @router.get("/{session_id}")
 async def get_study_session(
     session_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: str = Depends(get_current_user)
 ):
     """Get details of a specific study session"""
@@ -116,18 +119,20 @@ async def get_session_words(
     session_id: int,
     page: int = 1,
     per_page: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
     current_user: str = Depends(get_current_user)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count of reviewed words in session
-    count_query = select(func.count(Word.id)) \
-        .join(WordReviewItem) \
-        .where(WordReviewItem.study_session_id == session_id)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
+    total_count = None
+    if include_total:
+        count_query = select(func.count(Word.id)) \
+            .join(WordReviewItem) \
+            .where(WordReviewItem.study_session_id == session_id) \
+            .where(WordReviewItem.user_id == current_user)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
     
     # Get words with their review results for this session
     query = select(
@@ -137,12 +142,11 @@ async def get_session_words(
     ).join(WordReviewItem) \
      .where(WordReviewItem.study_session_id == session_id) \
      .where(WordReviewItem.user_id == current_user) \
-     .group_by(Word.id) \
-     .offset(offset) \
-     .limit(per_page)
+     .group_by(Word.id)
+    query = paginate_query(query, [Word.id], page, per_page, cursor)
     
     result = await db.execute(query)
-    words = result.all()
+    words, next_cursor = split_page(result.all(), per_page, lambda row: [row.Word.id])
     
     return {
         "items": [
@@ -156,12 +160,7 @@ async def get_session_words(
             }
             for word, correct_count, wrong_count in words
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     }
 
 @router.post("/{session_id}/words/{word_id}/review")
@@ -169,7 +168,7 @@ async def create_word_review(
     session_id: int,
     word_id: int,
     request: CreateWordReviewRequest = Body(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: str = Depends(get_current_user)
 ):
     correct = request.correct
@@ -203,6 +202,7 @@ async def create_word_review(
     
     db.add(review_item)
     await db.commit()
+    await response_cache.invalidate(current_user)
     
     return {
         "success": True,
@@ -212,11 +212,64 @@ async def create_word_review(
         "created_at": review_item.created_at.isoformat()
     }
 
+@router.post("/{session_id}/reviews")
+async def create_word_reviews(
+    session_id: int,
+    request: CreateWordReviewBatchRequest = Body(...),
+    db: AsyncSession = Depends(get_write_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Record a batch of review results, e.g. a finished quiz or an offline sync"""
+    word_ids = {item.word_id for item in request.items}
+    
+    # Verify the session and all words exist with a single query
+    validation_query = select(StudySession.id, Word.id) \
+        .select_from(StudySession) \
+        .outerjoin(Word, and_(Word.id.in_(word_ids), Word.user_id == current_user)) \
+        .where(StudySession.id == session_id) \
+        .where(StudySession.user_id == current_user)
+    result = await db.execute(validation_query)
+    rows = result.all()
+    
+    if not rows:
+        raise HTTPException(status_code=404, detail="Study session not found")
+    
+    missing_word_ids = word_ids - {word_id for _, word_id in rows}
+    if missing_word_ids:
+        raise HTTPException(status_code=404, detail=f"Words not found: {sorted(missing_word_ids)}")
+    
+    now = datetime.now(UTC).replace(tzinfo=None)
+    review_items = []
+    for item in request.items:
+        # Timestamps are stored as naive UTC
+        created_at = item.answered_at or now
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(UTC).replace(tzinfo=None)
+        
+        review_items.append({
+            "user_id": current_user,
+            "word_id": item.word_id,
+            "study_session_id": session_id,
+            "correct": item.correct,
+            "created_at": created_at
+        })
+    
+    # Insert all review items with one executemany
+    await db.execute(insert(WordReviewItem), review_items)
+    await db.commit()
+    await response_cache.invalidate(current_user)
+    
+    return {
+        "success": True,
+        "study_session_id": session_id,
+        "created_count": len(review_items)
+    }
+
 @router.get("/{session_id}/next_words")
 async def get_next_words(
     session_id: int,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: str = Depends(get_current_user)
 ):
     # Get the study session
@@ -238,7 +291,8 @@ async def get_next_words(
             WordReviewItem,
             and_(
                 WordReviewItem.word_id == Word.id,
-                WordReviewItem.study_session_id == session_id
+                WordReviewItem.study_session_id == session_id,
+                WordReviewItem.user_id == current_user
             )
         ) \
         .where(WordReviewItem.id == None) \
@@ -1,17 +1,18 @@
-import json
 from auth import get_current_user
-from db import get_db
+from cache import response_cache
 from fastapi import APIRouter, Depends
 from models import StudySession, WordReviewItem, Word, Group, WordGroup
 from pathlib import Path
+from replicas import get_write_db
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
+from vocabulary import import_vocabulary, read_vocabulary
 
 router = APIRouter()
 
 @router.post("/reset_study_progress")
 async def reset_study_progress(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: str = Depends(get_current_user)
 ):
     """Reset all study progress while keeping words and groups intact"""
@@ -23,6 +24,7 @@ async def reset_study_progress(
     await db.execute(delete(StudySession).where(StudySession.user_id == current_user))
     
     await db.commit()
+    await response_cache.invalidate(current_user)
     
     return {
         "success": True,
@@ -31,7 +33,7 @@ async def reset_study_progress(
 
 @router.post("/reset_data")
 async def reset_data(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: str = Depends(get_current_user)
 ):
     """Reset all data"""
@@ -52,6 +54,7 @@ async def reset_data(
     await db.execute(delete(Group).where(Group.user_id == current_user))
     
     await db.commit()
+    await response_cache.invalidate(current_user)
     
     return {
         "success": True,
@@ -60,50 +63,18 @@ async def reset_data(
 
 @router.post("/load_initial_data")
 async def load_initial_data(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     current_user: str = Depends(get_current_user)
 ):
     """Load initial data"""
 
-    # Load seed data
+    # Load seed data with set-based inserts
     seeds_dir = Path('db/seeds')
-    for seed_file in seeds_dir.glob('*.json'):
-        with open(seed_file) as f:
-            seed_data = json.load(f)
-            
-            # Create group
-            group = Group(
-                user_id=current_user,
-                name=seed_data['group_name'],
-            )
-            db.add(group)
-            
-            # Create words and link to group
-            words = []
-            for word_data in seed_data['words']:
-                word = Word(
-                    user_id=current_user,
-                    japanese=word_data['japanese'],
-                    romaji=word_data['romaji'],
-                    english=word_data['english'],
-                    parts=word_data.get('parts', {})
-                )
-                db.add(word)
-                words.append(word)
-
-            # Get the group ID and the word ID
-            await db.flush()
-
-            # Create word-group association
-            for word in words:
-                word_group = WordGroup(
-                    user_id=current_user,
-                    word_id=word.id,
-                    group_id=group.id
-                )
-                db.add(word_group)
+    for seed_file in sorted(seeds_dir.glob('*.json')):
+        await import_vocabulary(db, current_user, read_vocabulary(seed_file))
     
     await db.commit()
+    await response_cache.invalidate(current_user)
     
     return {
         "success": True,
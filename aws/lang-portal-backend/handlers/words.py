@@ -1,9 +1,12 @@
 from auth import get_current_user
-from db import get_db
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from models import Word, WordReviewItem, Group
-from sqlalchemy import func, select
+from pagination import paginate_query, split_page, build_pagination
+from replicas import get_read_db
+from search import SEARCH_VECTOR, romaji_key, prefix_tsquery
+from sqlalchemy import and_, func, select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
 router = APIRouter()
 
@@ -11,29 +14,33 @@ router = APIRouter()
 async def get_words(
     page: int = 1,
     per_page: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
     current_user: str = Depends(get_current_user)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count
-    count_query = select(func.count()).select_from(Word).where(Word.user_id == current_user)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
+    total_count = None
+    if include_total:
+        count_query = select(func.count()).select_from(Word).where(Word.user_id == current_user)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
     
-    # Get words with their review stats filtered by user_id
+    # Get the words of the user with their review stats
     query = select(
         Word,
         func.count(WordReviewItem.id).filter(WordReviewItem.correct == True).label("correct_count"),
         func.count(WordReviewItem.id).filter(WordReviewItem.correct == False).label("wrong_count")
-    ).outerjoin(WordReviewItem) \
-     .group_by(Word.id) \
-     .offset(offset) \
-     .limit(per_page)
+    ).outerjoin(WordReviewItem, and_(
+        WordReviewItem.word_id == Word.id,
+        WordReviewItem.user_id == current_user
+    )) \
+     .where(Word.user_id == current_user) \
+     .group_by(Word.id)
+    query = paginate_query(query, [Word.id], page, per_page, cursor)
     
     result = await db.execute(query)
-    words = result.all()
+    words, next_cursor = split_page(result.all(), per_page, lambda row: [row.Word.id])
     
     return {
         "items": [
@@ -47,18 +54,89 @@ async def get_words(
             }
             for word, correct_count, wrong_count in words
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
+    }
+
+@router.get("/search")
+async def search_words(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    fuzzy: bool = True,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: str = Depends(get_current_user)
+):
+    """Search words by japanese, romaji or english with prefix and fuzzy romaji matching"""
+    term = q.strip().lower()
+    key = romaji_key(term)
+    word_key = func.romaji_key(Word.romaji)
+    
+    query = select(
+        Word,
+        func.count(WordReviewItem.id).filter(WordReviewItem.correct == True).label("correct_count"),
+        func.count(WordReviewItem.id).filter(WordReviewItem.correct == False).label("wrong_count"),
+        word_key.label("word_key")
+    ).outerjoin(WordReviewItem, and_(
+        WordReviewItem.word_id == Word.id,
+        WordReviewItem.user_id == current_user
+    )) \
+     .where(Word.user_id == current_user) \
+     .group_by(Word.id)
+    
+    # Word prefixes through the tsvector index, substrings through the trigram indexes
+    conditions = [
+        Word.japanese.contains(term, autoescape=True),
+        word_key.contains(key, autoescape=True)
+    ]
+    tsquery = prefix_tsquery(term)
+    if tsquery is not None:
+        conditions.append(SEARCH_VECTOR.op("@@")(tsquery))
+    
+    # Exact matches need no ranking, so the scan can stop after a few pages of rows
+    result = await db.execute(query.where(or_(*conditions)).limit(limit * 5))
+    rows = result.all()
+    
+    # Only rank fuzzy trigram matches when the exact ones do not fill the page
+    if fuzzy and len(key) > 3 and len(rows) < limit:
+        fuzzy_query = query.where(
+            word_key.op("%")(key),
+            Word.id.notin_([row.Word.id for row in rows])
+        ).order_by(func.similarity(word_key, key).desc()).limit(limit)
+        result = await db.execute(fuzzy_query)
+        rows += result.all()
+    
+    # Prefix matches first, then substring matches, then fuzzy matches
+    matches = []
+    for word, correct_count, wrong_count, row_key in rows:
+        texts = [(text or "").lower() for text in (word.japanese, word.romaji, word.english)]
+        if any(text.startswith(term) for text in texts) or row_key.startswith(key):
+            match = "prefix"
+        elif any(term in text for text in texts) or key in row_key:
+            match = "substring"
+        else:
+            match = "fuzzy"
+        matches.append((word, correct_count, wrong_count, match))
+    order = {"prefix": 0, "substring": 1, "fuzzy": 2}
+    matches.sort(key=lambda row: order[row[3]])
+    
+    return {
+        "items": [
+            {
+                "id": word.id,
+                "japanese": word.japanese,
+                "romaji": word.romaji,
+                "english": word.english,
+                "correct_count": correct_count,
+                "wrong_count": wrong_count,
+                "match": match
+            }
+            for word, correct_count, wrong_count, match in matches[:limit]
+        ]
     }
 
 @router.get("/{word_id}")
 async def get_word(
     word_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: str = Depends(get_current_user)
 ):
     # Get word with its review stats and groups
@@ -66,8 +144,12 @@ async def get_word(
         Word,
         func.count(WordReviewItem.id).filter(WordReviewItem.correct == True).label("correct_count"),
         func.count(WordReviewItem.id).filter(WordReviewItem.correct == False).label("wrong_count")
-    ).outerjoin(WordReviewItem) \
+    ).outerjoin(WordReviewItem, and_(
+        WordReviewItem.word_id == Word.id,
+        WordReviewItem.user_id == current_user
+    )) \
      .where(Word.id == word_id) \
+     .where(Word.user_id == current_user) \
      .group_by(Word.id)
     
     result = await db.execute(query)
@@ -79,7 +161,10 @@ async def get_word(
     word, correct_count, wrong_count = word_data
     
     # Get groups for the word
-    groups_query = select(Group).join(Word.groups).where(Word.id == word_id)
+    groups_query = select(Group) \
+        .join(Word.groups) \
+        .where(Word.id == word_id) \
+        .where(Group.user_id == current_user)
     groups_result = await db.execute(groups_query)
     groups = groups_result.scalars().all()
     
@@ -1,13 +1,17 @@
+from db import engine, reader_engine
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from replicas import LAST_WRITE_HEADER
 
 # Add the project root to the Python path
 # sys.path.append(os.path.abspath(__file__))
 
 from handlers import (
     dashboard,
+    export,
     groups,
     health,
+    metrics,
     study_activities,
     study_sessions,
     system,
@@ -16,6 +20,12 @@ from handlers import (
 
 app = FastAPI(title="Language Learning Portal API")
 
+# Record SQL statements per request for Server-Timing and /metrics
+metrics.instrument_engine(engine)
+if reader_engine is not engine:
+    metrics.instrument_engine(reader_engine, "reader")
+app.add_middleware(metrics.QueryMetricsMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -23,12 +33,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Read by the frontend and sent back on its next requests
+    expose_headers=[LAST_WRITE_HEADER],
 )
 
 # Include routers
 app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
 app.include_router(groups.router, prefix="/api/groups", tags=["groups"])
 app.include_router(health.router, prefix="/api/health", tags=["health"])
+app.include_router(metrics.router, tags=["metrics"])
 app.include_router(study_activities.router, prefix="/api/study_activities", tags=["study_activities"])
 app.include_router(study_sessions.router, prefix="/api/study_sessions", tags=["study_sessions"])
 app.include_router(system.router, prefix="/api", tags=["system"])
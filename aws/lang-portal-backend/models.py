@@ -30,6 +30,8 @@ class Group(Base):
     id = Column(Integer, primary_key=True)
     user_id = Column(String)
     name = Column(String)
+    # Materialized number of words_groups rows of the group
+    word_count = Column(Integer, nullable=False, default=0)
     
     words = relationship("Word", secondary="words_groups", back_populates="groups")
     study_sessions = relationship("StudySession", back_populates="group")
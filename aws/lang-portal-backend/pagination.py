@@ -0,0 +1,57 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import DateTime, tuple_
+
+def encode_cursor(values) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor"""
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str, keys) -> list:
+    """Decode a cursor back into values comparable with the given key columns"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match the sort key")
+        return [
+            datetime.fromisoformat(value) if isinstance(key.type, DateTime) else value
+            for key, value in zip(keys, values)
+        ]
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {str(e)}")
+
+def paginate_query(query, keys, page: int, per_page: int, cursor: str = None, descending: bool = False):
+    """
+    Order the query by the key columns and fetch one page plus one extra row.
+    With a cursor the page starts right after the cursor position (keyset),
+    otherwise it falls back to OFFSET based on the page number.
+    """
+    query = query.order_by(*[key.desc() if descending else key for key in keys]).limit(per_page + 1)
+
+    if not cursor:
+        return query.offset((page - 1) * per_page)
+
+    values = decode_cursor(cursor, keys)
+    if len(keys) == 1:
+        position, after = keys[0], values[0]
+    else:
+        position, after = tuple_(*keys), tuple(values)
+    return query.where(position < after if descending else position > after)
+
+def split_page(rows, per_page: int, key_of):
+    """Trim the extra row fetched by paginate_query and build the next cursor"""
+    if len(rows) <= per_page:
+        return rows, None
+    rows = rows[:per_page]
+    return rows, encode_cursor(key_of(rows[-1]))
+
+def build_pagination(page: int, per_page: int, total_count, cursor: str = None, next_cursor: str = None) -> dict:
+    return {
+        "current_page": None if cursor else page,
+        "total_pages": None if total_count is None else (total_count + per_page - 1) // per_page,
+        "total_items": total_count,
+        "items_per_page": per_page,
+        "next_cursor": next_cursor
+    }
@@ -0,0 +1,42 @@
+import time
+from db import AsyncSessionLocal, ReaderSessionLocal, DB_READ_YOUR_WRITES_SECONDS
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Unix time of the client's last write. Write responses set it and the client sends
+# it back, so every server process can route the client's reads, not only the one
+# that served the write.
+LAST_WRITE_HEADER = "X-Last-Write"
+
+def wrote_recently(last_write: str | None) -> bool:
+    """Whether replicas may still lag behind a write made at the time of the marker"""
+    try:
+        written_at = float(last_write)
+    except (TypeError, ValueError):
+        return False
+    # Both ways, the servers' clocks are only roughly in sync
+    return abs(time.time() - written_at) < DB_READ_YOUR_WRITES_SECONDS
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session):
+    # Only sessions of get_write_db carry a response
+    response = session.info.get("response")
+    if response is not None:
+        response.headers[LAST_WRITE_HEADER] = f"{time.time():.3f}"
+
+def read_sessionmaker(last_write: str | None):
+    """Reader sessions, or writer sessions while the client's last write may still be replicating"""
+    if wrote_recently(last_write):
+        return AsyncSessionLocal
+    return ReaderSessionLocal
+
+async def get_read_db(request: Request):
+    """Session for the read-only requests of a user"""
+    async with read_sessionmaker(request.headers.get(LAST_WRITE_HEADER))() as session:
+        yield session
+
+async def get_write_db(response: Response):
+    """Session on the writer, its commits mark the response with the time of the write"""
+    async with AsyncSessionLocal(info={"response": response}) as session:
+        yield session
@@ -0,0 +1,30 @@
+import re
+from sqlalchemy import func, literal_column
+
+# Spelling variants folded together so that e.g. "sayounara", "sayōnara" and
+# "sayonara" or "shashin" and "syasin" share one search key. Applied in order
+# with plain substring replacement, here and in the romaji_key() SQL function.
+ROMAJI_SPELLINGS = [
+    (" ", ""), ("-", ""), ("'", ""), (".", ""),
+    ("ā", "a"), ("ī", "i"), ("ū", "u"), ("ē", "e"), ("ō", "o"), ("ô", "o"),
+    ("aa", "a"), ("ii", "i"), ("uu", "u"), ("ou", "o"), ("oo", "o"),
+    ("shi", "si"), ("sh", "sy"), ("chi", "ti"), ("ch", "ty"), ("tsu", "tu"),
+    ("fu", "hu"), ("ji", "zi"), ("j", "zy"), ("mb", "nb"), ("mp", "np")
+]
+
+# Has to match the expression of idx_words_search_vector literally to use the index
+SEARCH_VECTOR = literal_column("to_tsvector('simple', coalesce(words.romaji, '') || ' ' || coalesce(words.english, ''))")
+
+def romaji_key(text: str) -> str:
+    """Fold a romaji spelling into its search key"""
+    key = text.lower()
+    for variant, canonical in ROMAJI_SPELLINGS:
+        key = key.replace(variant, canonical)
+    return key
+
+def prefix_tsquery(text: str):
+    """tsquery matching words starting with every token of the text, or None without tokens"""
+    tokens = re.findall(r"\w+", text)
+    if not tokens:
+        return None
+    return func.to_tsquery(literal_column("'simple'"), " & ".join(f"{token}:*" for token in tokens))
@@ -1,9 +1,12 @@
 import asyncio
+import hashlib
+from cache import response_cache
 from contextlib import asynccontextmanager
 from db import get_db, engine, Base
 from invoke import task
 from pathlib import Path
 from sqlalchemy.sql import text
+from vocabulary import import_vocabulary, read_vocabulary
 import psycopg
 import os
 import dotenv
@@ -18,10 +21,67 @@ async def get_db_context():
         finally:
             break
 
+# Last migration of the databases set up before migrations were recorded
+# in schema_migrations, they already have every migration up to this one
+UNRECORDED_MIGRATIONS_VERSION = '0016'
+
+def _checksum(sql):
+    return hashlib.sha256(sql.encode()).hexdigest()
+
+async def _migrate(db):
+    """Apply the migrations that are not recorded in schema_migrations yet"""
+    migrations_dir = Path('db/migrations')
+    migration_files = sorted(migrations_dir.glob('*.sql'))
+
+    result = await db.execute(text(
+        "SELECT to_regclass('schema_migrations') IS NULL AND to_regclass('words') IS NOT NULL"
+    ))
+    unrecorded = result.scalar()
+    await db.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            checksum TEXT NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    if unrecorded:
+        # Rerunning them would seed the study activities a second time
+        print(f"Recording the migrations up to {UNRECORDED_MIGRATIONS_VERSION} as applied")
+        for migration_file in migration_files:
+            version = migration_file.name.split('_', 1)[0]
+            if version > UNRECORDED_MIGRATIONS_VERSION:
+                break
+            await db.execute(
+                text("INSERT INTO schema_migrations (version, name, checksum) VALUES (:version, :name, :checksum)"),
+                {"version": version, "name": migration_file.name, "checksum": _checksum(migration_file.read_text())}
+            )
+    await db.commit()
+    result = await db.execute(text("SELECT version, checksum FROM schema_migrations"))
+    applied = dict(result.all())
+
+    for migration_file in migration_files:
+        version = migration_file.name.split('_', 1)[0]
+        with open(migration_file) as f:
+            sql = f.read()
+        checksum = _checksum(sql)
+        if version in applied:
+            if applied[version] != checksum:
+                print(f"Warning: {migration_file.name} changed after it was applied, add a new migration instead")
+            continue
+
+        # Each migration commits together with its bookkeeping row
+        print(f"Running migration: {migration_file}")
+        await db.execute(text(sql))
+        await db.execute(
+            text("INSERT INTO schema_migrations (version, name, checksum) VALUES (:version, :name, :checksum)"),
+            {"version": version, "name": migration_file.name, "checksum": checksum}
+        )
+        await db.commit()
+
 async def _setup():
-    """Run database migrations"""
+    """Recreate the database schema from scratch"""
     print("Running migrations...")
-    migrations_dir = Path('db/migrations')
 
     async with get_db_context() as db:
         try:
@@ -31,14 +91,18 @@ async def _setup():
             await db.commit()
 
             # Run migrations
-            for migration_file in sorted(migrations_dir.glob('*.sql')):
-                print(f"Running migration: {migration_file}")
-                with open(migration_file) as f:
-                    sql = f.read()
-                await db.execute(text(sql))
+            await _migrate(db)
+        except Exception as e:
+            print(f"Failed to run migrations: {e}")
+            raise
 
-            await db.commit()
+async def _run_migrations():
+    """Apply pending migrations, keeping the existing data"""
+    async with get_db_context() as db:
+        try:
+            await _migrate(db)
         except Exception as e:
+            await db.rollback()
             print(f"Failed to run migrations: {e}")
             raise
 
@@ -47,6 +111,35 @@ def setup(ctx):
     """Run all setup tasks in sequence"""
     asyncio.run(_setup())
 
+@task
+def migrate(ctx):
+    """Apply the database migrations that have not been applied yet"""
+    asyncio.run(_run_migrations())
+
+async def _import_vocab(path, user_id):
+    """Import a vocabulary file for a user in a single transaction"""
+    async with get_db_context() as db:
+        counts = await import_vocabulary(db, user_id, read_vocabulary(path))
+        await db.commit()
+    # Only reaches running servers when the cache is shared through CACHE_URL,
+    # the in-process cache is off by default for that reason
+    await response_cache.invalidate(user_id)
+    print(f"Imported {counts['words_created']} words, created {counts['groups_created']} groups")
+
+@task
+def import_vocab(ctx, path, user_id):
+    """Import a JSON or JSONL vocabulary file for a user"""
+    print(f"Importing vocabulary: {path}")
+    asyncio.run(_import_vocab(path, user_id))
+
+@task
+def bench_pool(ctx, pool_sizes="2,5,10,20,40", clients=50, duration=10, pgbouncer=False):
+    """Compare request throughput of connection pool sizes against the configured database"""
+    ctx.run(
+        f"python -m benchmarks.pool_size --pool-sizes {pool_sizes.replace(',', ' ')} "
+        f"--clients {clients} --duration {duration}" + (" --pgbouncer" if pgbouncer else "")
+    )
+
 @task
 def dev(ctx):
     """Run the development server with auto-reload"""
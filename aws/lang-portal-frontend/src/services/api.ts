@@ -1,5 +1,8 @@
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api'
 
+// Time of the last write, sent back so the API reads from the writer until the replicas caught up
+const LAST_WRITE_HEADER = 'X-Last-Write'
+
 interface ApiResponse<T> {
   data?: T;
   error?: string
@@ -9,15 +12,22 @@ async function fetchApi<T>(
   endpoint: string,
   options: RequestInit = {}
 ): Promise<ApiResponse<T>> {
+  const lastWrite = sessionStorage.getItem(LAST_WRITE_HEADER)
   try {
     const response = await fetch(`${API_BASE_URL}${endpoint}`, {
       ...options,
       headers: {
         'Content-Type': 'application/json',
+        ...(lastWrite ? { [LAST_WRITE_HEADER]: lastWrite } : {}),
         ...options.headers,
       },
     })
 
+    const written = response.headers.get(LAST_WRITE_HEADER)
+    if (written) {
+      sessionStorage.setItem(LAST_WRITE_HEADER, written)
+    }
+
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`)
     }
@@ -2,6 +2,7 @@ import langchain
 import os
 from database import store_chat_interaction, retrieve_chats, update_haiku_lines, retrieve_haiku
 from dotenv import load_dotenv
+from jobs import enqueue_media_generation
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.tools import tool
 from langchain_ollama import ChatOllama
@@ -9,7 +10,6 @@ from langchain.agents import create_tool_calling_agent, AgentExecutor
 from model import UpdateHaiku
 from pydantic import BaseModel, Field
 from typing import List
-from workflow import start_workflow
 
 
 langchain.debug = True
@@ -50,8 +50,8 @@ def generate_media(haiku_id: str | int) -> str:
     haiku = retrieve_haiku(str(haiku_id))
     if not haiku.haiku_line_en_1 or not haiku.haiku_line_en_2 or not haiku.haiku_line_en_3:
         return f"Haiku not available for media generation. Please save a haiku first."    
-    start_workflow(str(haiku_id))
-    return f"Media generated"
+    enqueue_media_generation(str(haiku_id))
+    return f"Media generation started"
 
 @tool("update_haiku", args_schema=UpdateHaiku)
 def update_haiku(haiku: List[str], haiku_id: str | int, topic: str) -> str:
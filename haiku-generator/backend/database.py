@@ -3,7 +3,7 @@ import sqlite3
 import uuid
 from typing import List
 from dotenv import load_dotenv
-from model import Empty, Haiku, Chat
+from model import Empty, Haiku, Chat, MediaJob
 
 
 load_dotenv()
@@ -18,6 +18,8 @@ def get_db_connection():
 def create_tables():
     conn = get_db_connection()
     cursor = conn.cursor()
+    # Media workers write while the API reads, WAL keeps them from blocking each other
+    cursor.execute('PRAGMA journal_mode=WAL')
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS haiku (
         haiku_id TEXT PRIMARY KEY,
@@ -49,6 +51,25 @@ def create_tables():
         created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
         FOREIGN KEY (haiku_id) REFERENCES haiku (haiku_id)
     )''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS media_job (
+        job_id TEXT PRIMARY KEY,
+        haiku_id TEXT,
+        status TEXT DEFAULT "queued",
+        error_message TEXT,
+        attempts INTEGER DEFAULT 0,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        started_at DATETIME,
+        finished_at DATETIME,
+        locked_until DATETIME,
+        FOREIGN KEY (haiku_id) REFERENCES haiku (haiku_id)
+    )''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_media_job_status_created_at ON media_job (status, created_at)')
+    # At most one queued or running job per haiku
+    cursor.execute('''
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_media_job_active_haiku_id ON media_job (haiku_id)
+    WHERE status IN ('queued', 'running')
+    ''')
     conn.commit()
     conn.close()
 
@@ -151,10 +172,92 @@ def store_chat_interaction(haiku_id: str, message: str, role: str):
     conn.commit()
     conn.close()
 
+def enqueue_media_job(haiku_id: str) -> MediaJob:
+    """Queue media generation for a haiku, reusing the job already queued or running for it"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT OR IGNORE INTO media_job (job_id, haiku_id) VALUES (?, ?)
+    ''', (str(uuid.uuid4()), haiku_id))
+    if cursor.rowcount:
+        cursor.execute('UPDATE haiku SET status = ?, error_message = ? WHERE haiku_id = ?', ("queued", "", haiku_id))
+    cursor.execute('''
+        SELECT * FROM media_job WHERE haiku_id = ? AND status IN ('queued', 'running')
+    ''', (haiku_id,))
+    job = cursor.fetchone()
+    conn.commit()
+    conn.close()
+    return MediaJob(**dict(job))
+
+def claim_media_job(lease_seconds: int, max_attempts: int) -> MediaJob | None:
+    """
+    Take the oldest queued job, or a running job whose worker stopped renewing
+    its lease, in a single statement so that two workers never get the same job.
+    A job whose lease expired max_attempts times fails, with its haiku.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    error_message = f"Media generation stopped {max_attempts} times, giving up"
+    cursor.execute('''
+        UPDATE haiku SET status = 'failed', error_message = ?
+        WHERE haiku_id IN (
+            SELECT haiku_id FROM media_job
+            WHERE status = 'running' AND locked_until < CURRENT_TIMESTAMP AND attempts >= ?
+        )
+    ''', (error_message, max_attempts))
+    cursor.execute('''
+        UPDATE media_job SET status = 'failed', error_message = ?, finished_at = CURRENT_TIMESTAMP, locked_until = NULL
+        WHERE status = 'running' AND locked_until < CURRENT_TIMESTAMP AND attempts >= ?
+    ''', (error_message, max_attempts))
+    cursor.execute('''
+        UPDATE media_job
+        SET status = 'running', attempts = attempts + 1, started_at = CURRENT_TIMESTAMP, locked_until = datetime('now', ?)
+        WHERE job_id = (
+            SELECT job_id FROM media_job
+            WHERE status = 'queued' OR (status = 'running' AND locked_until < CURRENT_TIMESTAMP)
+            ORDER BY created_at
+            LIMIT 1
+        )
+        RETURNING *
+    ''', (f'{lease_seconds} seconds',))
+    job = cursor.fetchone()
+    conn.commit()
+    conn.close()
+    return MediaJob(**dict(job)) if job else None
+
+def renew_media_job(job_id: str, lease_seconds: int):
+    """Extend the lease of a running job so that no other worker takes it"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        UPDATE media_job SET locked_until = datetime('now', ?) WHERE job_id = ? AND status = 'running'
+    ''', (f'{lease_seconds} seconds', job_id))
+    conn.commit()
+    conn.close()
+
+def finish_media_job(job_id: str, status: str, error_message: str):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('''
+        UPDATE media_job SET status = ?, error_message = ?, finished_at = CURRENT_TIMESTAMP, locked_until = NULL
+        WHERE job_id = ?
+    ''', (status, error_message, job_id))
+    conn.commit()
+    conn.close()
+
+def retrieve_last_media_job(haiku_id: str) -> MediaJob | None:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute('SELECT * FROM media_job WHERE haiku_id = ? ORDER BY created_at DESC LIMIT 1', (haiku_id,))
+    job = cursor.fetchone()
+    conn.close()
+    return MediaJob(**dict(job)) if job else None
+
 def delete_haiku_db(haiku_id: str):
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute('DELETE FROM haiku WHERE haiku_id = ?', (haiku_id,))
     cursor.execute('DELETE FROM chat WHERE haiku_id = ?', (haiku_id,))
+    cursor.execute('DELETE FROM media_job WHERE haiku_id = ?', (haiku_id,))
     conn.commit()
     conn.close()
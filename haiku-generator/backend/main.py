@@ -1,12 +1,20 @@
 from agent import process_message
-from database import retrieve_chats, retrieve_haikus, retrieve_haiku, delete_haiku_db, retrieve_last_chat, insert_haiku
+from contextlib import asynccontextmanager
+from database import retrieve_chats, retrieve_haikus, retrieve_haiku, delete_haiku_db, retrieve_last_chat, insert_haiku, retrieve_last_media_job
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from model import SendChatRequest, SendChatResponse, ListHaikusResponse, GetHaikuResponse, DeleteHaikuResponse, GenerateMediaResponse
-from workflow import start_workflow
+from jobs import enqueue_media_generation, media_workers
+from media import models
+from model import SendChatRequest, SendChatResponse, ListHaikusResponse, GetHaikuResponse, DeleteHaikuResponse, GenerateMediaResponse, GetMediaJobResponse, ListModelsResponse
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    media_workers.start()
+    yield
+    media_workers.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -17,8 +25,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# The handlers call the blocking database and model code, FastAPI runs plain
+# functions in its threadpool so that they do not block the event loop
 @app.post('/chat/{haiku_id}')
-async def send_chat(haiku_id: str, chat_message: SendChatRequest) -> SendChatResponse:
+def send_chat(haiku_id: str, chat_message: SendChatRequest) -> SendChatResponse:
     if retrieve_haiku(haiku_id).error_message == "Haiku not found":
         insert_haiku(haiku_id)
     process_message(haiku_id, chat_message.message)
@@ -27,12 +37,12 @@ async def send_chat(haiku_id: str, chat_message: SendChatRequest) -> SendChatRes
     return SendChatResponse(chat=chat, haiku=haiku)
 
 @app.get('/haiku')
-async def list_haikus() -> ListHaikusResponse:
+def list_haikus() -> ListHaikusResponse:
     haikus = retrieve_haikus()
     return ListHaikusResponse(haikus=haikus)
 
 @app.get('/haiku/{haiku_id}')
-async def get_haiku(haiku_id: str) -> GetHaikuResponse:
+def get_haiku(haiku_id: str) -> GetHaikuResponse:
     haiku = retrieve_haiku(haiku_id)
     if haiku.error_message == "Haiku not found":
         haiku.error_message = ""
@@ -40,20 +50,31 @@ async def get_haiku(haiku_id: str) -> GetHaikuResponse:
     return GetHaikuResponse(haiku=haiku, chats=chats)
 
 @app.post('/haiku/{haiku_id}')
-async def generate_media(haiku_id: str) -> GenerateMediaResponse:
+def generate_media(haiku_id: str) -> GenerateMediaResponse:
     haiku = retrieve_haiku(haiku_id)
+    job = None
     if haiku.error_message == "Haiku not found" or haiku.status != "failed":
         haiku.error_message = ""
     else:
-        start_workflow(haiku_id)
+        # Return right away, GET /haiku/{haiku_id}/job reports the progress
+        job = enqueue_media_generation(haiku_id)
         haiku = retrieve_haiku(haiku_id)
-    return GenerateMediaResponse(haiku=haiku)
+    return GenerateMediaResponse(haiku=haiku, job=job)
+
+@app.get('/haiku/{haiku_id}/job')
+def get_media_job(haiku_id: str) -> GetMediaJobResponse:
+    job = retrieve_last_media_job(haiku_id)
+    return GetMediaJobResponse(job=job)
 
 @app.delete('/haiku/{haiku_id}')
-async def delete_haiku(haiku_id: str) -> DeleteHaikuResponse:
+def delete_haiku(haiku_id: str) -> DeleteHaikuResponse:
     delete_haiku_db(haiku_id)
     return DeleteHaikuResponse(message='Haiku and associated data deleted successfully')
 
+@app.get('/models')
+def list_models() -> ListModelsResponse:
+    return ListModelsResponse(models=models.stats())
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,38 +1,134 @@
 import io
+import json
 import os
-import torch
+import queue
+import threading
+import time
+from concurrent.futures import Future
 from database import update_translation, update_image_description, update_haiku_link
-from diffusers import AmusedPipeline
-# from diffusers import StableDiffusion3Pipeline
 from dotenv import load_dotenv
 from langchain_ollama import OllamaLLM
+from model import ImageDescriptions, Translations
+from pydantic import BaseModel, ValidationError
+from registry import ModelRegistry
 from storage import upload_file
-from TTS.api import TTS
 
 
 load_dotenv()
 MODEL_BASE_URL = os.getenv("MODEL_BASE_URL", "http://localhost:11434")
 MODEL_NAME = os.getenv("MODEL_NAME", "qwen2.5:7b")
 HUGGINGFACEHUB_API_TOKEN = os.getenv("HUGGINGFACEHUB_API_TOKEN", None)
+# Prompts sent to Ollama at the same time by the process, match OLLAMA_NUM_PARALLEL
+MEDIA_LLM_CONCURRENCY = int(os.getenv("MEDIA_LLM_CONCURRENCY", "4"))
+# Prompt for the three lines of a haiku at once, with one prompt per line as the fallback
+MEDIA_LLM_BATCH = os.getenv("MEDIA_LLM_BATCH", "true").lower() in ("1", "true", "yes")
+# Images rendered by one pipeline call, pending descriptions of all the haikus share a batch
+MEDIA_IMAGE_BATCH_SIZE = int(os.getenv("MEDIA_IMAGE_BATCH_SIZE", "6"))
+# Seconds a description waits for others to join its batch when the pipeline is idle
+MEDIA_IMAGE_BATCH_WAIT = float(os.getenv("MEDIA_IMAGE_BATCH_WAIT", "0.1"))
+# CPU threads used by torch, unset keeps the torch default of one per core
+MEDIA_TORCH_THREADS = os.getenv("MEDIA_TORCH_THREADS")
+# Seconds a model stays loaded after its last use, 0 keeps the models loaded once used
+MEDIA_MODEL_IDLE_SECONDS = float(os.getenv("MEDIA_MODEL_IDLE_SECONDS", "900"))
+# Models loaded in the background at startup instead of on first use, e.g. "image,tts"
+MEDIA_PRELOAD_MODELS = [name for name in os.getenv("MEDIA_PRELOAD_MODELS", "").split(",") if name]
 
 
-model = OllamaLLM(
-    base_url=MODEL_BASE_URL,
-    model=MODEL_NAME
-)
-# pipe = StableDiffusion3Pipeline.from_pretrained("stabilityai/stable-diffusion-3.5-medium", token=HUGGINGFACEHUB_API_TOKEN)
-pipe = AmusedPipeline.from_pretrained("amused/amused-256", token=HUGGINGFACEHUB_API_TOKEN)
-device = "cuda" if torch.cuda.is_available() else "cpu"
-pipe = pipe.to(device)
-tts = TTS("tts_models/multilingual/multi-dataset/xtts_v2")
+def load_image_pipeline():
+    # torch and diffusers take seconds to import, processes that only chat never do
+    import torch
+    from diffusers import AmusedPipeline
+    # from diffusers import StableDiffusion3Pipeline
+    if MEDIA_TORCH_THREADS:
+        torch.set_num_threads(int(MEDIA_TORCH_THREADS))
+    # pipe = StableDiffusion3Pipeline.from_pretrained("stabilityai/stable-diffusion-3.5-medium", token=HUGGINGFACEHUB_API_TOKEN)
+    pipe = AmusedPipeline.from_pretrained("amused/amused-256", token=HUGGINGFACEHUB_API_TOKEN)
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    return pipe.to(device)
+
+def load_tts():
+    from TTS.api import TTS
+    return TTS("tts_models/multilingual/multi-dataset/xtts_v2")
+
+
+models = ModelRegistry(MEDIA_MODEL_IDLE_SECONDS)
+models.register("llm", lambda: OllamaLLM(base_url=MODEL_BASE_URL, model=MODEL_NAME))
+models.register("json_llm", lambda: OllamaLLM(base_url=MODEL_BASE_URL, model=MODEL_NAME, format="json"))
+models.register("image", load_image_pipeline)
+models.register("tts", load_tts)
+if MEDIA_PRELOAD_MODELS:
+    threading.Thread(target=models.preload, args=(MEDIA_PRELOAD_MODELS,), name="model-preload", daemon=True).start()
+# The speech pipeline keeps state between calls, media workers take turns on it
+tts_lock = threading.Lock()
+llm_slots = threading.BoundedSemaphore(MEDIA_LLM_CONCURRENCY)
+
+
+class ImageBatcher:
+    """
+    Single thread running the image pipeline. Descriptions submitted while a
+    batch renders are queued and rendered together in the next pipeline call.
+    """
+    def __init__(self, max_batch_size: int = MEDIA_IMAGE_BATCH_SIZE, wait: float = MEDIA_IMAGE_BATCH_WAIT):
+        self.max_batch_size = max_batch_size
+        self.wait = wait
+        self._requests = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def generate(self, description: str):
+        future = Future()
+        self._requests.put((description, future))
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="image-batcher", daemon=True)
+                self._thread.start()
+        return future.result()
+
+    def _next_batch(self) -> list:
+        batch = [self._requests.get()]
+        deadline = time.monotonic() + self.wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._requests.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+        return batch
+
+    def _render(self, batch: list):
+        with models.use("image") as pipe:
+            images = pipe(
+                [description for description, _ in batch],
+                num_inference_steps=5,
+                guidance_scale=5.0,
+            ).images
+        for (_, future), image in zip(batch, images):
+            future.set_result(image)
+        # A request the pipeline returned no image for would otherwise wait forever
+        for _, future in batch[len(images):]:
+            future.set_exception(RuntimeError(f"Image pipeline returned {len(images)} images for {len(batch)} descriptions"))
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._render(batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+                # Render one at a time so that a failing description only fails its own image
+                for request in batch:
+                    try:
+                        self._render([request])
+                    except Exception as e:
+                        request[1].set_exception(e)
+
+
+image_batcher = ImageBatcher()
 
 
 def generate_image(haiku_id: str, description: str, image_number: int):
-    image = pipe(
-        description,
-        num_inference_steps=5,
-        guidance_scale=5.0,
-    ).images[0]
+    image = image_batcher.generate(description)
     file_path = f"{haiku_id}/image-{image_number}.png"
     image_bytes = io.BytesIO()
     image.save(image_bytes, format="PNG")
@@ -46,12 +142,13 @@ def generate_audio(haiku_id: str, text: str, audio_number: int):
     tmp_file_path = f"/tmp/haiku-{haiku_id}-audio-{audio_number}.wav"
     storage_file_path = f"{haiku_id}/audio-{audio_number}.wav"
     try:
-        tts.tts_to_file(
-            text=text,
-            speaker="Chandra MacFarland",
-            language="ja",
-            file_path=tmp_file_path
-        )
+        with tts_lock, models.use("tts") as tts:
+            tts.tts_to_file(
+                text=text,
+                speaker="Chandra MacFarland",
+                language="ja",
+                file_path=tmp_file_path
+            )
         with open(tmp_file_path, 'rb') as f:
             audio_content = io.BytesIO(f.read())
             audio_content_length = len(audio_content.getvalue())
@@ -71,7 +168,8 @@ def generate_image_description(haiku_id: str, topic: str, haiku_line: str, line_
     Only provide the description needed to generate the image. No additional text.
     Topic: {topic}
     Sentence: {haiku_line}"""
-    description = model.invoke(prompt)
+    with llm_slots, models.use("llm") as model:
+        description = model.invoke(prompt)
     update_image_description(haiku_id, description, line_number)
     return description
 
@@ -81,6 +179,59 @@ def generate_translation(haiku_id: str, topic: str, haiku_line: str, line_number
     Only return the Japanese translation. Do not add any additional text.
     Topic: {topic}
     Sentence: {haiku_line}"""
-    translation = model.invoke(prompt)
+    with llm_slots, models.use("llm") as model:
+        translation = model.invoke(prompt)
     update_translation(haiku_id, translation, line_number)
     return translation
+
+def invoke_json(prompt: str, schema: type[BaseModel]) -> BaseModel | None:
+    """Prompt for a JSON answer following the schema, None when the answer does not"""
+    prompt = f"""{prompt}
+    Respond with a JSON object following this JSON schema: {json.dumps(schema.model_json_schema())}"""
+    with llm_slots, models.use("json_llm") as json_model:
+        response = json_model.invoke(prompt)
+    try:
+        return schema.model_validate_json(response)
+    except ValidationError as e:
+        print(f"Error parsing {schema.__name__}: {e}")
+        return None
+
+def generate_image_descriptions(haiku_id: str, topic: str, haiku_lines: dict[int, str]):
+    """Descriptions of the given lines by line number, in one prompt"""
+    sentences = "\n    ".join(f"Sentence {line_number}: {haiku_line}" for line_number, haiku_line in haiku_lines.items())
+    prompt = f"""Generate a high-contrast image for each sentence, each with a plain background.
+    The subject should be clear and well-defined, avoiding visual noise or excessive details.
+    Colors should be bold and distinct to ensure strong visibility.
+    Do not include any text in the images.
+    Only provide the descriptions needed to generate the images, one per sentence and in the same order. No additional text.
+    Topic: {topic}
+    {sentences}"""
+    result = invoke_json(prompt, ImageDescriptions)
+    if result is None or len(result.descriptions) != len(haiku_lines):
+        return {
+            line_number: generate_image_description(haiku_id, topic, haiku_line, line_number)
+            for line_number, haiku_line in haiku_lines.items()
+        }
+    descriptions = dict(zip(haiku_lines, result.descriptions))
+    for line_number, description in descriptions.items():
+        update_image_description(haiku_id, description, line_number)
+    return descriptions
+
+def generate_translations(haiku_id: str, topic: str, haiku_lines: dict[int, str]):
+    """Japanese translations of the given lines by line number, in one prompt"""
+    sentences = "\n    ".join(f"Sentence {line_number}: {haiku_line}" for line_number, haiku_line in haiku_lines.items())
+    prompt = f"""Translate each sentence into Japanese
+    If a sentence cannot be translated directly, provide the closest equivalent translation.
+    Only return the Japanese translations, one per sentence and in the same order. Do not add any additional text.
+    Topic: {topic}
+    {sentences}"""
+    result = invoke_json(prompt, Translations)
+    if result is None or len(result.translations) != len(haiku_lines):
+        return {
+            line_number: generate_translation(haiku_id, topic, haiku_line, line_number)
+            for line_number, haiku_line in haiku_lines.items()
+        }
+    translations = dict(zip(haiku_lines, result.translations))
+    for line_number, translation in translations.items():
+        update_translation(haiku_id, translation, line_number)
+    return translations
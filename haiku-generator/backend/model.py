@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel
 from typing import Optional, List
 from pydantic import Field, ConfigDict
@@ -32,6 +33,16 @@ class Chat(BaseModel):
     role: str
     message: str
 
+class MediaJob(BaseModel):
+    job_id: str
+    haiku_id: str
+    status: str
+    error_message: Optional[str] = None
+    attempts: int = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
 class SendChatRequest(BaseModel):
     message: str
 
@@ -48,10 +59,32 @@ class GetHaikuResponse(BaseModel):
 
 class GenerateMediaResponse(BaseModel):
     haiku: Haiku
+    job: Optional[MediaJob] = None
+
+class GetMediaJobResponse(BaseModel):
+    job: Optional[MediaJob] = None
+
+class ModelStatus(BaseModel):
+    name: str
+    loaded: bool
+    in_use: int
+    loads: int
+    load_seconds: Optional[float] = None
+    memory_bytes: Optional[int] = Field(default=None, description="Growth of the resident memory of the process while the model loaded")
+    idle_seconds: Optional[float] = None
+
+class ListModelsResponse(BaseModel):
+    models: List[ModelStatus]
 
 class DeleteHaikuResponse(BaseModel):
     message: str
 
+class ImageDescriptions(BaseModel):
+    descriptions: List[str] = Field(description="One image description per haiku line, in order", min_length=1, max_length=3)
+
+class Translations(BaseModel):
+    translations: List[str] = Field(description="One Japanese translation per haiku line, in order", min_length=1, max_length=3)
+
 class UpdateHaiku(BaseModel):
     haiku: List[str] = Field(description="Haiku lines as list of strings")
     haiku_id: str | int = Field(description="Haiku ID as string")
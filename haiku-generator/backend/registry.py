@@ -0,0 +1,116 @@
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def resident_memory() -> int | None:
+    """Resident memory of the process in bytes, None where /proc is not available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class RegisteredModel:
+    def __init__(self, name: str, loader):
+        self.name = name
+        self.loader = loader
+        self.model = None
+        self.users = 0
+        self.loads = 0
+        self.load_seconds = None
+        self.memory_bytes = None
+        self.last_used = None
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Models loaded on first use and shared by every thread of the process.
+    A model nobody used for idle_seconds is unloaded, 0 keeps them loaded.
+    """
+    def __init__(self, idle_seconds: float):
+        self.idle_seconds = idle_seconds
+        self._models = {}
+        self._evictor = None
+        self._evictor_lock = threading.Lock()
+
+    def register(self, name: str, loader):
+        self._models[name] = RegisteredModel(name, loader)
+
+    @contextmanager
+    def use(self, name: str):
+        """Load the model if needed, it is not unloaded until the block exits"""
+        registered = self._models[name]
+        with registered.lock:
+            if registered.model is None:
+                self._load(registered)
+            registered.users += 1
+        try:
+            yield registered.model
+        finally:
+            with registered.lock:
+                registered.users -= 1
+                registered.last_used = time.monotonic()
+
+    def preload(self, names: list[str]):
+        for name in names:
+            with self.use(name):
+                pass
+
+    def _load(self, registered: RegisteredModel):
+        memory_before = resident_memory()
+        start = time.perf_counter()
+        registered.model = registered.loader()
+        registered.load_seconds = time.perf_counter() - start
+        memory_after = resident_memory()
+        if memory_before is not None and memory_after is not None:
+            registered.memory_bytes = max(memory_after - memory_before, 0)
+        registered.loads += 1
+        print(f"Loaded {registered.name} in {registered.load_seconds:.1f}s")
+        self._start_evictor()
+
+    def _start_evictor(self):
+        if self.idle_seconds <= 0:
+            return
+        with self._evictor_lock:
+            if self._evictor is None:
+                self._evictor = threading.Thread(target=self._evict_forever, name="model-evictor", daemon=True)
+                self._evictor.start()
+
+    def _evict_forever(self):
+        while True:
+            time.sleep(min(self.idle_seconds, 60))
+            self.evict_idle()
+
+    def evict_idle(self):
+        evicted = False
+        for registered in self._models.values():
+            with registered.lock:
+                if registered.model is None or registered.users:
+                    continue
+                if time.monotonic() - registered.last_used < self.idle_seconds:
+                    continue
+                registered.model = None
+                evicted = True
+                print(f"Unloaded {registered.name} after {self.idle_seconds:.0f}s idle")
+        if evicted:
+            gc.collect()
+
+    def stats(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "name": registered.name,
+                "loaded": registered.model is not None,
+                "in_use": registered.users,
+                "loads": registered.loads,
+                "load_seconds": registered.load_seconds,
+                "memory_bytes": registered.memory_bytes,
+                "idle_seconds": now - registered.last_used if registered.last_used is not None else None
+            }
+            for registered in self._models.values()
+        ]
@@ -23,8 +23,24 @@ export interface Haiku {
   audio_link_3: string;
 }
 
+export interface MediaJob {
+  job_id: string;
+  haiku_id: string;
+  status: string;
+  error_message: string | null;
+  attempts: number;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 export interface GenerateMediaResponse {
   haiku: Haiku;
+  job: MediaJob | null;
+}
+
+export interface FetchMediaJobResponse {
+  job: MediaJob | null;
 }
 
 export interface FetchHaikusResponse {
@@ -69,6 +85,11 @@ export const generateMedia = async (haiku_id: string): Promise<GenerateMediaResp
   return response.data;
 };
 
+export const fetchMediaJob = async (haiku_id: string): Promise<FetchMediaJobResponse> => {
+  const response = await axios.get(`${API_URL}/haiku/${haiku_id}/job`);
+  return response.data;
+};
+
 export const deleteHaiku = async (haiku_id: string): Promise<DeleteHaikuResponse> => {
   const response = await axios.delete(`${API_URL}/haiku/${haiku_id}`);
   return response.data;
@@ -1,10 +1,11 @@
 import React, { useEffect, useState } from 'react';
 import { useParams } from 'react-router';
-import { fetchHaiku, sendMessage, generateMedia } from '../api/haikuApi';
+import { fetchHaiku, fetchMediaJob, sendMessage, generateMedia } from '../api/haikuApi';
 import SummaryDisplay from './SummaryDisplay';
 import LoadingIndicator from './LoadingIndicator';
 import ErrorMessage from './ErrorMessage';
 import { generateUUID } from '../utils/uuid';
+import { isMediaPending, MEDIA_POLL_INTERVAL } from '../utils/status';
 import { Container, Paper, Button, Box, Typography, Breadcrumbs, Link, TextField, List, ListItem, ListItemText, ListItemIcon, Divider } from '@mui/material';
 
 const HaikuGenerator = () => {
@@ -33,6 +34,27 @@ const HaikuGenerator = () => {
     getHaiku();
   }, [haiku_id]);
 
+  // Media is generated in the background, poll its job until it finishes
+  useEffect(() => {
+    if (!isMediaPending(haiku.status)) {
+      return;
+    }
+
+    const interval = setInterval(async () => {
+      try {
+        const fetchedJob = await fetchMediaJob(haiku_id);
+        if (!fetchedJob.job || fetchedJob.job.status === 'completed' || fetchedJob.job.status === 'failed') {
+          const fetchedHaiku = await fetchHaiku(haiku_id);
+          setHaiku(fetchedHaiku.haiku);
+        }
+      } catch (error) {
+        console.error('Error fetching media job:', error);
+      }
+    }, MEDIA_POLL_INTERVAL);
+
+    return () => clearInterval(interval);
+  }, [haiku_id, haiku.status]);
+
   const handleSendMessage = async () => {
     setLoading(true);
     setError(null);
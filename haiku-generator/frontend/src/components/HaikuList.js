@@ -3,6 +3,7 @@ import { fetchHaikus, deleteHaiku } from '../api/haikuApi';
 import LoadingIndicator from './LoadingIndicator';
 import ErrorMessage from './ErrorMessage';
 import { generateUUID } from '../utils/uuid';
+import { statusColor } from '../utils/status';
 import { Button, Typography, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, Paper, Link, Container, Chip } from '@mui/material';
 
 const HaikuList = () => {
@@ -81,7 +82,7 @@ const HaikuList = () => {
                   </Link>
                 </TableCell>
                 <TableCell align="center">
-                  <Chip label={haiku.status} variant="outlined" color={haiku.status === 'new' ? 'primary' : haiku.status === 'failed' ? 'error' : 'success'} />
+                  <Chip label={haiku.status} variant="outlined" color={statusColor(haiku.status)} />
                 </TableCell>
                 <TableCell align="center">
                   <Button onClick={() => handleDelete(haiku.haiku_id)}>🗑️</Button>
@@ -1,5 +1,6 @@
 import React from 'react';
 import AudioPlayer from './AudioPlayer';
+import { statusColor } from '../utils/status';
 import { Chip, Paper, Grid2, Box, Button } from '@mui/material';
 
 const STORAGE_URL = process.env.REACT_APP_STORAGE_URL || 'http://localhost:9000/haiku';
@@ -9,7 +10,7 @@ const SummaryDisplay = ({ haiku, loading, generateMedia }) => {
     <Paper>
       <Box sx={{ p: 2 }}>
         <div>
-          Status: <Chip label={haiku.status} variant="outlined" color={haiku.status === 'new' ? 'primary' : haiku.status === 'failed' ? 'error' : 'success'} />
+          Status: <Chip label={haiku.status} variant="outlined" color={statusColor(haiku.status)} />
           {haiku.status === 'failed' && (
             <Button variant="outlined" onClick={generateMedia} sx={{ ml: 1 }} disabled={loading}>Retry</Button>
           )}
@@ -0,0 +1,20 @@
+import statistics
+
+def summarize_latencies(latencies: list, duration: float, errors: int = 0) -> dict:
+    """Throughput and latency percentiles in milliseconds for a list of latencies in seconds"""
+    if len(latencies) < 2:
+        percentiles = [latencies[0] * 1000] * 99 if latencies else [None] * 99
+    else:
+        percentiles = [value * 1000 for value in statistics.quantiles(latencies, n=100)]
+    
+    def rounded(value):
+        return None if value is None else round(value, 2)
+    
+    return {
+        "count": len(latencies),
+        "errors": errors,
+        "throughput_per_sec": round(len(latencies) / duration, 1),
+        "p50_ms": rounded(percentiles[49]),
+        "p95_ms": rounded(percentiles[94]),
+        "p99_ms": rounded(percentiles[98])
+    }
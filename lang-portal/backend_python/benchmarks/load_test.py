@@ -0,0 +1,276 @@
+"""
+Load test for the lang-portal API.
+
+Seeds a synthetic database at the requested scale, then drives every router of
+cmd/server/main.py in-process through an async HTTP client and prints latency
+percentiles and throughput per endpoint as JSON. The reset endpoints are left
+out since they would wipe the seeded data.
+
+    python -m benchmarks.load_test --words 10000 --sessions 2000 --reviews 200000 --concurrency 16
+
+Each endpoint also reports how many SQL statements a single request runs, and
+--check-queries fails when one goes over its budget in QUERY_BUDGETS, which
+catches N+1 query regressions.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import summarize_latencies
+
+# Chunk size of the executemany inserts used for seeding
+SEED_BATCH_SIZE = 10000
+
+# SQL statements a single request of each endpoint may run, list endpoints take
+# one query for the page and one for the total whatever the page size
+QUERY_BUDGETS = {
+    "GET /api/dashboard/last_study_session": 1,
+    "GET /api/dashboard/study_progress": 2,
+    "GET /api/dashboard/quick-stats": 3,
+    "GET /api/dashboard/summary": 1,
+    "GET /api/words": 2,
+    "GET /api/words/search": 2,
+    "GET /api/words/{word_id}": 2,
+    "GET /api/groups": 3,
+    "GET /api/groups/{group_id}": 2,
+    "GET /api/groups/{group_id}/words": 2,
+    "GET /api/groups/{group_id}/study_sessions": 2,
+    "GET /api/study_sessions": 2,
+    "GET /api/study_sessions/{session_id}": 1,
+    "GET /api/study_sessions/{session_id}/words": 2,
+    "GET /api/study_sessions/{session_id}/next_words": 2,
+    "POST /api/study_sessions/{session_id}/words/{word_id}/review": 8,
+    "POST /api/study_sessions/{session_id}/reviews": 7,
+    "GET /api/study_activities": 2,
+    "GET /api/study_activities/{activity_id}": 1,
+    "GET /api/study_activities/{activity_id}/study_sessions": 2,
+    "POST /api/study_activities": 6,
+    "GET /api/export/{dataset}": 1,
+    "GET /metrics": 0
+}
+
+def _endpoints(scale: dict):
+    """(name, request factory) pairs, a factory returns (method, path, json body)"""
+    def word():
+        return random.randint(1, scale["words"])
+    def group():
+        return random.randint(1, scale["groups"])
+    def session():
+        return random.randint(1, scale["sessions"])
+    def activity():
+        return random.randint(1, 2)
+    def page(total: int, per_page: int = 100):
+        return random.randint(1, max((total + per_page - 1) // per_page, 1))
+    
+    return [
+        ("GET /api/dashboard/last_study_session", lambda: ("GET", "/api/dashboard/last_study_session", None)),
+        ("GET /api/dashboard/study_progress", lambda: ("GET", "/api/dashboard/study_progress", None)),
+        ("GET /api/dashboard/quick-stats", lambda: ("GET", "/api/dashboard/quick-stats", None)),
+        ("GET /api/dashboard/summary", lambda: ("GET", "/api/dashboard/summary", None)),
+        ("GET /api/words", lambda: ("GET", f"/api/words?page={page(scale['words'])}", None)),
+        ("GET /api/words/search", lambda: ("GET", f"/api/words/search?q=go{random.randint(0, scale['words'] - 1)}", None)),
+        ("GET /api/words/{word_id}", lambda: ("GET", f"/api/words/{word()}", None)),
+        ("GET /api/groups", lambda: ("GET", "/api/groups", None)),
+        ("GET /api/groups/{group_id}", lambda: ("GET", f"/api/groups/{group()}", None)),
+        ("GET /api/groups/{group_id}/words", lambda: ("GET", f"/api/groups/{group()}/words", None)),
+        ("GET /api/groups/{group_id}/study_sessions", lambda: ("GET", f"/api/groups/{group()}/study_sessions", None)),
+        ("GET /api/study_sessions", lambda: ("GET", f"/api/study_sessions?page={page(scale['sessions'])}", None)),
+        ("GET /api/study_sessions/{session_id}", lambda: ("GET", f"/api/study_sessions/{session()}", None)),
+        ("GET /api/study_sessions/{session_id}/words", lambda: ("GET", f"/api/study_sessions/{session()}/words", None)),
+        ("GET /api/study_sessions/{session_id}/next_words", lambda: ("GET", f"/api/study_sessions/{session()}/next_words", None)),
+        (
+            "POST /api/study_sessions/{session_id}/words/{word_id}/review",
+            lambda: ("POST", f"/api/study_sessions/{session()}/words/{word()}/review", {"correct": random.random() < 0.7})
+        ),
+        (
+            "POST /api/study_sessions/{session_id}/reviews",
+            lambda: ("POST", f"/api/study_sessions/{session()}/reviews", {
+                "items": [{"word_id": word(), "correct": random.random() < 0.7} for _ in range(20)]
+            })
+        ),
+        ("GET /api/study_activities", lambda: ("GET", "/api/study_activities", None)),
+        ("GET /api/study_activities/{activity_id}", lambda: ("GET", f"/api/study_activities/{activity()}", None)),
+        (
+            "GET /api/study_activities/{activity_id}/study_sessions",
+            lambda: ("GET", f"/api/study_activities/{activity()}/study_sessions", None)
+        ),
+        (
+            "POST /api/study_activities",
+            lambda: ("POST", "/api/study_activities", {"group_id": group(), "study_activity_id": activity()})
+        ),
+        ("GET /api/export/{dataset}", lambda: ("GET", "/api/export/groups", None)),
+        ("GET /metrics", lambda: ("GET", "/metrics", None))
+    ]
+
+async def seed(scale: dict):
+    """Fill an empty database with synthetic words, groups, sessions and reviews"""
+    from sqlalchemy import insert
+    from internal.models.base import AsyncSessionLocal, Base, engine
+    from internal.models.models import StudyActivity, StudySession, WordReviewItem
+    from internal.models.stats import rebuild_word_stats, record_study_session, add_daily_reviews
+    from internal.models.vocabulary import import_vocabulary
+    from internal.models.data_version import bump_data_version
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    now = datetime.now(UTC)
+    async with AsyncSessionLocal() as db:
+        await import_vocabulary(db, (
+            (f"Group {i % scale['groups'] + 1}", {"japanese": f"語{i}", "romaji": f"go{i}", "english": f"word {i}"})
+            for i in range(scale["words"])
+        ))
+        await db.execute(insert(StudyActivity), [
+            {"name": "Japanese to English", "type": "ja_to_en"},
+            {"name": "English to Japanese", "type": "en_to_ja"}
+        ])
+    
+        # Sessions spread over the last 90 days, oldest first so the streaks add up
+        session_times = sorted(now - timedelta(minutes=random.randint(0, 90 * 24 * 60)) for _ in range(scale["sessions"]))
+        await db.execute(insert(StudySession), [
+            {
+                "group_id": random.randint(1, scale["groups"]),
+                "study_activity_id": random.randint(1, 2),
+                "created_at": created_at
+            }
+            for created_at in session_times
+        ])
+        for created_at in session_times:
+            await record_study_session(db, created_at.date())
+    
+        day_counts = defaultdict(lambda: [0, 0])
+        for start in range(0, scale["reviews"], SEED_BATCH_SIZE):
+            review_items = []
+            for _ in range(min(SEED_BATCH_SIZE, scale["reviews"] - start)):
+                session_id = random.randint(1, scale["sessions"])
+                correct = random.random() < 0.7
+                created_at = session_times[session_id - 1] + timedelta(seconds=random.randint(0, 600))
+                review_items.append({
+                    "word_id": random.randint(1, scale["words"]),
+                    "study_session_id": session_id,
+                    "correct": correct,
+                    "created_at": created_at
+                })
+                day_counts[created_at.date()][0] += 1
+                day_counts[created_at.date()][1] += 1 if correct else 0
+            await db.execute(insert(WordReviewItem), review_items)
+    
+        await add_daily_reviews(db, day_counts)
+        await rebuild_word_stats(db)
+        await bump_data_version(db)
+        await db.commit()
+
+async def _drive(client, make_request, requests: int, concurrency: int) -> dict:
+    """Send requests from concurrent workers and summarize their latencies"""
+    latencies = []
+    errors = 0
+    remaining = requests
+    
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, path, body = make_request()
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latency = time.perf_counter() - start
+            if response.status_code >= 400:
+                errors += 1
+            else:
+                latencies.append(latency)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return summarize_latencies(latencies, time.perf_counter() - start, errors)
+
+async def _count_queries(client, make_request, statements: list) -> int:
+    """Number of SQL statements a single request runs, guards against N+1 regressions"""
+    method, path, body = make_request()
+    statements.clear()
+    await client.request(method, path, json=body)
+    return len(statements)
+
+async def run(scale: dict, requests: int, concurrency: int, only=None) -> dict:
+    import httpx
+    from sqlalchemy import event
+    from cmd.server.main import app
+    from internal.models.base import engine
+    
+    seed_start = time.perf_counter()
+    await seed(scale)
+    seed_seconds = time.perf_counter() - seed_start
+    
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(1))
+    
+    results = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, make_request in _endpoints(scale):
+            if only and not any(pattern in name for pattern in only):
+                continue
+            queries = await _count_queries(client, make_request, statements)
+            results[name] = await _drive(client, make_request, requests, concurrency)
+            results[name]["queries_per_request"] = queries
+    
+    return {
+        "scale": scale,
+        "seed_seconds": round(seed_seconds, 2),
+        "requests_per_endpoint": requests,
+        "concurrency": concurrency,
+        "db_profile": os.environ.get("DB_PROFILE", "production"),
+        "endpoints": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--reviews", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--profile", help="DB_PROFILE of the engine under test")
+    parser.add_argument("--only", nargs="+", help="only run endpoints whose name contains one of these")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--check-queries", action="store_true", help="fail if a request runs more SQL statements than its budget")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for reproducible data and requests")
+    args = parser.parse_args()
+    
+    random.seed(args.seed)
+    scale = {"words": args.words, "groups": args.groups, "sessions": args.sessions, "reviews": args.reviews}
+    
+    with tempfile.TemporaryDirectory() as directory:
+        # The engine is created on import, so point it at the scratch database first
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{directory}/benchmark.db"
+        os.environ.setdefault("DB_ECHO", "false")
+        if args.profile:
+            os.environ["DB_PROFILE"] = args.profile
+        report = asyncio.run(run(scale, args.requests, args.concurrency, args.only))
+    
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output)
+    
+    if args.check_queries:
+        offenders = {
+            name: {"queries": result["queries_per_request"], "budget": QUERY_BUDGETS[name]}
+            for name, result in report["endpoints"].items()
+            if result["queries_per_request"] > QUERY_BUDGETS[name]
+        }
+        if offenders:
+            sys.exit(f"Endpoints over their query budget: {json.dumps(offenders)}")
+
+if __name__ == "__main__":
+    main()
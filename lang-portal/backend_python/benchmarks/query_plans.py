@@ -0,0 +1,129 @@
+"""
+Query plan check for the lang-portal API.
+
+Seeds a synthetic database, sends one request to every endpoint of the load test
+and runs EXPLAIN QUERY PLAN on each SELECT the request issued. Fails when a plan
+reads a history table without an index, or when SQLite has to build an automatic
+index because a real one is missing.
+
+    python -m benchmarks.query_plans --migrations
+
+With --migrations the schema is built by the migration runner instead of the ORM
+metadata, which checks that db/migrations creates the indexes models.py declares.
+tests/test_query_plans.py runs the same check on the migrated schema.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.load_test import _endpoints, seed
+
+# Tables that grow with the study history, a full scan of them is a regression
+INDEXED_TABLES = {"words_groups", "study_sessions", "word_review_items", "word_schedule"}
+
+def plan_problems(plan: list) -> list:
+    """Plan steps that scan a history table without an index or add an automatic index"""
+    problems = []
+    for step in plan:
+        scan = re.match(r"SCAN (\w+)(?: AS \w+)?( USING)?", step)
+        if scan and scan.group(1) in INDEXED_TABLES and not scan.group(2):
+            problems.append(step)
+        elif "AUTOMATIC" in step:
+            problems.append(step)
+    return problems
+
+async def explain_endpoints(app, database: Path, scale: dict, only=None) -> dict:
+    """EXPLAIN QUERY PLAN of every SELECT one request of each load test endpoint runs, by endpoint"""
+    import httpx
+    from sqlalchemy import event
+    from internal.models.base import engine
+    
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    
+    explain = sqlite3.connect(database)
+    results = {}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://query-plans") as client:
+            for name, make_request in _endpoints(scale):
+                if only and not any(pattern in name for pattern in only):
+                    continue
+                method, path, body = make_request()
+                statements.clear()
+                await client.request(method, path, json=body)
+    
+                queries = []
+                for statement, parameters in statements:
+                    plan = [row[3] for row in explain.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                    queries.append({
+                        "sql": " ".join(statement.split()),
+                        "plan": plan,
+                        "problems": plan_problems(plan)
+                    })
+                results[name] = queries
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+        explain.close()
+    return results
+
+def find_offenders(results: dict) -> dict:
+    """The queries with plan problems, by endpoint"""
+    return {
+        name: [query for query in queries if query["problems"]]
+        for name, queries in results.items()
+        if any(query["problems"] for query in queries)
+    }
+
+async def run(database: Path, scale: dict, migrations: bool, only=None) -> dict:
+    from cmd.server.main import app
+    from internal.models.migrations import apply_migrations
+    
+    if migrations:
+        conn = sqlite3.connect(database)
+        apply_migrations(conn, Path(__file__).resolve().parent.parent / "db" / "migrations")
+        conn.close()
+    await seed(scale)
+    return await explain_endpoints(app, database, scale, only)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--reviews", type=int, default=20000)
+    parser.add_argument("--migrations", action="store_true", help="build the schema with db/migrations")
+    parser.add_argument("--only", nargs="+", help="only check endpoints whose name contains one of these")
+    parser.add_argument("--verbose", action="store_true", help="print the plan of every query")
+    args = parser.parse_args()
+    
+    random.seed(0)
+    scale = {"words": args.words, "groups": args.groups, "sessions": args.sessions, "reviews": args.reviews}
+    
+    with tempfile.TemporaryDirectory() as directory:
+        # The engine is created on import, so point it at the scratch database first
+        database = Path(directory) / "query_plans.db"
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database}"
+        os.environ.setdefault("DB_ECHO", "false")
+        results = asyncio.run(run(database, scale, args.migrations, args.only))
+    
+    offenders = find_offenders(results)
+    print(json.dumps(results if args.verbose else offenders, indent=2))
+    if offenders:
+        sys.exit(f"{len(offenders)} endpoints run queries without a usable index")
+    print(f"Checked {sum(len(queries) for queries in results.values())} queries of {len(results)} endpoints")
+
+if __name__ == "__main__":
+    main()
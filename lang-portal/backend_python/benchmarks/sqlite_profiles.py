@@ -0,0 +1,133 @@
+"""
+Concurrency benchmark for the SQLite engine profiles in internal/models/base.py.
+
+Every profile gets a fresh database file, seeded with the same words, and is then
+hit by concurrent readers (word list page with review counters) and writers
+(single word review, like POST /study_sessions/{id}/words/{word_id}/review).
+Throughput and latency per profile are printed as JSON.
+
+    python -m benchmarks.sqlite_profiles --readers 8 --writers 2 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import summarize_latencies
+from internal.models.base import Base, ENGINE_PROFILES, make_engine
+from internal.models.models import Word, WordStats, StudyActivity, StudySession, WordReviewItem
+from internal.models.stats import increment_word_stats
+from internal.models.vocabulary import import_vocabulary
+
+async def _seed(session_factory, words: int):
+    async with session_factory() as db:
+        await import_vocabulary(db, (
+            ("Benchmark", {"japanese": f"語{i}", "romaji": f"go{i}", "english": f"word {i}"})
+            for i in range(words)
+        ))
+        db.add(StudyActivity(name="Benchmark", type="ja_to_en"))
+        await db.flush()
+        db.add(StudySession(group_id=1, study_activity_id=1))
+        await db.commit()
+
+async def _reader(session_factory, words: int, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            async with session_factory() as db:
+                query = select(
+                    Word,
+                    func.coalesce(WordStats.correct_count, 0),
+                    func.coalesce(WordStats.wrong_count, 0)
+                ).outerjoin(WordStats) \
+                 .order_by(Word.id) \
+                 .offset(random.randrange(max(words - 100, 1))) \
+                 .limit(100)
+                (await db.execute(query)).all()
+        except OperationalError:
+            errors.append(1)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+async def _writer(session_factory, words: int, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        word_id = random.randint(1, words)
+        correct = random.random() < 0.7
+        try:
+            async with session_factory() as db:
+                db.add(WordReviewItem(
+                    word_id=word_id,
+                    study_session_id=1,
+                    correct=correct,
+                    created_at=datetime.now(UTC)
+                ))
+                await increment_word_stats(db, word_id, correct)
+                await db.commit()
+        except OperationalError:
+            # "database is locked" once a writer waited longer than the busy timeout
+            errors.append(1)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+async def run_profile(profile: str, directory: Path, readers: int, writers: int, duration: float, words: int) -> dict:
+    """Benchmark a single engine profile on a fresh database"""
+    engine = make_engine(
+        f"sqlite+aiosqlite:///{directory / profile}.db",
+        profile=profile,
+        echo=False,
+        pool_size=readers + writers,
+        max_overflow=0
+    )
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await _seed(session_factory, words)
+    
+    read_latencies, write_latencies, read_errors, write_errors = [], [], [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *[_reader(session_factory, words, deadline, read_latencies, read_errors) for _ in range(readers)],
+        *[_writer(session_factory, words, deadline, write_latencies, write_errors) for _ in range(writers)]
+    )
+    await engine.dispose()
+    
+    return {
+        "profile": profile,
+        "pragmas": ENGINE_PROFILES[profile],
+        "reads": summarize_latencies(read_latencies, duration, len(read_errors)),
+        "writes": summarize_latencies(write_latencies, duration, len(write_errors))
+    }
+
+async def run(profiles, readers: int, writers: int, duration: float, words: int) -> list:
+    with tempfile.TemporaryDirectory() as directory:
+        return [
+            await run_profile(profile, Path(directory), readers, writers, duration, words)
+            for profile in profiles
+        ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=list(ENGINE_PROFILES), choices=list(ENGINE_PROFILES))
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10, help="seconds per profile")
+    parser.add_argument("--words", type=int, default=5000)
+    args = parser.parse_args()
+    
+    results = asyncio.run(run(args.profiles, args.readers, args.writers, args.duration, args.words))
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
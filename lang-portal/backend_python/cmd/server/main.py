@@ -12,11 +12,19 @@ from internal.handlers import (
     groups,
     study_sessions,
     study_activities,
-    system
+    system,
+    export,
+    metrics
 )
 
+from internal.models.base import engine
+
 app = FastAPI(title="Language Learning Portal API")
 
+# Record SQL statements per request for Server-Timing and /metrics
+metrics.instrument_engine(engine)
+app.add_middleware(metrics.QueryMetricsMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -33,6 +41,8 @@ app.include_router(groups.router, prefix="/api/groups", tags=["groups"])
 app.include_router(study_sessions.router, prefix="/api/study_sessions", tags=["study_sessions"])
 app.include_router(study_activities.router, prefix="/api/study_activities", tags=["study_activities"])
 app.include_router(system.router, prefix="/api", tags=["system"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
+app.include_router(metrics.router, tags=["metrics"])
 
 if __name__ == "__main__":
     import uvicorn
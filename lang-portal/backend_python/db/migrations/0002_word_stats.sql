@@ -0,0 +1,16 @@
+-- Create word_stats table holding materialized review counters per word
+CREATE TABLE IF NOT EXISTS word_stats (
+    word_id INTEGER PRIMARY KEY,
+    correct_count INTEGER NOT NULL DEFAULT 0,
+    wrong_count INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (word_id) REFERENCES words (id)
+);
+
+-- Backfill the counters from the existing review history
+INSERT OR REPLACE INTO word_stats (word_id, correct_count, wrong_count)
+SELECT
+    word_id,
+    SUM(CASE WHEN correct THEN 1 ELSE 0 END),
+    SUM(CASE WHEN correct THEN 0 ELSE 1 END)
+FROM word_review_items
+GROUP BY word_id;
@@ -0,0 +1,38 @@
+-- Create daily_activity table holding a per-day rollup of the study history
+CREATE TABLE IF NOT EXISTS daily_activity (
+    date DATE PRIMARY KEY,
+    session_count INTEGER NOT NULL DEFAULT 0,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    correct_count INTEGER NOT NULL DEFAULT 0,
+    streak_days INTEGER NOT NULL DEFAULT 0
+);
+
+-- Backfill the rollup from the existing sessions and reviews
+INSERT OR REPLACE INTO daily_activity (date, session_count, review_count, correct_count, streak_days)
+WITH activity AS (
+    SELECT date(created_at) AS day, 1 AS sessions, 0 AS reviews, 0 AS correct
+    FROM study_sessions
+    UNION ALL
+    SELECT date(created_at), 0, 1, CASE WHEN correct THEN 1 ELSE 0 END
+    FROM word_review_items
+),
+days AS (
+    SELECT day, SUM(sessions) AS sessions, SUM(reviews) AS reviews, SUM(correct) AS correct
+    FROM activity
+    GROUP BY day
+),
+-- Consecutive session days share the same island
+islands AS (
+    SELECT day, julianday(day) - ROW_NUMBER() OVER (ORDER BY day) AS island
+    FROM days
+    WHERE sessions > 0
+)
+SELECT
+    days.day,
+    days.sessions,
+    days.reviews,
+    days.correct,
+    CASE WHEN islands.day IS NULL THEN 0
+         ELSE ROW_NUMBER() OVER (PARTITION BY islands.island ORDER BY islands.day) END
+FROM days
+LEFT JOIN islands ON islands.day = days.day;
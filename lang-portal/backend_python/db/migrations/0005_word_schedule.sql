@@ -0,0 +1,16 @@
+-- Create word_schedule table holding the spaced repetition state per word
+CREATE TABLE IF NOT EXISTS word_schedule (
+    word_id INTEGER PRIMARY KEY,
+    ease REAL NOT NULL DEFAULT 2.5,
+    interval_days REAL NOT NULL DEFAULT 0,
+    repetitions INTEGER NOT NULL DEFAULT 0,
+    due_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (word_id) REFERENCES words (id)
+);
+
+-- Next words are picked by scanning this index up to the current time
+CREATE INDEX IF NOT EXISTS idx_word_schedule_due_at ON word_schedule(due_at, word_id);
+
+-- Every existing word starts out due for review
+INSERT OR IGNORE INTO word_schedule (word_id)
+SELECT id FROM words;
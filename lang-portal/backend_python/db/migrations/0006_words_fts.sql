@@ -0,0 +1,25 @@
+-- Full-text search over words, kept in sync by triggers.
+-- Mirrors WORDS_FTS_DDL in internal/models/search.py, which also holds the romaji spelling rules.
+CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+    japanese, romaji, english, romaji_key, tokenize = 'trigram'
+);
+CREATE TRIGGER IF NOT EXISTS words_fts_insert AFTER INSERT ON words BEGIN
+    INSERT INTO words_fts (rowid, japanese, romaji, english, romaji_key)
+    VALUES (new.id, new.japanese, new.romaji, new.english, replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(lower(new.romaji), ' ', ''), '-', ''), '''', ''), '.', ''), 'ā', 'a'), 'ī', 'i'), 'ū', 'u'), 'ē', 'e'), 'ō', 'o'), 'ô', 'o'), 'aa', 'a'), 'ii', 'i'), 'uu', 'u'), 'ou', 'o'), 'oo', 'o'), 'shi', 'si'), 'sh', 'sy'), 'chi', 'ti'), 'ch', 'ty'), 'tsu', 'tu'), 'fu', 'hu'), 'ji', 'zi'), 'j', 'zy'), 'mb', 'nb'), 'mp', 'np'));
+END;
+CREATE TRIGGER IF NOT EXISTS words_fts_update AFTER UPDATE ON words BEGIN
+    UPDATE words_fts
+    SET rowid = new.id,
+        japanese = new.japanese,
+        romaji = new.romaji,
+        english = new.english,
+        romaji_key = replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(lower(new.romaji), ' ', ''), '-', ''), '''', ''), '.', ''), 'ā', 'a'), 'ī', 'i'), 'ū', 'u'), 'ē', 'e'), 'ō', 'o'), 'ô', 'o'), 'aa', 'a'), 'ii', 'i'), 'uu', 'u'), 'ou', 'o'), 'oo', 'o'), 'shi', 'si'), 'sh', 'sy'), 'chi', 'ti'), 'ch', 'ty'), 'tsu', 'tu'), 'fu', 'hu'), 'ji', 'zi'), 'j', 'zy'), 'mb', 'nb'), 'mp', 'np')
+    WHERE rowid = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS words_fts_delete AFTER DELETE ON words BEGIN
+    DELETE FROM words_fts WHERE rowid = old.id;
+END;
+INSERT INTO words_fts (rowid, japanese, romaji, english, romaji_key)
+SELECT id, japanese, romaji, english, replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(replace(lower(romaji), ' ', ''), '-', ''), '''', ''), '.', ''), 'ā', 'a'), 'ī', 'i'), 'ū', 'u'), 'ē', 'e'), 'ō', 'o'), 'ô', 'o'), 'aa', 'a'), 'ii', 'i'), 'uu', 'u'), 'ou', 'o'), 'oo', 'o'), 'shi', 'si'), 'sh', 'sy'), 'chi', 'ti'), 'ch', 'ty'), 'tsu', 'tu'), 'fu', 'hu'), 'ji', 'zi'), 'j', 'zy'), 'mb', 'nb'), 'mp', 'np')
+FROM words
+WHERE id NOT IN (SELECT rowid FROM words_fts);
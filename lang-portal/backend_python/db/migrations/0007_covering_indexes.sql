@@ -0,0 +1,20 @@
+-- Composite indexes matching the filters and sort keys of the handler queries.
+-- Mirrors the __table_args__ indexes in internal/models/models.py.
+
+-- Group and word lookups read both ids from the index alone
+DROP INDEX IF EXISTS idx_words_groups_word_id;
+DROP INDEX IF EXISTS idx_words_groups_group_id;
+CREATE INDEX IF NOT EXISTS idx_words_groups_group_id_word_id ON words_groups(group_id, word_id);
+CREATE INDEX IF NOT EXISTS idx_words_groups_word_id_group_id ON words_groups(word_id, group_id);
+
+-- Session listings are filtered by group or activity and paged by (created_at, id)
+DROP INDEX IF EXISTS idx_study_sessions_group_id;
+CREATE INDEX IF NOT EXISTS idx_study_sessions_created_at ON study_sessions(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_study_sessions_group_id_created_at ON study_sessions(group_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_study_sessions_activity_id_created_at ON study_sessions(study_activity_id, created_at, id);
+
+-- Review counts per session and per word never have to read the table rows
+DROP INDEX IF EXISTS idx_word_review_items_word_id;
+DROP INDEX IF EXISTS idx_word_review_items_session_id;
+CREATE INDEX IF NOT EXISTS idx_word_review_items_session_id_word_id ON word_review_items(study_session_id, word_id, correct);
+CREATE INDEX IF NOT EXISTS idx_word_review_items_word_id_correct ON word_review_items(word_id, correct);
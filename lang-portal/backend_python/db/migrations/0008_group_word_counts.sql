@@ -0,0 +1,20 @@
+-- Materialized word count per group, kept up to date by the vocabulary import
+ALTER TABLE groups ADD COLUMN word_count INTEGER NOT NULL DEFAULT 0;
+
+-- A word can be listed in a group only once
+DELETE FROM words_groups
+WHERE id NOT IN (
+    SELECT MIN(id)
+    FROM words_groups
+    GROUP BY group_id, word_id
+);
+DROP INDEX IF EXISTS idx_words_groups_group_id_word_id;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_words_groups_group_id_word_id ON words_groups(group_id, word_id);
+
+-- Backfill the counts from the existing memberships
+UPDATE groups
+SET word_count = (
+    SELECT COUNT(*)
+    FROM words_groups
+    WHERE words_groups.group_id = groups.id
+);
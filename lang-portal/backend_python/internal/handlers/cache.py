@@ -0,0 +1,99 @@
+import json
+import os
+import time
+from collections import OrderedDict
+
+# Seconds a cached response stays valid, 0 disables the cache
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+# Entries kept by the in-process cache before the least recently used is evicted
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+# redis:// URL to share the cache between server processes, in-process when unset
+CACHE_URL = os.getenv("CACHE_URL")
+
+class MemoryCacheBackend:
+    """TTL and LRU bounded cache living in the server process"""
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+    
+    async def get(self, key: str):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+    
+    async def set(self, key: str, value):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    async def delete_prefix(self, prefix: str):
+        for key in [key for key in self.entries if key.startswith(prefix)]:
+            del self.entries[key]
+
+class RedisCacheBackend:
+    """Cache shared through Redis, entries expire through the Redis TTL"""
+    def __init__(self, url: str, ttl: float):
+        # Only needed when CACHE_URL is set: pip install redis
+        import redis.asyncio
+        self.client = redis.asyncio.from_url(url)
+        self.ttl = ttl
+    
+    async def get(self, key: str):
+        value = await self.client.get(key)
+        return None if value is None else json.loads(value)
+    
+    async def set(self, key: str, value):
+        await self.client.set(key, json.dumps(value), px=int(self.ttl * 1000))
+    
+    async def delete_prefix(self, prefix: str):
+        keys = [key async for key in self.client.scan_iter(match=prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
+
+class ResponseCache:
+    """Responses of read endpoints whose data only changes through the write endpoints.
+    
+    Keys start with the user the response belongs to, so a write only has to
+    invalidate the entries of its own user. Handlers also put the data version in
+    the key, so a write made by another process, or committed while a read was
+    building its response, never serves a stale entry.
+    """
+    def __init__(self, backend, enabled: bool = True, namespace: str = "lang-portal"):
+        self.backend = backend
+        self.enabled = enabled
+        self.namespace = namespace
+    
+    def key(self, route: str, user_id: str = "", **params) -> str:
+        query = "&".join(f"{name}={params[name]}" for name in sorted(params))
+        return f"{self.namespace}:{user_id}:{route}?{query}"
+    
+    async def get(self, key: str):
+        if not self.enabled:
+            return None
+        return await self.backend.get(key)
+    
+    async def set(self, key: str, value):
+        if self.enabled and value is not None:
+            await self.backend.set(key, value)
+    
+    async def invalidate(self, user_id: str = ""):
+        """Drop the cached responses of a user, call after committing a write"""
+        if self.enabled:
+            await self.backend.delete_prefix(f"{self.namespace}:{user_id}:")
+
+def make_response_cache(url=CACHE_URL, ttl: float = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+    if url:
+        backend = RedisCacheBackend(url, ttl)
+    else:
+        backend = MemoryCacheBackend(ttl, max_entries)
+    return ResponseCache(backend, enabled=ttl > 0)
+
+response_cache = make_response_cache()
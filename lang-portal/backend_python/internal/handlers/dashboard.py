@@ -1,25 +1,28 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select, Integer
-from datetime import datetime
+from sqlalchemy import func, select, exists, true
+from datetime import datetime, UTC
 from ..models.base import get_db
-from ..models.models import StudySession, Group, WordReviewItem, Word, StudyActivity
+from ..models.models import StudySession, Group, WordReviewItem, Word, WordStats, StudyActivity, DailyActivity, DataVersion
+from ..models.data_version import get_data_version
 
 router = APIRouter()
 
 @router.get("/last_study_session")
 async def get_last_study_session(db: AsyncSession = Depends(get_db)):
+    # Count the reviews of the latest session only, instead of grouping all sessions first
+    review_items_count = select(func.count(WordReviewItem.id)) \
+        .where(WordReviewItem.study_session_id == StudySession.id) \
+        .scalar_subquery()
     query = (
         select(
             StudySession,
             Group.name.label("group_name"),
             StudyActivity.name.label("activity_name"),
-            func.count(WordReviewItem.id).label("review_items_count")
+            review_items_count.label("review_items_count")
         )
         .join(Group)
         .join(StudyActivity)
-        .outerjoin(WordReviewItem)
-        .group_by(StudySession.id, Group.name, StudyActivity.name)
         .order_by(StudySession.created_at.desc())
         .limit(1)
     )
@@ -46,9 +49,8 @@ async def get_study_progress(db: AsyncSession = Depends(get_db)):
     total_words_result = await db.execute(total_words_query)
     total_available_words = total_words_result.scalar()
     
-    # Get total unique words studied
-    studied_words_query = select(func.count(func.distinct(WordReviewItem.word_id))) \
-        .select_from(WordReviewItem)
+    # Get total unique words studied, which are the words with review counters
+    studied_words_query = select(func.count()).select_from(WordStats)
     studied_words_result = await db.execute(studied_words_query)
     total_words_studied = studied_words_result.scalar()
     
@@ -59,62 +61,139 @@ async def get_study_progress(db: AsyncSession = Depends(get_db)):
 
 @router.get("/quick-stats")
 async def get_quick_stats(db: AsyncSession = Depends(get_db)):
-    # Calculate success rate
-    review_stats_query = select(
-        func.count().label("total"),
-        func.sum(func.cast(WordReviewItem.correct, Integer)).label("correct")
-    ).select_from(WordReviewItem)
-    review_stats = await db.execute(review_stats_query)
-    review_stats = review_stats.first()
+    # Calculate success rate and total study sessions from the daily rollup
+    totals_query = select(
+        func.sum(DailyActivity.session_count).label("sessions"),
+        func.sum(DailyActivity.review_count).label("reviews"),
+        func.sum(DailyActivity.correct_count).label("correct")
+    )
+    totals = await db.execute(totals_query)
+    totals = totals.first()
     
     success_rate = 0
-    if review_stats.total:
-        success_rate = (review_stats.correct / review_stats.total) * 100
-    
-    # Get total study sessions
-    sessions_query = select(func.count()).select_from(StudySession)
-    total_sessions = await db.execute(sessions_query)
-    total_sessions = total_sessions.scalar()
+    if totals.reviews:
+        success_rate = (totals.correct / totals.reviews) * 100
     
     # Get total active groups (groups with at least one study session)
-    active_groups_query = select(func.count(func.distinct(StudySession.group_id))) \
-        .select_from(StudySession)
+    active_groups_query = select(func.count()).select_from(Group) \
+        .where(exists().where(StudySession.group_id == Group.id))
     active_groups = await db.execute(active_groups_query)
     active_groups = active_groups.scalar()
     
-    # Calculate study streak
-    streak_query = select(StudySession.created_at) \
-        .order_by(StudySession.created_at.desc())
-    sessions = await db.execute(streak_query)
-    sessions = sessions.scalars().all()
+    # The streak is maintained per day, so only the latest study day is needed
+    streak_query = select(DailyActivity.date, DailyActivity.streak_days) \
+        .where(DailyActivity.session_count > 0) \
+        .order_by(DailyActivity.date.desc()) \
+        .limit(1)
+    last_day = await db.execute(streak_query)
+    last_day = last_day.first()
     
     streak_days = 0
-    if sessions:
-        # Convert all session dates to date objects and get unique dates
-        session_dates = sorted(set(session.date() for session in sessions), reverse=True)
-        
-        current_date = datetime.now().date()
-        # Check if there's a session today or yesterday to start the streak
-        if (current_date - session_dates[0]).days <= 1:
-            streak_days = 1
-            prev_date = session_dates[0]
-            
-            # Check consecutive days
-            for session_date in session_dates[1:]:
-                # If exactly one day difference, continue streak
-                if (prev_date - session_date).days == 1:
-                    streak_days += 1
-                    prev_date = session_date
-                # If same day, skip
-                elif (prev_date - session_date).days == 0:
-                    continue
-                # If gap in days, end streak
-                else:
-                    break
+    # The streak is only ongoing if there was a session today or yesterday
+    if last_day and (datetime.now(UTC).date() - last_day.date).days <= 1:
+        streak_days = last_day.streak_days
     
     return {
         "success_rate": round(success_rate, 1),
-        "total_study_sessions": total_sessions or 0,
+        "total_study_sessions": totals.sessions or 0,
         "total_active_groups": active_groups or 0,
         "study_streak_days": streak_days
-    } 
\ No newline at end of file
+    }
+
+def _dashboard_etag(data_version: int) -> str:
+    # The streak depends on the current day, so the day is part of the version
+    return f'W/"{data_version}-{datetime.now(UTC).date().isoformat()}"'
+
+@router.get("/summary")
+async def get_dashboard_summary(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    """Get all dashboard figures with a single query"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etag = _dashboard_etag(await get_data_version(db))
+        if if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    
+    stats = select(
+        select(func.coalesce(func.max(DataVersion.version), 0)).scalar_subquery().label("data_version"),
+        select(func.count()).select_from(Word).scalar_subquery().label("total_available_words"),
+        select(func.count()).select_from(WordStats).scalar_subquery().label("total_words_studied"),
+        select(func.sum(DailyActivity.session_count)).scalar_subquery().label("total_sessions"),
+        select(func.sum(DailyActivity.review_count)).scalar_subquery().label("total_reviews"),
+        select(func.sum(DailyActivity.correct_count)).scalar_subquery().label("total_correct"),
+        select(func.count()).select_from(Group)
+            .where(exists().where(StudySession.group_id == Group.id))
+            .scalar_subquery().label("active_groups")
+    ).cte("stats")
+    
+    last_day = select(DailyActivity.date, DailyActivity.streak_days) \
+        .where(DailyActivity.session_count > 0) \
+        .order_by(DailyActivity.date.desc()) \
+        .limit(1) \
+        .cte("last_day")
+    
+    last_session = select(
+        StudySession.id,
+        StudySession.created_at,
+        Group.name.label("group_name"),
+        StudyActivity.name.label("activity_name")
+    ).join(Group) \
+     .join(StudyActivity) \
+     .order_by(StudySession.created_at.desc()) \
+     .limit(1) \
+     .cte("last_session")
+    
+    review_items_count = select(func.count()) \
+        .select_from(WordReviewItem) \
+        .where(WordReviewItem.study_session_id == last_session.c.id) \
+        .scalar_subquery()
+    
+    query = select(
+        stats,
+        last_day.c.date.label("last_study_date"),
+        last_day.c.streak_days,
+        last_session.c.id.label("last_session_id"),
+        last_session.c.created_at.label("last_session_created_at"),
+        last_session.c.group_name,
+        last_session.c.activity_name,
+        review_items_count.label("review_items_count")
+    ).select_from(
+        stats.outerjoin(last_day, true()).outerjoin(last_session, true())
+    )
+    
+    result = await db.execute(query)
+    row = result.first()
+    
+    success_rate = 0
+    if row.total_reviews:
+        success_rate = (row.total_correct / row.total_reviews) * 100
+    
+    streak_days = 0
+    if row.last_study_date and (datetime.now(UTC).date() - row.last_study_date).days <= 1:
+        streak_days = row.streak_days
+    
+    last_study_session = None
+    if row.last_session_id is not None:
+        last_study_session = {
+            "id": row.last_session_id,
+            "group_name": row.group_name,
+            "activity_name": row.activity_name,
+            "start_time": row.last_session_created_at.isoformat(),
+            "review_items_count": row.review_items_count
+        }
+    
+    response.headers["ETag"] = _dashboard_etag(row.data_version)
+    response.headers["Cache-Control"] = "no-cache"
+    
+    return {
+        "last_study_session": last_study_session,
+        "study_progress": {
+            "total_words_studied": row.total_words_studied or 0,
+            "total_available_words": row.total_available_words or 0
+        },
+        "quick_stats": {
+            "success_rate": round(success_rate, 1),
+            "total_study_sessions": row.total_sessions or 0,
+            "total_active_groups": row.active_groups or 0,
+            "study_streak_days": streak_days
+        }
+    }
@@ -3,8 +3,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, select
 from sqlalchemy.orm import joinedload
 from datetime import timedelta
+from typing import Optional
 from ..models.base import get_db
-from ..models.models import Group, Word, StudySession, WordReviewItem
+from ..models.models import Group, Word, WordGroup, WordStats, StudySession, WordReviewItem
+from .pagination import paginate_query, split_page, build_pagination
+from ..models.data_version import get_data_version
+from .cache import response_cache
 
 router = APIRouter()
 
@@ -12,100 +16,96 @@ router = APIRouter()
 async def get_groups(
     page: int = 1,
     per_page: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
+    cache_key = response_cache.key(
+        "groups", data_version=await get_data_version(db),
+        page=page, per_page=per_page, cursor=cursor, include_total=include_total
+    )
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     # Get total count
-    count_query = select(func.count()).select_from(Group)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
+    total_count = None
+    if include_total:
+        count_query = select(func.count()).select_from(Group)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
     
-    # Get groups with word count
-    query = select(
-        Group,
-        func.count(Word.id).label("word_count")
-    ).outerjoin(Group.words) \
-     .group_by(Group.id) \
-     .offset(offset) \
-     .limit(per_page)
+    # Get groups with their materialized word count
+    query = paginate_query(select(Group), [Group.id], page, per_page, cursor)
     
     result = await db.execute(query)
-    groups = result.all()
+    groups, next_cursor = split_page(result.scalars().all(), per_page, lambda group: [group.id])
     
-    return {
+    response = {
         "items": [
             {
                 "id": group.id,
                 "name": group.name,
-                "word_count": word_count
+                "word_count": group.word_count
             }
-            for group, word_count in groups
+            for group in groups
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     }
+    await response_cache.set(cache_key, response)
+    return response
 
 @router.get("/{group_id}")
 async def get_group(group_id: int, db: AsyncSession = Depends(get_db)):
-    # Get group with word count
-    query = select(
-        Group,
-        func.count(Word.id).label("word_count")
-    ).outerjoin(Group.words) \
-     .where(Group.id == group_id) \
-     .group_by(Group.id)
+    cache_key = response_cache.key("group", data_version=await get_data_version(db), group_id=group_id)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
-    result = await db.execute(query)
-    group_data = result.first()
+    # Get group with its materialized word count
+    group = await db.get(Group, group_id)
     
-    if not group_data:
+    if not group:
         return None
     
-    group, word_count = group_data
-    
-    return {
+    response = {
         "id": group.id,
         "name": group.name,
         "stats": {
-            "total_word_count": word_count
+            "total_word_count": group.word_count
         }
     }
+    await response_cache.set(cache_key, response)
+    return response
 
 @router.get("/{group_id}/words")
 async def get_group_words(
     group_id: int,
     page: int = 1,
     per_page: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count of words in group
-    count_query = select(func.count()).select_from(Word).join(Word.groups).where(Group.id == group_id)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
+    total_count = None
+    if include_total:
+        count_query = select(Group.word_count).where(Group.id == group_id)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar() or 0
     
-    # Get words with their review stats
+    # Get words with their materialized review stats, the group's words come from the unique group_id, word_id index
     query = select(
         Word,
-        func.count(WordReviewItem.id).filter(WordReviewItem.correct == True).label("correct_count"),
-        func.count(WordReviewItem.id).filter(WordReviewItem.correct == False).label("wrong_count")
-    ).join(Word.groups) \
-     .outerjoin(WordReviewItem) \
-     .where(Group.id == group_id) \
-     .group_by(Word.id) \
-     .offset(offset) \
-     .limit(per_page)
+        func.coalesce(WordStats.correct_count, 0).label("correct_count"),
+        func.coalesce(WordStats.wrong_count, 0).label("wrong_count")
+    ).join(WordGroup, WordGroup.word_id == Word.id) \
+     .outerjoin(WordStats) \
+     .where(WordGroup.group_id == group_id)
+    query = paginate_query(query, [Word.id], page, per_page, cursor)
     
     result = await db.execute(query)
-    words = result.all()
+    words, next_cursor = split_page(result.all(), per_page, lambda row: [row.Word.id])
     
     return {
         "items": [
@@ -118,12 +118,7 @@ async def get_group_words(
             }
             for word, correct_count, wrong_count in words
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     }
 
 @router.get("/{group_id}/study_sessions")
@@ -131,37 +126,42 @@ async def get_group_study_sessions(
     group_id: int,
     page: int = 1,
     per_page: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count
-    count_query = (
-        select(func.count())
-        .select_from(StudySession)
-        .where(StudySession.group_id == group_id)
-    )
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
-    
-    # Get study sessions with review items count
+    total_count = None
+    if include_total:
+        count_query = (
+            select(func.count())
+            .select_from(StudySession)
+            .where(StudySession.group_id == group_id)
+        )
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
+    
+    # Get study sessions with review items count, counted per returned session
+    # so that the page is read straight from the group_id, created_at index
+    review_items_count = select(func.count(WordReviewItem.id)) \
+        .where(WordReviewItem.study_session_id == StudySession.id) \
+        .scalar_subquery()
     query = (
-        select(StudySession, func.count(WordReviewItem.id).label("review_items_count"))
+        select(StudySession, review_items_count.label("review_items_count"))
         .options(
             joinedload(StudySession.activity),
             joinedload(StudySession.group)
         )
-        .outerjoin(StudySession.review_items)
         .where(StudySession.group_id == group_id)
-        .group_by(StudySession.id)
-        .order_by(StudySession.created_at.desc())
-        .offset(offset)
-        .limit(per_page)
+    )
+    query = paginate_query(
+        query, [StudySession.created_at, StudySession.id], page, per_page, cursor, descending=True
     )
     
     result = await db.execute(query)
-    sessions = result.unique().all()
+    sessions, next_cursor = split_page(
+        result.unique().all(), per_page, lambda row: [row.StudySession.created_at, row.StudySession.id]
+    )
     
     return {
         "items": [
@@ -175,10 +175,5 @@ async def get_group_study_sessions(
             }
             for session, review_count in sessions
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     } 
\ No newline at end of file
@@ -0,0 +1,193 @@
+import logging
+import os
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Statements slower than this are logged and counted as slow
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+
+# Upper bounds in seconds of the request duration histogram
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class RequestStats:
+    """SQL statements run while serving a single request"""
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.slow_statements = 0
+    
+    def server_timing(self, total_seconds: float) -> str:
+        return f'db;dur={self.db_seconds * 1000:.2f};desc="{self.statements} queries", ' \
+               f'total;dur={total_seconds * 1000:.2f}'
+
+# Set by QueryMetricsMiddleware. SQLAlchemy runs the DB-API calls in a greenlet
+# that shares the context of the awaiting task, so the cursor hooks see it too.
+_request_stats: ContextVar = ContextVar("request_stats", default=None)
+
+class MetricsRegistry:
+    """Counters per route, rendered in the Prometheus text exposition format"""
+    def __init__(self):
+        self.requests = defaultdict(int)
+        self.duration_buckets = defaultdict(lambda: [0] * len(DURATION_BUCKETS))
+        self.duration_sum = defaultdict(float)
+        self.duration_count = defaultdict(int)
+        self.statements = defaultdict(int)
+        self.db_seconds = defaultdict(float)
+        self.slow_statements = defaultdict(int)
+        self.pools = {}
+        self.pool_connections = defaultdict(int)
+    
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        key = (method, route)
+        self.requests[(method, route, str(status))] += 1
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if seconds <= bound:
+                self.duration_buckets[key][i] += 1
+        self.duration_sum[key] += seconds
+        self.duration_count[key] += 1
+        self.statements[key] += stats.statements
+        self.db_seconds[key] += stats.db_seconds
+        self.slow_statements[key] += stats.slow_statements
+    
+    def render(self) -> str:
+        lines = []
+    
+        def family(name: str, kind: str, description: str, samples: dict, labels=("method", "route")):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, value in sorted(samples.items()):
+                lines.append(f"{name}{_labels(zip(labels, key))} {value}")
+    
+        family("http_requests_total", "counter", "HTTP requests served.", self.requests, ("method", "route", "status"))
+    
+        lines.append("# HELP http_request_duration_seconds Time spent serving HTTP requests.")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for key in sorted(self.duration_count):
+            labels = list(zip(("method", "route"), key))
+            for bound, count in zip(DURATION_BUCKETS, self.duration_buckets[key]):
+                lines.append(f"http_request_duration_seconds_bucket{_labels(labels + [('le', bound)])} {count}")
+            lines.append(f"http_request_duration_seconds_bucket{_labels(labels + [('le', '+Inf')])} {self.duration_count[key]}")
+            lines.append(f"http_request_duration_seconds_sum{_labels(labels)} {self.duration_sum[key]}")
+            lines.append(f"http_request_duration_seconds_count{_labels(labels)} {self.duration_count[key]}")
+    
+        family("db_statements_total", "counter", "SQL statements run by HTTP requests.", self.statements)
+        family("db_duration_seconds_total", "counter", "Time spent in SQL statements by HTTP requests.", self.db_seconds)
+        family(
+            "db_slow_statements_total",
+            "counter",
+            f"SQL statements slower than {SLOW_QUERY_MS:g}ms run by HTTP requests.",
+            self.slow_statements
+        )
+    
+        # Only queue pools have a size, e.g. not the static pool of an in-memory SQLite database
+        pools = {name: pool for name, pool in self.pools.items() if hasattr(pool, "checkedout")}
+        for name, description, gauge in (
+            ("db_pool_size", "Connections the pool keeps open.", lambda pool: pool.size()),
+            ("db_pool_checked_out", "Connections in use by requests.", lambda pool: pool.checkedout()),
+            ("db_pool_checked_in", "Idle connections in the pool.", lambda pool: pool.checkedin()),
+            ("db_pool_overflow", "Connections open beyond the pool size, negative while below it.", lambda pool: pool.overflow())
+        ):
+            family(name, "gauge", description, {(pool_name,): gauge(pool) for pool_name, pool in pools.items()}, ("pool",))
+        family(
+            "db_pool_connections_opened_total",
+            "counter",
+            "Database connections opened by the pool.",
+            {(pool_name,): count for pool_name, count in self.pool_connections.items()},
+            ("pool",)
+        )
+        return "\n".join(lines) + "\n"
+
+def _labels(pairs) -> str:
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+
+metrics = MetricsRegistry()
+
+def instrument_engine(engine, name: str = "primary"):
+    """Attribute the statements run on an async engine to the current request
+    and export the utilization of its connection pool"""
+    metrics.pools[name] = engine.pool
+    
+    @event.listens_for(engine.sync_engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        metrics.pool_connections[name] += 1
+    
+    def record_statement(context, statement: str, failed: bool = False):
+        start = getattr(context, "query_start_time", None)
+        if start is None:
+            return
+        # Recorded once, a statement can fail after after_cursor_execute while fetching
+        context.query_start_time = None
+        elapsed = time.perf_counter() - start
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            if stats is not None:
+                stats.slow_statements += 1
+            logger.warning(
+                "Slow %squery (%.1fms): %s", "failed " if failed else "", elapsed * 1000, " ".join(statement.split())
+            )
+    
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, which goes away with the statement even when it raises
+        if context is not None:
+            context.query_start_time = time.perf_counter()
+    
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        record_statement(context, statement)
+    
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(exception_context):
+        # after_cursor_execute does not run for a statement that raised
+        record_statement(exception_context.execution_context, exception_context.statement or "", failed=True)
+
+class QueryMetricsMiddleware:
+    """Collects the SQL statements of every request into the metrics registry
+    and reports them to the client in a Server-Timing header"""
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+    
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+    
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # Streamed bodies query after the headers are sent, those only show up in /metrics
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing(time.perf_counter() - start))
+            await send(message)
+    
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            # The route template keeps the label set bounded, unmatched paths share one label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            metrics.observe(scope["method"], route, status, time.perf_counter() - start, stats)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Request and query metrics in the Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
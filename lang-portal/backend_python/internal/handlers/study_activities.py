@@ -2,8 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, select
 from datetime import datetime, timedelta, UTC
+from typing import Optional
 from ..models.base import get_db
 from ..models.models import StudyActivity, StudySession, WordReviewItem, Group
+from ..models.stats import record_study_session
+from ..models.data_version import bump_data_version, get_data_version
+from .pagination import paginate_query, split_page, build_pagination
+from .cache import response_cache
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -14,11 +19,16 @@ class CreateStudySessionRequest(BaseModel):
 
 @router.get("")
 async def get_study_activities(db: AsyncSession = Depends(get_db)):
+    cache_key = response_cache.key("study_activities", data_version=await get_data_version(db))
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     query = select(StudyActivity)
     result = await db.execute(query)
     activities = result.scalars().all()
     
-    return [
+    response = [
         {
             "id": activity.id,
             "name": activity.name,
@@ -28,6 +38,8 @@ async def get_study_activities(db: AsyncSession = Depends(get_db)):
         }
         for activity in activities
     ]
+    await response_cache.set(cache_key, response)
+    return response
 
 @router.get("/{activity_id}")
 async def get_study_activity(activity_id: int, db: AsyncSession = Depends(get_db)):
@@ -51,49 +63,55 @@ async def get_activity_study_sessions(
     activity_id: int,
     page: int = 1,
     per_page: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count
-    count_query = select(func.count()).select_from(StudySession) \
-        .where(StudySession.study_activity_id == activity_id)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
+    total_count = None
+    if include_total:
+        count_query = select(func.count()).select_from(StudySession) \
+            .where(StudySession.study_activity_id == activity_id)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
     
-    # Get study sessions with review items count
-    query = select(
-        StudySession,
-        func.count(WordReviewItem.id).label("review_items_count")
-    ).outerjoin(StudySession.review_items) \
-     .where(StudySession.study_activity_id == activity_id) \
-     .group_by(StudySession.id) \
-     .order_by(StudySession.created_at.desc()) \
-     .offset(offset) \
-     .limit(per_page)
+    # Get study sessions with their activity and group names and review items count,
+    # counted per returned session so that the page is read from the activity index
+    review_items_count = select(func.count(WordReviewItem.id)) \
+        .where(WordReviewItem.study_session_id == StudySession.id) \
+        .scalar_subquery()
+    query = (
+        select(
+            StudySession.id,
+            StudySession.created_at,
+            StudyActivity.name.label("activity_name"),
+            Group.name.label("group_name"),
+            review_items_count.label("review_items_count")
+        )
+        .join(StudyActivity, StudySession.study_activity_id == StudyActivity.id)
+        .join(Group, StudySession.group_id == Group.id)
+        .where(StudySession.study_activity_id == activity_id)
+    )
+    query = paginate_query(
+        query, [StudySession.created_at, StudySession.id], page, per_page, cursor, descending=True
+    )
     
     result = await db.execute(query)
-    sessions = result.all()
+    sessions, next_cursor = split_page(result.all(), per_page, lambda row: [row.created_at, row.id])
     
     return {
         "items": [
             {
                 "id": session.id,
-                "activity_name": session.activity.name,
-                "group_name": session.group.name,
+                "activity_name": session.activity_name,
+                "group_name": session.group_name,
                 "start_time": session.created_at.isoformat(),
                 "end_time": (session.created_at + timedelta(minutes=10)).isoformat(),  # Estimated
-                "review_items_count": review_count
+                "review_items_count": session.review_items_count
             }
-            for session, review_count in sessions
+            for session in sessions
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     }
 
 @router.post("")
@@ -126,7 +144,10 @@ async def create_study_session(
     )
     
     db.add(session)
+    await record_study_session(db, session.created_at.date())
+    await bump_data_version(db)
     await db.commit()
+    await response_cache.invalidate()
     await db.refresh(session)
     
     return {
@@ -1,47 +1,67 @@
 from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select, and_
+from sqlalchemy import func, select, insert
 from datetime import datetime, timedelta, UTC
+from collections import defaultdict
 from sqlalchemy.orm import joinedload
+from typing import List, Optional
 from ..models.base import get_db
-from ..models.models import StudySession, Word, WordReviewItem, StudyActivity, Group
-from pydantic import BaseModel
+from ..models.models import StudySession, Word, WordReviewItem, StudyActivity, Group, WordGroup, WordSchedule
+from ..models.stats import increment_word_stats, record_word_review, add_word_stats, add_daily_reviews
+from ..models.scheduler import schedule_reviews
+from ..models.data_version import bump_data_version
+from .pagination import paginate_query, split_page, build_pagination
+from .cache import response_cache
+from pydantic import BaseModel, Field
 
 router = APIRouter()
 
 class CreateWordReviewRequest(BaseModel):
     correct: bool
 
+class WordReviewBatchItem(BaseModel):
+    word_id: int
+    correct: bool
+    answered_at: Optional[datetime] = None
+
+class CreateWordReviewBatchRequest(BaseModel):
+    items: List[WordReviewBatchItem] = Field(..., min_length=1, max_length=10000)
+
 @router.get("")
 async def get_study_sessions(
     page: int = 1,
     per_page: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count
-    count_query = select(func.count()).select_from(StudySession)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
+    total_count = None
+    if include_total:
+        count_query = select(func.count()).select_from(StudySession)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
     
-    # Get study sessions with review items count
+    # Get study sessions with review items count, counted per returned session
+    # so that the page is read straight from the created_at index
+    review_items_count = select(func.count(WordReviewItem.id)) \
+        .where(WordReviewItem.study_session_id == StudySession.id) \
+        .scalar_subquery()
     query = (
-        select(StudySession, func.count(WordReviewItem.id).label("review_items_count"))
+        select(StudySession, review_items_count.label("review_items_count"))
         .options(
             joinedload(StudySession.activity),
             joinedload(StudySession.group)
         )
-        .outerjoin(StudySession.review_items)
-        .group_by(StudySession.id)
-        .order_by(StudySession.created_at.desc())
-        .offset(offset)
-        .limit(per_page)
+    )
+    query = paginate_query(
+        query, [StudySession.created_at, StudySession.id], page, per_page, cursor, descending=True
     )
     
     result = await db.execute(query)
-    sessions = result.unique().all()
+    sessions, next_cursor = split_page(
+        result.unique().all(), per_page, lambda row: [row.StudySession.created_at, row.StudySession.id]
+    )
     
     return {
         "items": [
@@ -55,12 +75,7 @@ async def get_study_sessions(
             }
             for session, review_count in sessions
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     }
 
 @router.get("/{session_id}")
@@ -97,17 +112,18 @@ async def get_session_words(
     session_id: int,
     page: int = 1,
     per_page: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count of reviewed words in session
-    count_query = select(func.count(Word.id)) \
-        .join(WordReviewItem) \
-        .where(WordReviewItem.study_session_id == session_id)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
+    total_count = None
+    if include_total:
+        count_query = select(func.count(Word.id)) \
+            .join(WordReviewItem) \
+            .where(WordReviewItem.study_session_id == session_id)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
     
     # Get words with their review results for this session
     query = select(
@@ -116,12 +132,11 @@ async def get_session_words(
         func.count(WordReviewItem.id).filter(WordReviewItem.correct == False).label("wrong_count")
     ).join(WordReviewItem) \
      .where(WordReviewItem.study_session_id == session_id) \
-     .group_by(Word.id) \
-     .offset(offset) \
-     .limit(per_page)
+     .group_by(Word.id)
+    query = paginate_query(query, [Word.id], page, per_page, cursor)
     
     result = await db.execute(query)
-    words = result.all()
+    words, next_cursor = split_page(result.all(), per_page, lambda row: [row.Word.id])
     
     return {
         "items": [
@@ -135,12 +150,7 @@ async def get_session_words(
             }
             for word, correct_count, wrong_count in words
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
     }
 
 @router.post("/{session_id}/words/{word_id}/review")
@@ -175,7 +185,12 @@ async def create_word_review(
     )
     
     db.add(review_item)
+    await increment_word_stats(db, word_id, correct)
+    await schedule_reviews(db, [(word_id, correct, review_item.created_at)])
+    await record_word_review(db, review_item.created_at.date(), correct)
+    await bump_data_version(db)
     await db.commit()
+    await response_cache.invalidate()
     
     return {
         "success": True,
@@ -185,6 +200,67 @@ async def create_word_review(
         "created_at": review_item.created_at.isoformat()
     }
 
+@router.post("/{session_id}/reviews")
+async def create_word_reviews(
+    session_id: int,
+    request: CreateWordReviewBatchRequest = Body(...),
+    db: AsyncSession = Depends(get_db)
+):
+    """Record a batch of review results, e.g. a finished quiz or an offline sync"""
+    word_ids = {item.word_id for item in request.items}
+    
+    # Verify the session and all words exist with a single query
+    validation_query = select(StudySession.id, Word.id) \
+        .select_from(StudySession) \
+        .outerjoin(Word, Word.id.in_(word_ids)) \
+        .where(StudySession.id == session_id)
+    result = await db.execute(validation_query)
+    rows = result.all()
+    
+    if not rows:
+        raise HTTPException(status_code=404, detail="Study session not found")
+    
+    missing_word_ids = word_ids - {word_id for _, word_id in rows}
+    if missing_word_ids:
+        raise HTTPException(status_code=404, detail=f"Words not found: {sorted(missing_word_ids)}")
+    
+    # Answer times are stored as naive UTC, answers without an offset are taken as UTC
+    now = datetime.now(UTC).replace(tzinfo=None)
+    review_items = []
+    word_counts = defaultdict(lambda: [0, 0])
+    day_counts = defaultdict(lambda: [0, 0])
+    for item in request.items:
+        created_at = item.answered_at or now
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(UTC).replace(tzinfo=None)
+        
+        review_items.append({
+            "word_id": item.word_id,
+            "study_session_id": session_id,
+            "correct": item.correct,
+            "created_at": created_at
+        })
+        word_counts[item.word_id][0 if item.correct else 1] += 1
+        day_counts[created_at.date()][0] += 1
+        day_counts[created_at.date()][1] += 1 if item.correct else 0
+    
+    # Insert all review items with one executemany
+    await db.execute(insert(WordReviewItem), review_items)
+    await add_word_stats(db, word_counts)
+    await schedule_reviews(db, [
+        (item["word_id"], item["correct"], item["created_at"]) for item in review_items
+    ])
+    await add_daily_reviews(db, day_counts)
+    await bump_data_version(db)
+    await db.commit()
+    await response_cache.invalidate()
+    
+    return {
+        "success": True,
+        "study_session_id": session_id,
+        "created_count": len(review_items)
+    }
+
 @router.get("/{session_id}/next_words")
 async def get_next_words(
     session_id: int,
@@ -199,19 +275,17 @@ async def get_next_words(
     if not session:
         raise HTTPException(status_code=404, detail="Study session not found")
     
-    # Get words from the group that haven't been reviewed in this session
+    # Get the due words of the group, most overdue first. Reviewed words are
+    # rescheduled into the future, so they drop out of the range on their own.
     words_query = (
         select(Word)
-        .join(Word.groups)  # Use the relationship instead of direct join
-        .where(Group.id == session.group_id)
-        .outerjoin(
-            WordReviewItem,
-            and_(
-                WordReviewItem.word_id == Word.id,
-                WordReviewItem.study_session_id == session_id
-            )
+        .join(WordSchedule, WordSchedule.word_id == Word.id)
+        .join(WordGroup, WordGroup.word_id == Word.id)
+        .where(
+            WordGroup.group_id == session.group_id,
+            WordSchedule.due_at <= datetime.now(UTC)
         )
-        .where(WordReviewItem.id == None)
+        .order_by(WordSchedule.due_at, WordSchedule.word_id)
         .limit(limit)
     )
     
@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete
+from sqlalchemy import delete, inspect, select
 from ..models.base import get_db, Base, engine
-from ..models.models import StudySession, WordReviewItem, Word, Group, WordGroup, StudyActivity
-import json
+from ..models.models import StudySession, WordReviewItem, StudyActivity, DailyActivity, DataVersion
+from ..models.stats import rebuild_word_stats
+from ..models.scheduler import reset_word_schedules
+from ..models.vocabulary import import_vocabulary, read_vocabulary
+from ..models.data_version import bump_data_version
+from .cache import response_cache
 from pathlib import Path
 
 router = APIRouter()
@@ -18,7 +22,18 @@ async def reset_history(db: AsyncSession = Depends(get_db)):
     # Delete all study sessions
     await db.execute(delete(StudySession))
     
+    # Delete the daily activity rollup
+    await db.execute(delete(DailyActivity))
+    
+    # Rebuild the per-word review counters
+    await rebuild_word_stats(db)
+    
+    # Make every word due again
+    await reset_word_schedules(db)
+    
+    await bump_data_version(db)
     await db.commit()
+    await response_cache.invalidate()
     
     return {
         "success": True,
@@ -29,39 +44,22 @@ async def reset_history(db: AsyncSession = Depends(get_db)):
 async def full_reset(db: AsyncSession = Depends(get_db)):
     """Completely reset the system and reload seed data"""
     
+    def read_data_version(sync_conn):
+        if not inspect(sync_conn).has_table(DataVersion.__tablename__):
+            return 0
+        return sync_conn.execute(select(DataVersion.version)).scalar() or 0
+    
     # Drop all tables
     async with engine.begin() as conn:
+        # Keep the data version increasing so ETags issued before the reset go stale
+        data_version = await conn.run_sync(read_data_version)
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
     
-    # Load seed data
+    # Load seed data with set-based inserts
     seeds_dir = Path('db/seeds')
-    for seed_file in seeds_dir.glob('*.json'):
-        with open(seed_file) as f:
-            seed_data = json.load(f)
-            
-            # Create group
-            group = Group(name=seed_data['group_name'])
-            db.add(group)
-            await db.flush()  # To get the group ID
-            
-            # Create words and link to group
-            for word_data in seed_data['words']:
-                word = Word(
-                    japanese=word_data['japanese'],
-                    romaji=word_data['romaji'],
-                    english=word_data['english'],
-                    parts=word_data.get('parts', {})
-                )
-                db.add(word)
-                await db.flush()  # To get the word ID
-                
-                # Create word-group association
-                word_group = WordGroup(
-                    word_id=word.id,
-                    group_id=group.id
-                )
-                db.add(word_group)
+    for seed_file in sorted(seeds_dir.glob('*.json')):
+        await import_vocabulary(db, read_vocabulary(seed_file))
     
     # Create default study activities
     default_activities = [
@@ -83,7 +81,9 @@ async def full_reset(db: AsyncSession = Depends(get_db)):
         activity = StudyActivity(**activity_data)
         db.add(activity)
     
+    await bump_data_version(db, start=data_version)
     await db.commit()
+    await response_cache.invalidate()
     
     return {
         "success": True,
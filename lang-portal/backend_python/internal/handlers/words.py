@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select
+from sqlalchemy import func, select, or_
+from typing import Optional
 from ..models.base import get_db
-from ..models.models import Word, WordReviewItem, Group
+from ..models.models import Word, WordStats, Group
+from ..models.search import (
+    FUZZY_THRESHOLD, romaji_key, trigram_similarity, fts_phrase, fuzzy_match_expression,
+    words_fts, words_fts_match, words_fts_rank
+)
+from .pagination import paginate_query, split_page, build_pagination
 
 router = APIRouter()
 
@@ -10,28 +16,27 @@ router = APIRouter()
 async def get_words(
     page: int = 1,
     per_page: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db)
 ):
-    # Calculate offset
-    offset = (page - 1) * per_page
-    
     # Get total count
-    count_query = select(func.count()).select_from(Word)
-    total_count = await db.execute(count_query)
-    total_count = total_count.scalar()
+    total_count = None
+    if include_total:
+        count_query = select(func.count()).select_from(Word)
+        total_count = await db.execute(count_query)
+        total_count = total_count.scalar()
     
-    # Get words with their review stats
+    # Get words with their materialized review stats
     query = select(
         Word,
-        func.count(WordReviewItem.id).filter(WordReviewItem.correct == True).label("correct_count"),
-        func.count(WordReviewItem.id).filter(WordReviewItem.correct == False).label("wrong_count")
-    ).outerjoin(WordReviewItem) \
-     .group_by(Word.id) \
-     .offset(offset) \
-     .limit(per_page)
+        func.coalesce(WordStats.correct_count, 0).label("correct_count"),
+        func.coalesce(WordStats.wrong_count, 0).label("wrong_count")
+    ).outerjoin(WordStats)
+    query = paginate_query(query, [Word.id], page, per_page, cursor)
     
     result = await db.execute(query)
-    words = result.all()
+    words, next_cursor = split_page(result.all(), per_page, lambda row: [row.Word.id])
     
     return {
         "items": [
@@ -45,12 +50,84 @@ async def get_words(
             }
             for word, correct_count, wrong_count in words
         ],
-        "pagination": {
-            "current_page": page,
-            "total_pages": (total_count + per_page - 1) // per_page,
-            "total_items": total_count,
-            "items_per_page": per_page
-        }
+        "pagination": build_pagination(page, per_page, total_count, cursor, next_cursor)
+    }
+
+@router.get("/search")
+async def search_words(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    fuzzy: bool = True,
+    db: AsyncSession = Depends(get_db)
+):
+    """Search words by japanese, romaji or english with prefix and fuzzy romaji matching"""
+    term = q.strip().lower()
+    key = romaji_key(term)
+    
+    query = select(
+        Word,
+        func.coalesce(WordStats.correct_count, 0).label("correct_count"),
+        func.coalesce(WordStats.wrong_count, 0).label("wrong_count"),
+        words_fts.c.romaji_key
+    ).join(words_fts, words_fts.c.rowid == Word.id) \
+     .outerjoin(WordStats)
+    
+    if len(term) < 3 and len(key) < 3:
+        # Too short for trigrams, fall back to a prefix scan of the index
+        exact_query = query.where(or_(
+            words_fts.c.japanese.startswith(term, autoescape=True),
+            words_fts.c.romaji.startswith(term, autoescape=True),
+            words_fts.c.english.startswith(term, autoescape=True),
+            words_fts.c.romaji_key.startswith(key, autoescape=True)
+        ))
+    else:
+        expression = "{japanese romaji english} : " + fts_phrase(term)
+        if len(key) >= 3:
+            expression += " OR romaji_key : " + fts_phrase(key)
+        exact_query = query.where(words_fts_match(expression))
+    
+    # Exact matches need no ranking, so the index can stop after a few pages of rows
+    result = await db.execute(exact_query.limit(limit * 5))
+    rows = result.all()
+    
+    # Only rank fuzzy trigram matches when the exact ones do not fill the page
+    if fuzzy and len(key) > 3 and len(rows) < limit:
+        fuzzy_query = query.where(
+            words_fts_match(fuzzy_match_expression(key)),
+            Word.id.notin_([row.Word.id for row in rows])
+        ).order_by(words_fts_rank()).limit(limit * 5)
+        result = await db.execute(fuzzy_query)
+        rows += result.all()
+    
+    # Prefix matches first, then substring matches, then close enough fuzzy matches
+    matches = []
+    for word, correct_count, wrong_count, word_key in rows:
+        texts = [(text or "").lower() for text in (word.japanese, word.romaji, word.english)]
+        if any(text.startswith(term) for text in texts) or word_key.startswith(key):
+            match = "prefix"
+        elif any(term in text for text in texts) or key in word_key:
+            match = "substring"
+        elif trigram_similarity(key, word_key) >= FUZZY_THRESHOLD:
+            match = "fuzzy"
+        else:
+            continue
+        matches.append((word, correct_count, wrong_count, match))
+    order = {"prefix": 0, "substring": 1, "fuzzy": 2}
+    matches.sort(key=lambda row: order[row[3]])
+    
+    return {
+        "items": [
+            {
+                "id": word.id,
+                "japanese": word.japanese,
+                "romaji": word.romaji,
+                "english": word.english,
+                "correct_count": correct_count,
+                "wrong_count": wrong_count,
+                "match": match
+            }
+            for word, correct_count, wrong_count, match in matches[:limit]
+        ]
     }
 
 @router.get("/{word_id}")
@@ -58,11 +135,10 @@ async def get_word(word_id: int, db: AsyncSession = Depends(get_db)):
     # Get word with its review stats and groups
     query = select(
         Word,
-        func.count(WordReviewItem.id).filter(WordReviewItem.correct == True).label("correct_count"),
-        func.count(WordReviewItem.id).filter(WordReviewItem.correct == False).label("wrong_count")
-    ).outerjoin(WordReviewItem) \
-     .where(Word.id == word_id) \
-     .group_by(Word.id)
+        func.coalesce(WordStats.correct_count, 0).label("correct_count"),
+        func.coalesce(WordStats.wrong_count, 0).label("wrong_count")
+    ).outerjoin(WordStats) \
+     .where(Word.id == word_id)
     
     result = await db.execute(query)
     word_data = result.first()
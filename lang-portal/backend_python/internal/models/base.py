@@ -1,13 +1,49 @@
+import os
+from sqlalchemy import event
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-DATABASE_URL = "sqlite+aiosqlite:///words.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///words.db")
+DB_PROFILE = os.getenv("DB_PROFILE", "production")
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+# Pragmas applied to every new SQLite connection, per engine profile
+ENGINE_PROFILES = {
+    # SQLite built-in settings: rollback journal, readers wait for writers
+    "default": {},
+    # WAL lets readers run next to a writer, NORMAL sync is durable across app crashes
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # negative means KiB, so 64 MiB
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY"
+    }
+}
+
+def make_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE, echo: bool = DB_ECHO, **kwargs):
+    """Create an async engine that applies the pragmas of an engine profile on connect"""
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE {profile!r}, expected one of {list(ENGINE_PROFILES)}")
+    pragmas = ENGINE_PROFILES[profile]
+    
+    engine = create_async_engine(url, echo=echo, **kwargs)
+    
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+    
+    return engine
+
+engine = make_engine()
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
 async def get_db():
     async with AsyncSessionLocal() as session:
-        yield session 
\ No newline at end of file
+        yield session
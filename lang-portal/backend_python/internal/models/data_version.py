@@ -0,0 +1,18 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import DataVersion
+
+async def get_data_version(db: AsyncSession) -> int:
+    """Get the counter that changes whenever the study data changes"""
+    result = await db.execute(select(func.coalesce(func.max(DataVersion.version), 0)))
+    return result.scalar()
+
+async def bump_data_version(db: AsyncSession, start: int = 0):
+    """Increment the data version, counting from start when it is not stored yet"""
+    stmt = insert(DataVersion).values(id=1, version=start + 1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DataVersion.id],
+        set_={"version": DataVersion.version + 1}
+    )
+    await db.execute(stmt)
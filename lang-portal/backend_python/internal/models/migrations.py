@@ -0,0 +1,81 @@
+import hashlib
+import re
+import sqlite3
+from pathlib import Path
+
+# Bookkeeping table of the migration runner, deliberately not part of the ORM
+# metadata so that full_reset's drop_all/create_all leaves the history alone
+SCHEMA_MIGRATIONS_DDL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    checksum TEXT NOT NULL,
+    applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# SQLite has no ADD COLUMN IF NOT EXISTS, the runner checks the column itself
+ADD_COLUMN_PATTERN = re.compile(r"ALTER\s+TABLE\s+(\w+)\s+ADD\s+(?:COLUMN\s+)?(\w+)[^;]*;", re.IGNORECASE)
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+def _skip_existing_columns(conn: sqlite3.Connection, sql: str) -> str:
+    """
+    Drop the ADD COLUMN statements whose column already exists, e.g. on a database
+    built by create_all from models that already declare it
+    """
+    def add_column(match):
+        table, column = match.group(1), match.group(2)
+        exists = conn.execute(
+            "SELECT 1 FROM pragma_table_info(?) WHERE name = ?", (table, column)
+        ).fetchone()
+        return "" if exists else match.group(0)
+    
+    return ADD_COLUMN_PATTERN.sub(add_column, sql)
+
+def migration_files(migrations_dir) -> list:
+    """(version, path) of every migration, ordered by the numeric file name prefix"""
+    return [
+        (path.name.split("_", 1)[0], path)
+        for path in sorted(Path(migrations_dir).glob("*.sql"))
+    ]
+
+def applied_migrations(conn: sqlite3.Connection) -> dict:
+    """Checksums of the applied migrations by version"""
+    conn.execute(SCHEMA_MIGRATIONS_DDL)
+    return dict(conn.execute("SELECT version, checksum FROM schema_migrations"))
+
+def apply_migrations(conn: sqlite3.Connection, migrations_dir) -> list:
+    """
+    Apply the migrations that are not recorded in schema_migrations yet, in order.
+    Each migration runs in its own transaction together with its bookkeeping row,
+    so a failing migration leaves neither partial changes nor a record behind.
+    Returns the paths of the applied migrations.
+    """
+    applied = applied_migrations(conn)
+    newly_applied = []
+    
+    for version, path in migration_files(migrations_dir):
+        sql = path.read_text()
+        checksum = hashlib.sha256(sql.encode()).hexdigest()
+        if version in applied:
+            if applied[version] != checksum:
+                print(f"Warning: {path.name} changed after it was applied, add a new migration instead")
+            continue
+    
+        try:
+            conn.executescript(
+                "BEGIN;\n"
+                f"{_skip_existing_columns(conn, sql)}\n;\n"
+                "INSERT INTO schema_migrations (version, name, checksum) "
+                f"VALUES ({_quote(version)}, {_quote(path.name)}, {_quote(checksum)});\n"
+                "COMMIT;"
+            )
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        newly_applied.append(path)
+    
+    return newly_applied
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Float, ForeignKey, Index, JSON, DDL, event
 from sqlalchemy.orm import relationship
 from .base import Base
+from .search import WORDS_FTS_DDL, WORDS_FTS_DROP
 from datetime import datetime, UTC
 
 class Word(Base):
@@ -14,9 +15,44 @@ class Word(Base):
     
     groups = relationship("Group", secondary="words_groups", back_populates="words")
     review_items = relationship("WordReviewItem", back_populates="word")
+    stats = relationship("WordStats", back_populates="word", uselist=False)
+    schedule = relationship("WordSchedule", back_populates="word", uselist=False)
+
+# The full-text index is not part of the metadata, so create and drop it with the words table
+for statement in WORDS_FTS_DDL:
+    event.listen(Word.__table__, "after_create", DDL(statement))
+event.listen(Word.__table__, "before_drop", DDL(WORDS_FTS_DROP))
+
+class WordStats(Base):
+    __tablename__ = "word_stats"
+    
+    word_id = Column(Integer, ForeignKey("words.id"), primary_key=True)
+    correct_count = Column(Integer, nullable=False, default=0)
+    wrong_count = Column(Integer, nullable=False, default=0)
+    
+    word = relationship("Word", back_populates="stats")
+
+class WordSchedule(Base):
+    __tablename__ = "word_schedule"
+    __table_args__ = (
+        Index("idx_word_schedule_due_at", "due_at", "word_id"),
+    )
+    
+    word_id = Column(Integer, ForeignKey("words.id"), primary_key=True)
+    ease = Column(Float, nullable=False, default=2.5)
+    interval_days = Column(Float, nullable=False, default=0)
+    repetitions = Column(Integer, nullable=False, default=0)
+    due_at = Column(DateTime, nullable=False, default=lambda: datetime.now(UTC))
+    
+    word = relationship("Word", back_populates="schedule")
 
 class WordGroup(Base):
     __tablename__ = "words_groups"
+    __table_args__ = (
+        # A word is in a group at most once, which keeps groups.word_count exact
+        Index("idx_words_groups_group_id_word_id", "group_id", "word_id", unique=True),
+        Index("idx_words_groups_word_id_group_id", "word_id", "group_id"),
+    )
     
     id = Column(Integer, primary_key=True)
     word_id = Column(Integer, ForeignKey("words.id"))
@@ -27,12 +63,19 @@ class Group(Base):
     
     id = Column(Integer, primary_key=True)
     name = Column(String)
+    # Materialized number of words_groups rows of the group
+    word_count = Column(Integer, nullable=False, default=0)
     
     words = relationship("Word", secondary="words_groups", back_populates="groups")
     study_sessions = relationship("StudySession", back_populates="group")
 
 class StudySession(Base):
     __tablename__ = "study_sessions"
+    __table_args__ = (
+        Index("idx_study_sessions_created_at", "created_at", "id"),
+        Index("idx_study_sessions_group_id_created_at", "group_id", "created_at", "id"),
+        Index("idx_study_sessions_activity_id_created_at", "study_activity_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True)
     group_id = Column(Integer, ForeignKey("groups.id"))
@@ -56,6 +99,10 @@ class StudyActivity(Base):
 
 class WordReviewItem(Base):
     __tablename__ = "word_review_items"
+    __table_args__ = (
+        Index("idx_word_review_items_session_id_word_id", "study_session_id", "word_id", "correct"),
+        Index("idx_word_review_items_word_id_correct", "word_id", "correct"),
+    )
     
     id = Column(Integer, primary_key=True)
     word_id = Column(Integer, ForeignKey("words.id"))
@@ -64,4 +111,19 @@ class WordReviewItem(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(UTC))
     
     word = relationship("Word", back_populates="review_items")
-    study_session = relationship("StudySession", back_populates="review_items") 
\ No newline at end of file
+    study_session = relationship("StudySession", back_populates="review_items") 
+
+class DailyActivity(Base):
+    __tablename__ = "daily_activity"
+    
+    date = Column(Date, primary_key=True)
+    session_count = Column(Integer, nullable=False, default=0)
+    review_count = Column(Integer, nullable=False, default=0)
+    correct_count = Column(Integer, nullable=False, default=0)
+    streak_days = Column(Integer, nullable=False, default=0)
+
+class DataVersion(Base):
+    __tablename__ = "data_version"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
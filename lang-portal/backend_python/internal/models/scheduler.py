@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import WordSchedule
+
+# SM-2 parameters, a correct answer counts as a perfect recall (quality 5)
+# and a wrong answer as a failed recall (quality 2)
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+CORRECT_QUALITY = 5
+WRONG_QUALITY = 2
+# A failed word comes back within the same day instead of waiting a full interval
+RELEARN_DELAY = timedelta(minutes=10)
+
+def _upsert_word_schedule():
+    stmt = insert(WordSchedule)
+    return stmt.on_conflict_do_update(
+        index_elements=[WordSchedule.word_id],
+        set_={
+            "ease": stmt.excluded.ease,
+            "interval_days": stmt.excluded.interval_days,
+            "repetitions": stmt.excluded.repetitions,
+            "due_at": stmt.excluded.due_at
+        }
+    )
+
+def next_schedule(ease: float, interval_days: float, repetitions: int, correct: bool, reviewed_at: datetime) -> dict:
+    """Apply one review result to the SM-2 state of a word"""
+    quality = CORRECT_QUALITY if correct else WRONG_QUALITY
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    
+    if correct:
+        repetitions += 1
+        if repetitions == 1:
+            interval_days = 1
+        elif repetitions == 2:
+            interval_days = 6
+        else:
+            interval_days = round(interval_days * ease)
+        due_at = reviewed_at + timedelta(days=interval_days)
+    else:
+        repetitions = 0
+        interval_days = 0
+        due_at = reviewed_at + RELEARN_DELAY
+    
+    return {
+        "ease": ease,
+        "interval_days": interval_days,
+        "repetitions": repetitions,
+        "due_at": due_at
+    }
+
+async def schedule_reviews(db: AsyncSession, reviews):
+    """Reschedule words from (word_id, correct, reviewed_at) review results"""
+    reviews = sorted(reviews, key=lambda review: review[2])
+    if not reviews:
+        return
+    
+    # Load the current state of all reviewed words with one query
+    result = await db.execute(
+        select(WordSchedule.word_id, WordSchedule.ease, WordSchedule.interval_days, WordSchedule.repetitions)
+        .where(WordSchedule.word_id.in_({word_id for word_id, _, _ in reviews}))
+    )
+    states = {
+        word_id: {"ease": ease, "interval_days": interval_days, "repetitions": repetitions}
+        for word_id, ease, interval_days, repetitions in result.all()
+    }
+    
+    # Replay the reviews in answer order so repeated words build on each other
+    for word_id, correct, reviewed_at in reviews:
+        state = states.get(word_id, {"ease": INITIAL_EASE, "interval_days": 0, "repetitions": 0})
+        states[word_id] = next_schedule(
+            state["ease"], state["interval_days"], state["repetitions"], correct, reviewed_at
+        )
+    
+    await db.execute(
+        _upsert_word_schedule(),
+        [
+            {"word_id": word_id, **state}
+            for word_id, state in states.items()
+        ]
+    )
+
+async def add_word_schedules(db: AsyncSession, word_ids, due_at: datetime = None):
+    """Make new words due for their first review"""
+    if not word_ids:
+        return
+    due_at = due_at or datetime.now(UTC)
+    await db.execute(
+        insert(WordSchedule).on_conflict_do_nothing(index_elements=[WordSchedule.word_id]),
+        [
+            {
+                "word_id": word_id,
+                "ease": INITIAL_EASE,
+                "interval_days": 0,
+                "repetitions": 0,
+                "due_at": due_at
+            }
+            for word_id in word_ids
+        ]
+    )
+
+async def reset_word_schedules(db: AsyncSession):
+    """Put every word back to its initial state, due right away"""
+    await db.execute(
+        update(WordSchedule).values(
+            ease=INITIAL_EASE,
+            interval_days=0,
+            repetitions=0,
+            due_at=datetime.now(UTC)
+        )
+    )
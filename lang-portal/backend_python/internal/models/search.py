@@ -0,0 +1,100 @@
+from sqlalchemy import column, func, literal_column, table
+
+# Spelling variants folded together so that e.g. "sayounara", "sayōnara" and
+# "sayonara" or "shashin" and "syasin" share one search key. Applied in order
+# with plain substring replacement, both in Python and in the SQL triggers.
+ROMAJI_SPELLINGS = [
+    (" ", ""), ("-", ""), ("'", ""), (".", ""),
+    ("ā", "a"), ("ī", "i"), ("ū", "u"), ("ē", "e"), ("ō", "o"), ("ô", "o"),
+    ("aa", "a"), ("ii", "i"), ("uu", "u"), ("ou", "o"), ("oo", "o"),
+    ("shi", "si"), ("sh", "sy"), ("chi", "ti"), ("ch", "ty"), ("tsu", "tu"),
+    ("fu", "hu"), ("ji", "zi"), ("j", "zy"), ("mb", "nb"), ("mp", "np")
+]
+
+# Trigram similarity a fuzzy match needs to be returned, same default as pg_trgm
+FUZZY_THRESHOLD = 0.3
+
+def romaji_key(text: str) -> str:
+    """Fold a romaji spelling into its search key"""
+    key = text.lower()
+    for variant, canonical in ROMAJI_SPELLINGS:
+        key = key.replace(variant, canonical)
+    return key
+
+def _romaji_key_sql(expression: str) -> str:
+    sql = f"lower({expression})"
+    for variant, canonical in ROMAJI_SPELLINGS:
+        sql = f"replace({sql}, '{variant.replace(chr(39), chr(39) * 2)}', '{canonical}')"
+    return sql
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def trigram_similarity(a: str, b: str) -> float:
+    a, b = trigrams(a), trigrams(b)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def fts_phrase(text: str) -> str:
+    """Quote text as a single FTS5 phrase"""
+    return '"' + text.replace('"', '""') + '"'
+
+def fuzzy_match_expression(key: str) -> str:
+    """FTS5 query matching any trigram of a romaji key"""
+    return "romaji_key : (" + " OR ".join(fts_phrase(trigram) for trigram in sorted(trigrams(key))) + ")"
+
+# words_fts mirrors the searchable columns of words with the word id as rowid.
+# The trigram tokenizer serves substring, prefix and LIKE lookups in any script.
+WORDS_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+        japanese, romaji, english, romaji_key, tokenize = 'trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS words_fts_insert AFTER INSERT ON words BEGIN
+        INSERT INTO words_fts (rowid, japanese, romaji, english, romaji_key)
+        VALUES (new.id, new.japanese, new.romaji, new.english, {_romaji_key_sql("new.romaji")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS words_fts_update AFTER UPDATE ON words BEGIN
+        UPDATE words_fts
+        SET rowid = new.id,
+            japanese = new.japanese,
+            romaji = new.romaji,
+            english = new.english,
+            romaji_key = {_romaji_key_sql("new.romaji")}
+        WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS words_fts_delete AFTER DELETE ON words BEGIN
+        DELETE FROM words_fts WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    INSERT INTO words_fts (rowid, japanese, romaji, english, romaji_key)
+    SELECT id, japanese, romaji, english, {_romaji_key_sql("romaji")}
+    FROM words
+    WHERE id NOT IN (SELECT rowid FROM words_fts)
+    """
+]
+
+WORDS_FTS_DROP = "DROP TABLE IF EXISTS words_fts"
+
+words_fts = table(
+    "words_fts",
+    column("rowid"),
+    column("japanese"),
+    column("romaji"),
+    column("english"),
+    column("romaji_key")
+)
+
+def words_fts_match(expression: str):
+    return literal_column("words_fts").op("MATCH")(expression)
+
+def words_fts_rank():
+    return func.bm25(literal_column("words_fts"))
@@ -0,0 +1,118 @@
+from datetime import date, timedelta
+from sqlalchemy import bindparam, delete, func, select, case, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import WordStats, WordReviewItem, DailyActivity, Group
+
+def _upsert_word_stats():
+    stmt = insert(WordStats)
+    return stmt.on_conflict_do_update(
+        index_elements=[WordStats.word_id],
+        set_={
+            "correct_count": WordStats.correct_count + stmt.excluded.correct_count,
+            "wrong_count": WordStats.wrong_count + stmt.excluded.wrong_count
+        }
+    )
+
+def _upsert_daily_activity(**values):
+    stmt = insert(DailyActivity)
+    if values:
+        stmt = stmt.values(**values)
+    return stmt.on_conflict_do_update(
+        index_elements=[DailyActivity.date],
+        set_={
+            "session_count": DailyActivity.session_count + stmt.excluded.session_count,
+            "review_count": DailyActivity.review_count + stmt.excluded.review_count,
+            "correct_count": DailyActivity.correct_count + stmt.excluded.correct_count,
+            # The streak ending on a day is only known once that day has a session
+            "streak_days": case(
+                (DailyActivity.streak_days == 0, stmt.excluded.streak_days),
+                else_=DailyActivity.streak_days
+            )
+        }
+    )
+
+async def add_word_stats(db: AsyncSession, counts: dict):
+    """Add {word_id: (correct_count, wrong_count)} to the materialized counters of the words"""
+    if not counts:
+        return
+    await db.execute(
+        _upsert_word_stats(),
+        [
+            {"word_id": word_id, "correct_count": correct_count, "wrong_count": wrong_count}
+            for word_id, (correct_count, wrong_count) in counts.items()
+        ]
+    )
+
+async def increment_word_stats(db: AsyncSession, word_id: int, correct: bool):
+    """Add a single review result to the materialized counters of a word"""
+    await add_word_stats(db, {word_id: (1, 0) if correct else (0, 1)})
+
+async def rebuild_word_stats(db: AsyncSession):
+    """Recompute the counters of every word from word_review_items"""
+    await db.execute(delete(WordStats))
+    
+    review_counts = select(
+        WordReviewItem.word_id,
+        func.count(WordReviewItem.id).filter(WordReviewItem.correct == True),
+        func.count(WordReviewItem.id).filter(WordReviewItem.correct == False)
+    ).group_by(WordReviewItem.word_id)
+    
+    await db.execute(
+        insert(WordStats).from_select(
+            ["word_id", "correct_count", "wrong_count"],
+            review_counts
+        )
+    )
+
+async def add_group_word_counts(db: AsyncSession, counts: dict):
+    """Add {group_id: added_words} to the materialized word counts, negative to remove words"""
+    if not counts:
+        return
+    # Core table statement, an ORM update with several parameter sets would be a bulk update by primary key
+    groups = Group.__table__
+    await db.execute(
+        update(groups)
+            .where(groups.c.id == bindparam("counted_group_id"))
+            .values(word_count=groups.c.word_count + bindparam("added_words")),
+        [
+            {"counted_group_id": group_id, "added_words": added_words}
+            for group_id, added_words in counts.items()
+        ]
+    )
+
+async def record_study_session(db: AsyncSession, day: date):
+    """Count a new study session in the daily rollup"""
+    previous_streak = select(DailyActivity.streak_days) \
+        .where(DailyActivity.date == day - timedelta(days=1)) \
+        .scalar_subquery()
+    
+    await db.execute(_upsert_daily_activity(
+        date=day,
+        session_count=1,
+        review_count=0,
+        correct_count=0,
+        streak_days=func.coalesce(previous_streak, 0) + 1
+    ))
+
+async def add_daily_reviews(db: AsyncSession, counts: dict):
+    """Add {day: (review_count, correct_count)} to the daily rollup"""
+    if not counts:
+        return
+    await db.execute(
+        _upsert_daily_activity(),
+        [
+            {
+                "date": day,
+                "session_count": 0,
+                "review_count": review_count,
+                "correct_count": correct_count,
+                "streak_days": 0
+            }
+            for day, (review_count, correct_count) in counts.items()
+        ]
+    )
+
+async def record_word_review(db: AsyncSession, day: date, correct: bool):
+    """Count a new review result in the daily rollup"""
+    await add_daily_reviews(db, {day: (1, 1 if correct else 0)})
@@ -0,0 +1,161 @@
+import json
+from collections import Counter
+from itertools import islice
+from pathlib import Path
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import Word, Group, WordGroup
+from .scheduler import add_word_schedules
+from .stats import add_group_word_counts
+
+BATCH_SIZE = 5000
+
+class _JsonReader:
+    """Incremental reader for JSON documents too large to load at once"""
+    
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+    
+    def _fill(self) -> bool:
+        chunk = self.f.read(self.chunk_size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return not self.eof
+    
+    def peek(self) -> str:
+        """Skip whitespace and return the next character"""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position].isspace():
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+    
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} but found {self.peek()!r}")
+        self.position += 1
+    
+    def value(self):
+        """Decode the next value, reading more of the file until it is complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                # A number cut off at the end of the buffer still decodes, so wait for what follows it
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+def _read_json_vocabulary(f, group_name: str):
+    """Stream the words of a seed file shaped as {"group_name": ..., "words": [...]}"""
+    reader = _JsonReader(f)
+    reader.expect("{")
+    while reader.peek() != "}":
+        key = reader.value()
+        reader.expect(":")
+        if key == "words":
+            reader.expect("[")
+            while reader.peek() != "]":
+                yield group_name, reader.value()
+                if reader.peek() == ",":
+                    reader.expect(",")
+            reader.expect("]")
+        elif key == "group_name":
+            group_name = reader.value()
+        else:
+            reader.value()
+        if reader.peek() == ",":
+            reader.expect(",")
+
+def read_vocabulary(path):
+    """
+    Stream (group_name, word) entries from a vocabulary file.
+    JSON files use the seed format, with group_name given before words.
+    JSONL files hold one word per line with an optional group_name.
+    Words without a group name go to a group named after the file.
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    word = json.loads(line)
+                    yield word.pop("group_name", path.stem), word
+        else:
+            yield from _read_json_vocabulary(f, path.stem)
+
+async def _get_group_ids(db: AsyncSession, names, group_ids: dict) -> int:
+    """Resolve group names to ids, reusing existing groups and creating missing ones"""
+    created = 0
+    for name in names:
+        if name in group_ids:
+            continue
+        group_id = await db.scalar(select(Group.id).where(Group.name == name).limit(1))
+        if group_id is None:
+            group_id = await db.scalar(insert(Group).values(name=name).returning(Group.id))
+            created += 1
+        group_ids[name] = group_id
+    return created
+
+async def import_vocabulary(db: AsyncSession, entries, batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Insert (group_name, word) entries with set-based inserts, batch_size words per
+    statement. Nothing is committed, so a whole import runs in the caller's transaction.
+    """
+    entries = iter(entries)
+    group_ids = {}
+    group_count = 0
+    word_count = 0
+    next_word_id = None
+    
+    while batch := list(islice(entries, batch_size)):
+        group_count += await _get_group_ids(db, {name for name, _ in batch}, group_ids)
+    
+        word_rows = [
+            {
+                "japanese": word["japanese"],
+                "romaji": word["romaji"],
+                "english": word["english"],
+                "parts": word.get("parts", {})
+            }
+            for _, word in batch
+        ]
+        # SQLite cannot batch an ordered INSERT ... RETURNING, so only the first word
+        # gets its id from the database. That insert takes the write lock until the
+        # import commits, so no other import can take the ids that follow it.
+        word_ids = []
+        if next_word_id is None:
+            next_word_id = await db.scalar(insert(Word).values(word_rows.pop(0)).returning(Word.id))
+            word_ids.append(next_word_id)
+            next_word_id += 1
+        for row in word_rows:
+            row["id"] = next_word_id
+            word_ids.append(next_word_id)
+            next_word_id += 1
+    
+        if word_rows:
+            await db.execute(insert(Word), word_rows)
+        await db.execute(insert(WordGroup), [
+            {"word_id": word_id, "group_id": group_ids[name]}
+            for word_id, (name, _) in zip(word_ids, batch)
+        ])
+        await add_group_word_counts(db, Counter(group_ids[name] for name, _ in batch))
+        await add_word_schedules(db, word_ids)
+        word_count += len(batch)
+    
+    return {
+        "groups_created": group_count,
+        "words_created": word_count
+    }
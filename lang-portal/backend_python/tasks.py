@@ -4,6 +4,10 @@ from pathlib import Path
 import asyncio
 from internal.models.base import get_db
 from internal.handlers.system import full_reset
+from internal.handlers.cache import response_cache
+from internal.models.vocabulary import import_vocabulary, read_vocabulary
+from internal.models.data_version import bump_data_version
+from internal.models.migrations import applied_migrations, apply_migrations, migration_files
 
 @task
 def init_db(ctx):
@@ -13,18 +17,25 @@ def init_db(ctx):
 
 @task(init_db)
 def run_migrations(ctx):
-    """Run database migrations"""
+    """Apply the database migrations that have not been applied yet"""
     print("Running migrations...")
     conn = sqlite3.connect('words.db')
-    migrations_dir = Path('db/migrations')
     
-    for migration_file in sorted(migrations_dir.glob('*.sql')):
-        print(f"Running migration: {migration_file}")
-        with open(migration_file) as f:
-            conn.executescript(f.read())
+    for migration_file in apply_migrations(conn, Path('db/migrations')):
+        print(f"Applied migration: {migration_file}")
     
     conn.close()
 
+@task(init_db)
+def migration_status(ctx):
+    """List the database migrations and whether they are applied"""
+    conn = sqlite3.connect('words.db')
+    applied = applied_migrations(conn)
+    conn.close()
+    
+    for version, migration_file in migration_files(Path('db/migrations')):
+        print(f"{'applied' if version in applied else 'pending'}  {migration_file.name}")
+
 @task(run_migrations)
 def seed_data(ctx):
     """Seed the database with initial data"""
@@ -36,6 +47,23 @@ def seed_data(ctx):
     
     asyncio.run(run_reset())
 
+@task
+def import_vocab(ctx, path):
+    """Import a JSON or JSONL vocabulary file in a single transaction"""
+    print(f"Importing vocabulary: {path}")
+    async def run_import():
+        async for db in get_db():
+            counts = await import_vocabulary(db, read_vocabulary(path))
+            await bump_data_version(db)
+            await db.commit()
+            # Running servers miss their cache through the new data version, this
+            # only frees the entries of a cache shared through CACHE_URL
+            await response_cache.invalidate()
+            return counts
+    
+    counts = asyncio.run(run_import())
+    print(f"Imported {counts['words_created']} words, created {counts['groups_created']} groups")
+
 @task(seed_data)
 def setup(ctx):
     """Run all setup tasks in sequence"""
@@ -49,4 +77,32 @@ def run_server(ctx):
 @task
 def dev_server(ctx):
     """Run the development server with auto-reload"""
-    ctx.run("uvicorn cmd.server.main:app --reload") 
\ No newline at end of file
+    ctx.run("uvicorn cmd.server.main:app --reload")
+
+@task
+def bench_sqlite(ctx, readers=8, writers=2, duration=10, words=5000):
+    """Compare read/write throughput of the SQLite engine profiles"""
+    ctx.run(
+        f"python -m benchmarks.sqlite_profiles --readers {readers} --writers {writers} "
+        f"--duration {duration} --words {words}"
+    )
+
+@task
+def bench_api(ctx, words=5000, groups=50, sessions=1000, reviews=50000, requests=200, concurrency=8, profile=None, output=None, check_queries=False):
+    """Load test every API endpoint against a synthetic database and report latency percentiles"""
+    command = (
+        f"python -m benchmarks.load_test --words {words} --groups {groups} --sessions {sessions} "
+        f"--reviews {reviews} --requests {requests} --concurrency {concurrency}"
+    )
+    if profile:
+        command += f" --profile {profile}"
+    if output:
+        command += f" --output {output}"
+    if check_queries:
+        command += " --check-queries"
+    ctx.run(command)
+
+@task
+def check_query_plans(ctx, migrations=False):
+    """Fail when an API query reads a history table without an index"""
+    ctx.run("python -m benchmarks.query_plans" + (" --migrations" if migrations else ""))
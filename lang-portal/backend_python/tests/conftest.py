@@ -0,0 +1,42 @@
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# The engine is created on import, so point it at a scratch database first
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("DB_ECHO", "false")
+sys.path.append(str(BACKEND_DIR))
+
+from fastapi.testclient import TestClient
+from internal.models.base import get_db
+from internal.handlers.system import full_reset
+
+def _load_app():
+    # Loaded by path since pytest imports the standard library cmd module before cmd/ is on the path
+    spec = importlib.util.spec_from_file_location("server_main", BACKEND_DIR / "cmd" / "server" / "main.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.app
+
+app = _load_app()
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client of the API on a freshly seeded database"""
+    # The seed files are read relative to the backend directory
+    monkeypatch.chdir(BACKEND_DIR)
+    
+    async def reset():
+        async for db in get_db():
+            await full_reset(db)
+            break
+    
+    asyncio.run(reset())
+    return TestClient(app)
@@ -0,0 +1,21 @@
+import sqlite3
+from internal.models.base import engine
+
+def _group_word_count(client) -> int:
+    response = client.get("/api/groups/1")
+    assert response.status_code == 200
+    return response.json()["stats"]["total_word_count"]
+
+def test_cached_groups_follow_writes_of_other_processes(client):
+    word_count = _group_word_count(client)
+    
+    # A write of another process, e.g. invoke import-vocab, that this process cannot invalidate
+    conn = sqlite3.connect(engine.url.database)
+    conn.execute("UPDATE groups SET word_count = word_count + 1 WHERE id = 1")
+    conn.commit()
+    assert _group_word_count(client) == word_count
+    
+    conn.execute("UPDATE data_version SET version = version + 1")
+    conn.commit()
+    conn.close()
+    assert _group_word_count(client) == word_count + 1
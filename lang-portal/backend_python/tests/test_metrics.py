@@ -0,0 +1,25 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from internal.handlers.metrics import RequestStats, _request_stats
+from internal.models.base import engine
+
+def test_failed_statements_are_counted(client):
+    stats = RequestStats()
+    
+    async def run():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.execute(text("SELECT 1"))
+    
+    token = _request_stats.set(stats)
+    try:
+        asyncio.run(run())
+    finally:
+        _request_stats.reset(token)
+    
+    assert stats.statements == 3
+    assert stats.db_seconds > 0
@@ -0,0 +1,31 @@
+import pytest
+from sqlalchemy import event
+from internal.models.base import engine
+
+@pytest.fixture
+def statements():
+    """SQL statements run by the engine while the test runs"""
+    executed = []
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+@pytest.mark.parametrize("path", [
+    "/api/study_activities/1/study_sessions",
+    "/api/groups/1/study_sessions",
+    "/api/study_sessions"
+])
+def test_study_session_lists_do_not_query_per_row(client, statements, path):
+    for _ in range(5):
+        response = client.post("/api/study_activities", json={"group_id": 1, "study_activity_id": 1})
+        assert response.status_code == 200
+    
+    statements.clear()
+    response = client.get(path)
+    
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 5
+    # One query for the page and one for the total count
+    assert len(statements) <= 2
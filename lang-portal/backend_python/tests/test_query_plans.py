@@ -0,0 +1,36 @@
+import asyncio
+import random
+import sqlite3
+import pytest
+from pathlib import Path
+from benchmarks.load_test import seed
+from benchmarks.query_plans import explain_endpoints, find_offenders
+from conftest import BACKEND_DIR, app
+from internal.models.base import engine
+from internal.models.migrations import apply_migrations
+
+SCALE = {"words": 500, "groups": 10, "sessions": 100, "reviews": 2000}
+
+@pytest.fixture
+def migrated_database(monkeypatch):
+    """The test database rebuilt from scratch by db/migrations"""
+    monkeypatch.chdir(BACKEND_DIR)
+    database = engine.url.database
+    asyncio.run(engine.dispose())
+    Path(database).unlink(missing_ok=True)
+    conn = sqlite3.connect(database)
+    apply_migrations(conn, BACKEND_DIR / "db" / "migrations")
+    conn.close()
+    return database
+
+def test_handler_queries_use_indexes(migrated_database):
+    random.seed(0)
+    
+    async def run():
+        await seed(SCALE)
+        return await explain_endpoints(app, migrated_database, SCALE)
+    
+    results = asyncio.run(run())
+    
+    assert results
+    assert find_offenders(results) == {}
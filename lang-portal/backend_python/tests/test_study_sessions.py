@@ -0,0 +1,33 @@
+import sqlite3
+from datetime import datetime
+from internal.models.base import engine
+
+def _create_session(client) -> int:
+    response = client.post("/api/study_activities", json={"group_id": 1, "study_activity_id": 1})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+def test_batch_reviews_mix_naive_aware_and_missing_answer_times(client):
+    session_id = _create_session(client)
+    
+    response = client.post(f"/api/study_sessions/{session_id}/reviews", json={"items": [
+        {"word_id": 2, "correct": True, "answered_at": "2025-01-01T00:00:00"},
+        {"word_id": 3, "correct": False},
+        {"word_id": 4, "correct": True, "answered_at": "2025-01-01T09:00:00+09:00"}
+    ]})
+    
+    assert response.status_code == 200
+    assert response.json()["created_count"] == 3
+    
+    conn = sqlite3.connect(engine.url.database)
+    rows = dict(conn.execute(
+        "SELECT word_id, created_at FROM word_review_items WHERE study_session_id = ?", (session_id,)
+    ).fetchall())
+    due_at = dict(conn.execute("SELECT word_id, due_at FROM word_schedule WHERE word_id IN (2, 3, 4)").fetchall())
+    conn.close()
+    
+    # Naive times are taken as UTC and aware ones converted to it
+    assert datetime.fromisoformat(rows[2]) == datetime(2025, 1, 1)
+    assert datetime.fromisoformat(rows[4]) == datetime(2025, 1, 1)
+    assert datetime.fromisoformat(rows[3]) > datetime(2025, 1, 1)
+    assert set(due_at) == {2, 3, 4}
@@ -0,0 +1,28 @@
+import asyncio
+import sqlite3
+from internal.models.base import AsyncSessionLocal, engine
+from internal.models.vocabulary import import_vocabulary
+
+async def _import(name: str, count: int):
+    async with AsyncSessionLocal() as db:
+        await import_vocabulary(db, (
+            ("Basic Greetings", {"japanese": f"{name}{i}", "romaji": f"{name}{i}", "english": f"{name} {i}"})
+            for i in range(count)
+        ), batch_size=10)
+        await db.commit()
+
+def test_concurrent_imports_get_distinct_word_ids(client):
+    conn = sqlite3.connect(engine.url.database)
+    words_before = conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+    
+    async def run():
+        await asyncio.gather(_import("first", 25), _import("second", 25))
+    
+    asyncio.run(run())
+    
+    assert conn.execute("SELECT COUNT(*) FROM words").fetchone()[0] == words_before + 50
+    orphans = conn.execute(
+        "SELECT COUNT(*) FROM words_groups LEFT JOIN words ON words.id = words_groups.word_id WHERE words.id IS NULL"
+    ).fetchone()[0]
+    assert orphans == 0
+    conn.close()
@@ -3,12 +3,7 @@ import { api } from '@/services/api'
 import { StatsCard } from '@/components/dashboard/StatsCard'
 import { StudyProgress } from '@/components/dashboard/StudyProgress'
 import { LastStudySession } from '@/components/dashboard/LastStudySession'
-import type { DashboardStats, StudySession } from '@/types/api'
-
-interface StudyProgressData {
-  total_words_studied: number
-  total_available_words: number
-}
+import type { DashboardStats, DashboardSummary, StudyProgressData, StudySession } from '@/types/api'
 
 export function Dashboard() {
   const [stats, setStats] = useState<DashboardStats | null>(null)
@@ -21,16 +16,14 @@ export function Dashboard() {
 
     const fetchDashboardData = async () => {
       try {
-        const [statsRes, progressRes, sessionRes] = await Promise.all([
-          api.get<DashboardStats>('/dashboard/quick-stats'),
-          api.get<StudyProgressData>('/dashboard/study_progress'),
-          api.get<StudySession>('/dashboard/last_study_session'),
-        ])
+        const summaryRes = await api.get<DashboardSummary>('/dashboard/summary')
 
         if (mounted) {
-          if (statsRes.data) setStats(statsRes.data)
-          if (progressRes.data) setProgress(progressRes.data)
-          if (sessionRes.data) setLastSession(sessionRes.data)
+          if (summaryRes.data) {
+            setStats(summaryRes.data.quick_stats)
+            setProgress(summaryRes.data.study_progress)
+            setLastSession(summaryRes.data.last_study_session)
+          }
           setLoading(false)
         }
       } catch (error) {
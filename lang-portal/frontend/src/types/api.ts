@@ -39,4 +39,15 @@ export interface DashboardStats {
   total_study_sessions: number
   total_active_groups: number
   study_streak_days: number
+}
+
+export interface StudyProgressData {
+  total_words_studied: number
+  total_available_words: number
+}
+
+export interface DashboardSummary {
+  last_study_session: StudySession | null
+  study_progress: StudyProgressData
+  quick_stats: DashboardStats
 } 
\ No newline at end of file